@@ -2,23 +2,20 @@ import uuid
 
 from fastapi import Depends, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import async_session_factory, get_db, get_read_db
 from app.core.exceptions import AuthenticationError, AuthorizationError
 from app.core.security import decode_token
-from app.models.organization import OrgMembership, OrgRole
-from app.models.user import User, UserStatus
+from app.models.organization import OrgRole
+from app.models.user import User, UserRole, UserStatus
+from app.services import hot_queries, loaders
 
 security_scheme = HTTPBearer()
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    payload = decode_token(credentials.credentials)
+def _token_user_id(token: str) -> uuid.UUID:
+    payload = decode_token(token)
     if not payload or payload.get("type") != "access":
         raise AuthenticationError("Invalid or expired token")
 
@@ -27,21 +24,52 @@ async def get_current_user(
         raise AuthenticationError("Invalid token payload")
 
     try:
-        uid = uuid.UUID(user_id)
+        return uuid.UUID(user_id)
     except ValueError as err:
         raise AuthenticationError("Invalid token payload") from err
 
-    result = await db.execute(select(User).where(User.id == uid))
-    user = result.scalar_one_or_none()
 
+def _active(user: User | None) -> User:
     if not user:
         raise AuthenticationError("User not found")
     if user.status != UserStatus.ACTIVE:
         raise AuthenticationError("Account is not active")
+    return user
+
 
+async def user_from_token(db: AsyncSession, token: str) -> User:
+    """The active user an access token belongs to; ``AuthenticationError`` otherwise."""
+    return _active(await hot_queries.user_by_id(db, _token_user_id(token)))
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security_scheme),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    user = await user_from_token(db, credentials.credentials)
+    # Lets get_db pin this user's reads to the primary after a write.
+    db.info["user_id"] = str(user.id)
     return user
 
 
+async def get_current_read_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security_scheme),
+    db: AsyncSession = Depends(get_read_db),
+) -> User:
+    """``get_current_active_user`` for ``get_read_db`` routes.
+
+    The user is loaded on the route's read session instead of a second,
+    primary session; one a replica does not have yet (just registered) is
+    looked up on the primary.
+    """
+    user_id = _token_user_id(credentials.credentials)
+    user = await hot_queries.user_by_id(db, user_id)
+    if user is None:
+        async with async_session_factory() as primary:
+            user = await hot_queries.user_by_id(primary, user_id)
+    return _active(user)
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -60,13 +88,7 @@ def require_org_role(*roles: OrgRole):
         if not org_id:
             raise AuthorizationError("Organization context required")
 
-        result = await db.execute(
-            select(OrgMembership).where(
-                OrgMembership.user_id == current_user.id,
-                OrgMembership.org_id == uuid.UUID(org_id),
-            )
-        )
-        membership = result.scalar_one_or_none()
+        membership = await loaders.org_memberships(db).load((current_user.id, uuid.UUID(org_id)))
 
         if not membership or membership.role not in roles:
             raise AuthorizationError("Insufficient organization permissions")
@@ -76,8 +98,15 @@ def require_org_role(*roles: OrgRole):
     return check_role
 
 
+def require_user_role(*roles: UserRole):
+    async def check_role(current_user: User = Depends(get_current_active_user)) -> User:
+        if current_user.role not in roles:
+            raise AuthorizationError("Insufficient permissions")
+        return current_user
+
+    return check_role
+
+
 def get_client_ip(request: Request) -> str:
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
+    # uvicorn already resolved X-Forwarded-For from trusted proxies (app.server).
     return request.client.host if request.client else "unknown"
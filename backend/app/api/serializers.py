@@ -0,0 +1,122 @@
+"""Precompiled response serializers for large listings.
+
+Returning Pydantic models from a route costs one ``model_validate`` per ORM
+row, after which FastAPI validates the result again against
+``response_model`` before encoding it. For listings with thousands of rows
+that dominates the request.
+
+The serializers here read column values straight from the loaded ORM state
+(or from a Core ``Row`` / mapping) and encode them with a serializer compiled
+once per response model, so rows never become model instances at all. Routes
+keep ``response_model`` for the OpenAPI schema but return a
+``JSONBytesResponse``, which FastAPI passes through untouched.
+
+Only use these for data that comes from our own tables: values are encoded
+as-is, without input validation.
+"""
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import PydanticUndefined
+from sqlalchemy.engine import Row
+from typing_extensions import TypedDict
+
+from app.schemas.admin import AuditLogResponse
+from app.schemas.secret import SecretResponse
+from app.schemas.sharing import ShareResponse
+from app.schemas.vault import VaultResponse
+
+
+class JSONBytesResponse(Response):
+    """Response whose body is already-encoded JSON."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return content
+
+
+class ModelSerializer:
+    """ORM/Row -> JSON bytes serializer shaped like one response model."""
+
+    def __init__(self, model: type[BaseModel]):
+        self.model = model
+        self._names = tuple(model.model_fields)
+        self._defaults = {
+            name: field.default
+            for name, field in model.model_fields.items()
+            if field.default is not PydanticUndefined
+        }
+        row_type = TypedDict(  # type: ignore[misc]
+            f"{model.__name__}Row",
+            {name: field.annotation for name, field in model.model_fields.items()},
+        )
+        self._one = TypeAdapter(row_type)
+        self._many = TypeAdapter(list[row_type])  # type: ignore[valid-type]
+
+    def row(self, obj: Any) -> dict[str, Any]:
+        """Extract the response fields of one ORM object, ``Row`` or mapping."""
+        if isinstance(obj, Row):
+            source: Mapping[str, Any] = obj._mapping
+        elif isinstance(obj, Mapping):
+            source = obj
+        else:
+            # Loaded column attributes live in the instance dict; anything
+            # missing (unloaded or not a column) goes through normal access.
+            source = obj.__dict__
+        out = {}
+        for name in self._names:
+            if name in source:
+                out[name] = source[name]
+            elif name in self._defaults:
+                out[name] = getattr(obj, name, self._defaults[name])
+            else:
+                out[name] = getattr(obj, name)
+        return out
+
+    def rows(self, objs: Iterable[Any]) -> list[dict[str, Any]]:
+        return [self.row(obj) for obj in objs]
+
+    def dump_one(self, obj: Any) -> bytes:
+        return self._one.dump_json(self.row(obj))
+
+    def dump_rows(self, rows: list[dict[str, Any]]) -> bytes:
+        """Encode rows already produced by ``row``/``rows`` (e.g. then enriched)."""
+        return self._many.dump_json(rows)
+
+    def dump_many(self, objs: Iterable[Any]) -> bytes:
+        return self._many.dump_json(self.rows(objs))
+
+    def dump_envelope(self, key: str, rows: list[dict[str, Any]], **fields: Any) -> bytes:
+        """Encode ``{key: [...rows], **fields}``.
+
+        ``fields`` must hold JSON-native values (ints, strings, ...).
+        """
+        items = self._many.dump_json(rows)
+        if not fields:
+            return b'{"' + key.encode() + b'":' + items + b"}"
+        tail = _ENVELOPE_FIELDS.dump_json(fields)
+        return b'{"' + key.encode() + b'":' + items + b"," + tail[1:]
+
+    def response(self, obj: Any, status_code: int = 200) -> JSONBytesResponse:
+        return JSONBytesResponse(self.dump_one(obj), status_code=status_code)
+
+    def list_response(self, objs: Iterable[Any]) -> JSONBytesResponse:
+        return JSONBytesResponse(self.dump_many(objs))
+
+    def envelope_response(
+        self, key: str, objs: Iterable[Any], **fields: Any
+    ) -> JSONBytesResponse:
+        return JSONBytesResponse(self.dump_envelope(key, self.rows(objs), **fields))
+
+
+_ENVELOPE_FIELDS = TypeAdapter(dict[str, Any])
+
+
+secret_serializer = ModelSerializer(SecretResponse)
+vault_serializer = ModelSerializer(VaultResponse)
+share_serializer = ModelSerializer(ShareResponse)
+audit_log_serializer = ModelSerializer(AuditLogResponse)
@@ -4,8 +4,8 @@ from fastapi import APIRouter, Depends, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_client_ip, get_current_active_user
-from app.core.database import get_db
+from app.api.deps import get_client_ip, get_current_active_user, get_current_read_user
+from app.core.database import get_db, get_read_db
 from app.core.exceptions import AuthorizationError
 from app.models.organization import Organization, OrgMembership, OrgRole
 from app.models.user import User
@@ -18,7 +18,7 @@ from app.schemas.admin import (
     PasswordPolicyResponse,
     PasswordPolicyUpdate,
 )
-from app.services import audit_service, policy_service
+from app.services import audit_service, loaders, notification_service, policy_service
 
 router = APIRouter(prefix="/org", tags=["Organization & Admin"])
 
@@ -56,8 +56,8 @@ async def create_organization(
 @router.get("/users", response_model=list[OrgUserResponse])
 async def list_org_users(
     org_id: uuid.UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     await _require_org_admin(db, current_user.id, org_id)
 
@@ -149,6 +149,15 @@ async def update_password_policy(
         ip_address=get_client_ip(request),
         user_agent=request.headers.get("user-agent"),
     )
+    await notification_service.broadcast_to_org(
+        db,
+        org_id,
+        "policy_change",
+        "Password policy updated",
+        "Your organization's password policy has changed.",
+        {"policy": "password"},
+        exclude_user_id=current_user.id,
+    )
     return PasswordPolicyResponse.model_validate(policy)
 
 
@@ -175,19 +184,22 @@ async def update_access_policy(
         ip_address=get_client_ip(request),
         user_agent=request.headers.get("user-agent"),
     )
+    await notification_service.broadcast_to_org(
+        db,
+        org_id,
+        "policy_change",
+        "Access policy updated",
+        "Your organization's access policy has changed.",
+        {"policy": "access"},
+        exclude_user_id=current_user.id,
+    )
     return {"message": "Access policy updated"}
 
 
 async def _require_org_admin(
     db: AsyncSession, user_id: uuid.UUID, org_id: uuid.UUID
 ) -> OrgMembership:
-    result = await db.execute(
-        select(OrgMembership).where(
-            OrgMembership.user_id == user_id,
-            OrgMembership.org_id == org_id,
-        )
-    )
-    membership = result.scalar_one_or_none()
+    membership = await loaders.org_memberships(db).load((user_id, org_id))
     if not membership or membership.role not in (OrgRole.ADMIN, OrgRole.MANAGER):
         raise AuthorizationError("Admin or manager role required")
     return membership
@@ -1,16 +1,15 @@
 import uuid
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user
-from app.core.database import get_db
+from app.api.deps import get_current_read_user
+from app.api.serializers import audit_log_serializer
+from app.core.database import get_read_db
 from app.core.exceptions import AuthorizationError
-from app.models.organization import OrgMembership, OrgRole
+from app.models.organization import OrgRole
 from app.models.user import User
-from app.schemas.admin import AuditLogResponse
-from app.services import audit_service
+from app.services import audit_service, loaders
 
 router = APIRouter(prefix="/org", tags=["Audit"])
 
@@ -23,16 +22,10 @@ async def get_audit_logs(
     user_id: uuid.UUID | None = None,
     action: str | None = None,
     resource_type: str | None = None,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    result = await db.execute(
-        select(OrgMembership).where(
-            OrgMembership.user_id == current_user.id,
-            OrgMembership.org_id == org_id,
-        )
-    )
-    membership = result.scalar_one_or_none()
+    membership = await loaders.org_memberships(db).load((current_user.id, org_id))
     if not membership or membership.role not in (OrgRole.ADMIN, OrgRole.AUDITOR):
         raise AuthorizationError("Admin or auditor role required")
 
@@ -46,27 +39,18 @@ async def get_audit_logs(
         page_size=page_size,
     )
 
-    return {
-        "logs": [AuditLogResponse.model_validate(log) for log in logs],
-        "total": total,
-        "page": page,
-        "page_size": page_size,
-    }
+    return audit_log_serializer.envelope_response(
+        "logs", logs, total=total, page=page, page_size=page_size
+    )
 
 
 @router.get("/reports")
 async def compliance_reports(
     org_id: uuid.UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    result = await db.execute(
-        select(OrgMembership).where(
-            OrgMembership.user_id == current_user.id,
-            OrgMembership.org_id == org_id,
-        )
-    )
-    membership = result.scalar_one_or_none()
+    membership = await loaders.org_memberships(db).load((current_user.id, org_id))
     if not membership or membership.role not in (OrgRole.ADMIN, OrgRole.AUDITOR):
         raise AuthorizationError("Admin or auditor role required")
 
@@ -23,7 +23,7 @@ from app.schemas.auth import (
     RegisterResponse,
     UserProfile,
 )
-from app.services import audit_service, auth_service
+from app.services import audit_service, auth_service, hot_queries
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
@@ -82,10 +82,7 @@ async def refresh_token(
         raise AuthenticationError("Invalid refresh token")
 
     token_hash = hashlib.sha256(data.refresh_token.encode()).hexdigest()
-    result = await db.execute(
-        select(Session).where(Session.token_hash == token_hash, Session.is_active == True)  # noqa: E712
-    )
-    session = result.scalar_one_or_none()
+    session = await hot_queries.active_session_by_token_hash(db, token_hash)
     if not session:
         raise AuthenticationError("Session not found or expired")
 
@@ -171,6 +168,9 @@ async def mfa_verify(
     access_token = create_access_token(str(user.id))
     refresh_token = create_refresh_token(str(user.id))
 
+    await auth_service.alert_if_new_device(
+        db, user, request.headers.get("user-agent"), get_client_ip(request)
+    )
     session = Session(
         user_id=user.id,
         token_hash=hashlib.sha256(refresh_token.encode()).hexdigest(),
@@ -3,8 +3,8 @@ from fastapi import APIRouter, Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user
-from app.core.database import get_db
+from app.api.deps import get_current_read_user
+from app.core.database import get_read_db
 from app.models.audit import AuditLog
 from app.models.user import User
 from app.schemas.vault import VaultResponse
@@ -15,16 +15,17 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
 @router.get("/summary")
 async def dashboard_summary(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     # Get vaults with item counts
     vaults, total_vaults = await vault_service.get_user_vaults(db, current_user.id)
+    stats = await vault_service.get_vault_stats(db, [v.id for v in vaults])
     vault_data = []
     total_items = 0
 
     for v in vaults:
-        item_count = await vault_service.get_vault_item_count(db, v.id)
+        item_count = stats[v.id]["item_count"]
         total_items += item_count
         resp = VaultResponse.model_validate(v)
         resp.item_count = item_count
@@ -1,8 +1,23 @@
-from fastapi import APIRouter, Depends
+import asyncio
+import json
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Query, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user
-from app.core.database import get_db
+from app.api.deps import (
+    get_current_active_user,
+    get_current_read_user,
+    security_scheme,
+    user_from_token,
+)
+from app.core.config import settings
+from app.core.database import async_session_factory, get_db, get_read_db
+from app.core.exceptions import AuthenticationError
+from app.core.pagination import set_next_cursor
+from app.core.pubsub import hub
 from app.models.user import User
 from app.schemas.notification import (
     NotificationMarkRead,
@@ -16,21 +31,25 @@ router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
 @router.get("", response_model=list[NotificationResponse])
 async def list_notifications(
-    limit: int = 50,
-    offset: int = 0,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    unread_only: bool = False,
+    since: datetime | None = None,
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    notifications = await notification_service.get_user_notifications(
-        db, current_user.id, limit=limit, offset=offset
+    notifications, next_cursor = await notification_service.get_user_notifications(
+        db, current_user.id, limit=limit, cursor=cursor, unread_only=unread_only, since=since
     )
+    set_next_cursor(response, next_cursor)
     return [NotificationResponse.model_validate(n) for n in notifications]
 
 
 @router.get("/unread-count", response_model=UnreadCountResponse)
 async def unread_count(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     count = await notification_service.get_unread_count(db, current_user.id)
     return UnreadCountResponse(count=count)
@@ -51,3 +70,87 @@ async def mark_all_read(
     db: AsyncSession = Depends(get_db),
 ):
     await notification_service.mark_all_as_read(db, current_user.id)
+
+
+async def _stream_user(token: str) -> tuple[User, int]:
+    """The stream's user and current unread count, on a short-lived session.
+
+    Streams stay open for minutes; the request-scoped ``get_db`` session
+    would keep a pooled connection checked out for as long.
+    """
+    async with async_session_factory() as db:
+        user = await user_from_token(db, token)
+        return user, await notification_service.get_unread_count(db, user.id)
+
+
+def _sse(payload: dict) -> str:
+    return f"event: {payload['type']}\ndata: {json.dumps(payload)}\n\n"
+
+
+@router.get("/stream")
+async def stream(credentials: HTTPAuthorizationCredentials = Depends(security_scheme)):
+    """Server-sent events: ``unread_count`` first, then ``notification`` and
+    ``unread_count`` events as they happen."""
+    user, count = await _stream_user(credentials.credentials)
+
+    async def events():
+        async with hub.subscribe(user.id) as queue:
+            yield _sse({"type": "unread_count", "count": count})
+            while True:
+                try:
+                    payload = await asyncio.wait_for(
+                        queue.get(), settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS
+                    )
+                except TimeoutError:
+                    # Keeps proxies from timing the idle connection out.
+                    yield ": heartbeat\n\n"
+                    continue
+                yield _sse(payload)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def websocket_stream(websocket: WebSocket):
+    """The same events over a WebSocket, as JSON messages.
+
+    The client authenticates with its first message,
+    ``{"type": "auth", "token": "<access token>"}``, rather than a query
+    parameter that proxies and access logs would record.
+    """
+    await websocket.accept()
+    try:
+        async with asyncio.timeout(settings.NOTIFICATION_WS_AUTH_TIMEOUT_SECONDS):
+            message = await websocket.receive_json()
+        if not isinstance(message, dict) or message.get("type") != "auth":
+            raise AuthenticationError("Expected an auth message")
+        user, count = await _stream_user(str(message.get("token", "")))
+    except WebSocketDisconnect:
+        return
+    except (TimeoutError, ValueError, AuthenticationError):
+        await websocket.close(code=1008)
+        return
+
+    async def until_disconnect() -> None:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    async with hub.subscribe(user.id) as queue:
+        await websocket.send_json({"type": "unread_count", "count": count})
+        disconnected = asyncio.create_task(until_disconnect())
+        try:
+            while True:
+                next_event = asyncio.ensure_future(queue.get())
+                await asyncio.wait(
+                    {next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if disconnected.done():
+                    next_event.cancel()
+                    return
+                await websocket.send_json(next_event.result())
+        finally:
+            disconnected.cancel()
@@ -3,8 +3,8 @@ import uuid
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_client_ip, get_current_active_user
-from app.core.database import get_db
+from app.api.deps import get_client_ip, get_current_active_user, get_current_read_user
+from app.core.database import get_db, get_read_db
 from app.core.exceptions import AuthenticationError
 from app.core.security import verify_auth_key
 from app.models.user import User
@@ -59,8 +59,8 @@ async def update_profile(
 
 @router.get("/devices", response_model=list[DeviceInfo])
 async def get_devices(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     sessions = await auth_service.get_user_devices(db, current_user.id)
     return [DeviceInfo.model_validate(s) for s in sessions]
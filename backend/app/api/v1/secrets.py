@@ -3,8 +3,9 @@ import uuid
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_client_ip, get_current_active_user
-from app.core.database import get_db
+from app.api.deps import get_client_ip, get_current_active_user, get_current_read_user
+from app.api.serializers import secret_serializer, share_serializer
+from app.core.database import get_db, get_read_db
 from app.models.user import User
 from app.schemas.secret import (
     FolderCreate,
@@ -30,17 +31,14 @@ async def list_secrets(
     sort_by: str = "updated_at",
     sort_order: str = "desc",
     category: str | None = None,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     secrets, total = await secret_service.get_vault_secrets(
         db, vault_id, current_user.id, folder_id,
         sort_by=sort_by, sort_order=sort_order, category=category,
     )
-    return SecretListResponse(
-        secrets=[SecretResponse.model_validate(s) for s in secrets],
-        total=total,
-    )
+    return secret_serializer.envelope_response("secrets", secrets, total=total)
 
 
 @router.post("/vaults/{vault_id}/secrets", response_model=SecretResponse, status_code=201)
@@ -77,20 +75,20 @@ async def create_secret(
 
 @router.get("/secrets/archived", response_model=list[SecretResponse])
 async def list_archived(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     secrets = await secret_service.get_archived_secrets(db, current_user.id)
-    return [SecretResponse.model_validate(s) for s in secrets]
+    return secret_serializer.list_response(secrets)
 
 
 @router.get("/secrets/deleted", response_model=list[SecretResponse])
 async def list_deleted(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     secrets = await secret_service.get_deleted_secrets(db, current_user.id)
-    return [SecretResponse.model_validate(s) for s in secrets]
+    return secret_serializer.list_response(secrets)
 
 
 @router.get("/secrets/{secret_id}", response_model=SecretResponse)
@@ -291,11 +289,11 @@ async def duplicate_secret(
 @router.get("/secrets/{secret_id}/sharing-history", response_model=list[ShareResponse])
 async def get_sharing_history(
     secret_id: uuid.UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     shares = await sharing_service.get_sharing_history(db, secret_id, current_user.id)
-    return [ShareResponse.model_validate(s) for s in shares]
+    return share_serializer.list_response(shares)
 
 
 @router.get("/secrets/{secret_id}/versions", response_model=list[SecretVersionResponse])
@@ -324,8 +322,8 @@ async def create_folder(
 @router.get("/vaults/{vault_id}/folders", response_model=list[FolderResponse])
 async def list_folders(
     vault_id: uuid.UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     folders = await secret_service.get_vault_folders(db, vault_id, current_user.id)
     return [FolderResponse.model_validate(f) for f in folders]
@@ -1,23 +1,50 @@
 import uuid
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_client_ip, get_current_active_user
-from app.core.database import get_db
+from app.api.deps import get_client_ip, get_current_active_user, get_current_read_user
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.core.pagination import set_next_cursor
+from app.core.ratelimit import RateLimit
 from app.models.user import User
 from app.schemas.sharing import (
+    BulkShareCreate,
     ShareCreate,
     SharedSecretResponse,
+    ShareKeysUpsert,
+    ShareKeysUpsertResponse,
     ShareLinkCreate,
     ShareLinkResponse,
     ShareResponse,
     ShareUpdate,
 )
-from app.services import audit_service, sharing_service
+from app.services import audit_service, digest_service, sharing_service
 
 router = APIRouter(tags=["Sharing"])
 
+share_link_rate_limit = RateLimit(
+    settings.SHARE_LINK_RATE_LIMIT_PER_MINUTE,
+    per_param="token",
+    param_per_minute=settings.SHARE_LINK_TOKEN_RATE_LIMIT_PER_MINUTE,
+)
+
+
+def _notify_recipients(db: AsyncSession, sharer: User, shares: list) -> None:
+    """Tell direct recipients (in-app and by email), digested per recipient."""
+    for share in shares:
+        if share.shared_with_user_id:
+            digest_service.notify(
+                db,
+                share.shared_with_user_id,
+                "share",
+                f"{sharer.name} shared an item with you",
+                "Open Shared with me to view it.",
+                {"share_id": str(share.id), "secret_id": str(share.secret_id)},
+                email=True,
+            )
+
 
 @router.post("/secrets/{secret_id}/share", response_model=ShareResponse, status_code=201)
 async def share_secret(
@@ -51,15 +78,68 @@ async def share_secret(
             "shared_with_team": str(data.shared_with_team_id) if data.shared_with_team_id else None,
         },
     )
+    _notify_recipients(db, current_user, [share])
     return ShareResponse.model_validate(share)
 
 
-@router.get("/shared-with-me", response_model=list[SharedSecretResponse])
-async def shared_with_me(
+@router.post("/shares/bulk", response_model=list[ShareResponse], status_code=201)
+async def bulk_share(
+    data: BulkShareCreate,
+    request: Request,
     current_user: User = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
-    results = await sharing_service.get_shared_with_me(db, current_user.id)
+    shares = await sharing_service.bulk_share_secrets(
+        db, current_user.id, [item.model_dump() for item in data.shares]
+    )
+    _notify_recipients(db, current_user, shares)
+    await audit_service.create_audit_log(
+        db,
+        user_id=current_user.id,
+        action="secret.share_bulk",
+        resource_type="share",
+        ip_address=get_client_ip(request),
+        user_agent=request.headers.get("user-agent"),
+        metadata={"shares": len(shares), "secrets": len({s.secret_id for s in shares})},
+    )
+    return [ShareResponse.model_validate(share) for share in shares]
+
+
+@router.put("/shares/keys", response_model=ShareKeysUpsertResponse)
+async def upsert_share_keys(
+    data: ShareKeysUpsert,
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    updated, created = await sharing_service.upsert_share_keys(
+        db, current_user.id, [item.model_dump() for item in data.keys]
+    )
+    _notify_recipients(db, current_user, created)
+    await audit_service.create_audit_log(
+        db,
+        user_id=current_user.id,
+        action="secret.share_rewrap",
+        resource_type="share",
+        ip_address=get_client_ip(request),
+        user_agent=request.headers.get("user-agent"),
+        metadata={"updated": updated, "created": len(created)},
+    )
+    return ShareKeysUpsertResponse(updated=updated, created=len(created))
+
+
+@router.get("/shared-with-me", response_model=list[SharedSecretResponse])
+async def shared_with_me(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    results, next_cursor = await sharing_service.get_shared_with_me(
+        db, current_user.id, limit=limit, cursor=cursor
+    )
+    set_next_cursor(response, next_cursor)
     return [
         SharedSecretResponse(
             share=ShareResponse.model_validate(share),
@@ -149,7 +229,7 @@ async def create_share_link(
     )
 
 
-@router.get("/share-links/{token}")
+@router.get("/share-links/{token}", dependencies=[Depends(share_link_rate_limit)])
 async def access_share_link(
     token: str,
     db: AsyncSession = Depends(get_db),
@@ -3,8 +3,8 @@ import uuid
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user
-from app.core.database import get_db
+from app.api.deps import get_current_active_user, get_current_read_user
+from app.core.database import get_db, get_read_db
 from app.models.user import User
 from app.schemas.tag import TagAssign, TagCreate, TagResponse, TagUpdate
 from app.services import tag_service
@@ -14,8 +14,8 @@ router = APIRouter(prefix="/tags", tags=["Tags"])
 
 @router.get("", response_model=list[TagResponse])
 async def list_tags(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     tags = await tag_service.get_user_tags(db, current_user.id)
     return [TagResponse.model_validate(t) for t in tags]
@@ -4,8 +4,8 @@ from fastapi import APIRouter, Depends, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_client_ip, get_current_active_user
-from app.core.database import get_db
+from app.api.deps import get_client_ip, get_current_active_user, get_current_read_user
+from app.core.database import get_db, get_read_db
 from app.core.exceptions import AuthorizationError, NotFoundError
 from app.models.organization import (
     OrgMembership,
@@ -16,7 +16,7 @@ from app.models.organization import (
 )
 from app.models.user import User
 from app.schemas.admin import TeamCreate, TeamMemberAdd, TeamResponse
-from app.services import audit_service
+from app.services import audit_service, loaders
 
 router = APIRouter(prefix="/org/teams", tags=["Teams"])
 
@@ -63,8 +63,8 @@ async def create_team(
 @router.get("", response_model=list[TeamResponse])
 async def list_teams(
     org_id: uuid.UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     await _require_org_member(db, current_user.id, org_id)
 
@@ -138,13 +138,7 @@ async def _require_org_member(
     org_id: uuid.UUID,
     admin_only: bool = False,
 ) -> OrgMembership:
-    result = await db.execute(
-        select(OrgMembership).where(
-            OrgMembership.user_id == user_id,
-            OrgMembership.org_id == org_id,
-        )
-    )
-    membership = result.scalar_one_or_none()
+    membership = await loaders.org_memberships(db).load((user_id, org_id))
     if not membership:
         raise AuthorizationError("Not a member of this organization")
     if admin_only and membership.role not in (OrgRole.ADMIN, OrgRole.MANAGER):
@@ -2,12 +2,12 @@ import math
 import secrets
 import string
 
-import httpx
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user
-from app.core.database import get_db
+from app.api.deps import get_current_read_user
+from app.core.database import get_read_db
+from app.core.http import UpstreamError
 from app.models.user import User
 from app.schemas.tools import (
     BreachCheckRequest,
@@ -15,7 +15,7 @@ from app.schemas.tools import (
     PasswordGenerateRequest,
     PasswordGenerateResponse,
 )
-from app.services import checkpost_service
+from app.services import breach_service, checkpost_service
 
 router = APIRouter(prefix="/tools", tags=["Password Tools"])
 
@@ -64,38 +64,18 @@ async def generate_password(data: PasswordGenerateRequest):
 
 @router.post("/check-breach", response_model=BreachCheckResponse)
 async def check_breach(data: BreachCheckRequest):
-    prefix = data.password_hash_prefix.upper()
-
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://api.pwnedpasswords.com/range/{prefix}",
-                timeout=10.0,
-            )
-
-        if response.status_code != 200:
-            return BreachCheckResponse(found=False, count=0)
-
-        lines = response.text.strip().split("\n")
-        total = 0
-        found = False
-        for line in lines:
-            parts = line.strip().split(":")
-            if len(parts) == 2:
-                count = int(parts[1])
-                if count > 0:
-                    found = True
-                    total += count
-
-        return BreachCheckResponse(found=found, count=total)
-    except httpx.RequestError:
+        text = await breach_service.get_range(data.password_hash_prefix)
+    except UpstreamError:
         return BreachCheckResponse(found=False, count=0)
+    found, total = breach_service.range_counts(text)
+    return BreachCheckResponse(found=found, count=total)
 
 
 @router.get("/health-report")
 async def health_report(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     summary = await checkpost_service.get_security_summary(db, current_user.id)
     return {
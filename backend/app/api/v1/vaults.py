@@ -3,8 +3,9 @@ import uuid
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_client_ip, get_current_active_user
-from app.core.database import get_db
+from app.api.deps import get_client_ip, get_current_active_user, get_current_read_user
+from app.api.serializers import JSONBytesResponse, vault_serializer
+from app.core.database import get_db, get_read_db
 from app.models.user import User
 from app.schemas.vault import (
     VaultCreate,
@@ -20,19 +21,17 @@ router = APIRouter(prefix="/vaults", tags=["Vaults"])
 
 @router.get("", response_model=VaultListResponse)
 async def list_vaults(
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     vaults, total = await vault_service.get_user_vaults(
         db, current_user.id, travel_mode=current_user.travel_mode_enabled,
     )
-    vault_responses = []
-    for v in vaults:
-        item_count = await vault_service.get_vault_item_count(db, v.id)
-        resp = VaultResponse.model_validate(v)
-        resp.item_count = item_count
-        vault_responses.append(resp)
-    return VaultListResponse(vaults=vault_responses, total=total)
+    rows = vault_serializer.rows(vaults)
+    stats = await vault_service.get_vault_stats(db, [row["id"] for row in rows])
+    for row in rows:
+        row["item_count"] = stats[row["id"]]["item_count"]
+    return JSONBytesResponse(vault_serializer.dump_envelope("vaults", rows, total=total))
 
 
 @router.post("", response_model=VaultResponse, status_code=201)
@@ -65,30 +64,29 @@ async def create_vault(
 @router.get("/{vault_id}", response_model=VaultResponse)
 async def get_vault(
     vault_id: uuid.UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     vault = await vault_service.get_vault(db, vault_id, current_user.id)
-    item_count = await vault_service.get_vault_item_count(db, vault.id)
+    stats = (await vault_service.get_vault_stats(db, [vault.id]))[vault.id]
     resp = VaultResponse.model_validate(vault)
-    resp.item_count = item_count
+    resp.item_count = stats["item_count"]
     return resp
 
 
 @router.get("/{vault_id}/details", response_model=VaultDetailResponse)
 async def get_vault_details(
     vault_id: uuid.UUID,
-    current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     vault = await vault_service.get_vault(db, vault_id, current_user.id)
-    item_count = await vault_service.get_vault_item_count(db, vault.id)
-    type_breakdown = await vault_service.get_vault_type_breakdown(db, vault.id)
-    folder_count = await vault_service.get_vault_folder_count(db, vault.id)
+    stats = (await vault_service.get_vault_stats(db, [vault.id], include_types=True))[vault.id]
     resp = VaultDetailResponse.model_validate(vault)
-    resp.item_count = item_count
-    resp.type_breakdown = type_breakdown
-    resp.folder_count = folder_count
+    resp.item_count = stats["item_count"]
+    resp.type_breakdown = stats["type_breakdown"]
+    resp.folder_count = stats["folder_count"]
+    resp.last_modified_at = stats["last_modified_at"]
     return resp
 
 
@@ -8,13 +8,64 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     SECRET_KEY: str = "dev-secret-key-change-in-production"
 
+    # Server (python -m app.server)
+    SERVER_HOST: str = "0.0.0.0"  # noqa: S104
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0  # 0: one per available CPU (always 1 on SQLite)
+    # Longer than nginx's upstream keepalive_timeout (60s) so the proxy, not
+    # the app, closes idle connections.
+    SERVER_KEEPALIVE_SECONDS: int = 75
+    SERVER_BACKLOG: int = 2048
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    # Proxies (comma-separated IPs/CIDRs) whose X-Forwarded-For is trusted for
+    # the client address; everyone else is keyed on the connecting address.
+    SERVER_FORWARDED_ALLOW_IPS: str = "127.0.0.1"
+
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///./vaultkeeper.db"
     DATABASE_POOL_SIZE: int = 5
     DATABASE_MAX_OVERFLOW: int = 0
+    DATABASE_POOL_TIMEOUT_SECONDS: float = 30.0
+    DATABASE_POOL_RECYCLE_SECONDS: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_POOL_ADAPTIVE: bool = False
+    DATABASE_POOL_ADAPTIVE_MAX_OVERFLOW: int = 20
+    DATABASE_POOL_ADAPTIVE_TARGET_WAIT_MS: float = 50.0
+    # asyncpg prepared statements kept per connection (0 behind pgbouncer
+    # in transaction mode).
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE: int = 256
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE_BYTES: int = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KIB: int = 64 * 1024
+    SQLITE_READER_POOL_SIZE: int = 4
+    DATABASE_REPLICA_URLS: str = ""
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DATABASE_REPLICA_CHECK_INTERVAL_SECONDS: float = 10.0
+    DATABASE_REPLICA_PROBE_TIMEOUT_SECONDS: float = 2.0
+    READ_YOUR_WRITES_WINDOW_SECONDS: float = 10.0
+    # Where "this user just wrote" marks live: "memory" only covers the
+    # worker that took the write; use "redis" with several workers or hosts.
+    READ_YOUR_WRITES_BACKEND: str = "memory"
+    # auto: create_all on SQLite, otherwise refuse to start unless the Alembic
+    # revision is at head. Also: create, require, warn, off.
+    DATABASE_SCHEMA_CHECK: str = "auto"
+    HEALTH_PROBE_CACHE_SECONDS: float = 5.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0
 
     # Redis
     REDIS_URL: str = "redis://:devredis123@localhost:6379/0"
+    # Push events (notification streams): "memory" for one worker, "redis"
+    # to fan out across workers and hosts.
+    PUBSUB_BACKEND: str = "memory"
+    PUBSUB_QUEUE_SIZE: int = 100
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS: float = 25.0
+    # WebSocket clients must send their auth message within this time.
+    NOTIFICATION_WS_AUTH_TIMEOUT_SECONDS: float = 10.0
+    # Digest (app.services.digest_service): events per user and type within
+    # a window become one notification/email; per-type windows override.
+    NOTIFICATION_DIGEST_WINDOW_SECONDS: float = 60.0
+    NOTIFICATION_DIGEST_WINDOWS: dict[str, float] = {}
+    NOTIFICATION_DIGEST_MAX_ITEMS: int = 20
 
     # JWT
     JWT_ALGORITHM: str = "HS256"
@@ -27,6 +78,35 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
     LOGIN_RATE_LIMIT_PER_MINUTE: int = 5
+    # Public share links: per client IP, and per token across all clients
+    SHARE_LINK_RATE_LIMIT_PER_MINUTE: int = 30
+    SHARE_LINK_TOKEN_RATE_LIMIT_PER_MINUTE: int = 60
+    SHARE_LINK_CACHE_SIZE: int = 10_000
+    SHARE_LINK_CACHE_TTL_SECONDS: float = 60.0
+
+    # Sweepers (app.tasks.sweepers)
+    SWEEP_BATCH_SIZE: int = 1000
+    SWEEP_BATCH_PAUSE_SECONDS: float = 0.05
+    # Expired links answer "expired" rather than "not found" for this long
+    EXPIRED_SHARE_RETENTION_HOURS: int = 24
+    # Expired sessions stay listed (inactive) under the user's devices
+    EXPIRED_SESSION_RETENTION_DAYS: int = 30
+    # Notifications: read ones expire after NOTIFICATION_READ_RETENTION_DAYS
+    # (or their type's entry in NOTIFICATION_TYPE_RETENTION_DAYS), unread
+    # ones after NOTIFICATION_UNREAD_RETENTION_DAYS; each user keeps at most
+    # NOTIFICATION_MAX_READ_PER_USER read ones.
+    NOTIFICATION_READ_RETENTION_DAYS: int = 90
+    NOTIFICATION_UNREAD_RETENTION_DAYS: int = 365
+    NOTIFICATION_TYPE_RETENTION_DAYS: dict[str, int] = {"password_rotation": 30}
+    NOTIFICATION_MAX_READ_PER_USER: int = 500
+    # Generated notifications (rotation reminders) are not re-created after
+    # deletion for this long; a secret left unrotated is reminded again
+    # once per period at most.
+    NOTIFICATION_DEDUPE_RETENTION_DAYS: int = 730
+
+    # Password-rotation reminders (app.services.rotation_service)
+    ROTATION_VAULT_BATCH_SIZE: int = 500
+    ROTATION_TIME_BUDGET_SECONDS: float = 300.0
 
     # Security
     BCRYPT_ROUNDS: int = 12
@@ -35,6 +115,24 @@ class Settings(BaseSettings):
 
     # HIBP
     HIBP_API_KEY: str = ""
+    # Range endpoint (app.services.breach_service); point it at a local
+    # stand-in in tests and offline setups.
+    HIBP_RANGE_URL: str = "https://api.pwnedpasswords.com/range"
+    # Offline mode: answer from a local index built with
+    # `python -m app.services.breach_index build` instead of the API.
+    HIBP_INDEX_PATH: str = ""
+    # A range is ~30 KB, so the default cache holds up to ~30 MB.
+    HIBP_CACHE_SIZE: int = 1024
+    HIBP_CACHE_TTL_SECONDS: float = 3600.0
+    # Whole-lookup budget, including waiting on a coalesced fetch.
+    HIBP_TIMEOUT_SECONDS: float = 3.0
+    # Consecutive failures that open the breaker, and how long it stays open.
+    HIBP_BREAKER_FAILURES: int = 5
+    HIBP_BREAKER_RESET_SECONDS: float = 30.0
+
+    # Shared outbound HTTP client (app.core.http)
+    HTTP_MAX_CONNECTIONS: int = 50
+    HTTP_KEEPALIVE_SECONDS: float = 60.0
 
     # Email
     SMTP_HOST: str = ""
@@ -42,11 +140,24 @@ class Settings(BaseSettings):
     SMTP_USER: str = ""
     SMTP_PASSWORD: str = ""
     FROM_EMAIL: str = "noreply@vaultkeeper.local"
+    SMTP_STARTTLS: bool = True
+    SMTP_TIMEOUT_SECONDS: float = 10.0
+    # Open connections to the relay (and so concurrent sends), and messages
+    # sent per connection checkout.
+    SMTP_POOL_SIZE: int = 4
+    SMTP_BATCH_SIZE: int = 50
+    # Outbox retries: attempt n waits EMAIL_RETRY_BASE_SECONDS * 2**(n-1).
+    EMAIL_MAX_ATTEMPTS: int = 5
+    EMAIL_RETRY_BASE_SECONDS: float = 30.0
 
     @property
     def cors_origins_list(self) -> list[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
+    @property
+    def database_replica_urls_list(self) -> list[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
     model_config = {"env_file": ".env", "case_sensitive": True}
 
 
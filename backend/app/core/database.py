@@ -1,38 +1,510 @@
+import asyncio
+import itertools
+import logging
+import time
+import weakref
 from collections.abc import AsyncGenerator
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from fastapi import Request
+from sqlalchemy import event, make_url, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, ORMExecuteState, Session, SessionTransaction
+from sqlalchemy.util import await_only
 
 from app.core.config import settings
+from app.core.pool import AdaptiveOverflow, InstrumentedQueuePool, PoolMetrics, instrument
+from app.core.security import get_unverified_subject
+
+logger = logging.getLogger(__name__)
 
 _is_sqlite = settings.DATABASE_URL.startswith("sqlite")
 
-engine_kwargs: dict = {
-    "echo": settings.DEBUG,
-}
-if not _is_sqlite:
-    engine_kwargs["pool_size"] = settings.DATABASE_POOL_SIZE
-    engine_kwargs["max_overflow"] = settings.DATABASE_MAX_OVERFLOW
 
-engine = create_async_engine(settings.DATABASE_URL, **engine_kwargs)
+def _is_sqlite_file(url: str) -> bool:
+    return url.startswith("sqlite") and make_url(url).database not in (None, "", ":memory:")
+
+
+def _engine_kwargs(url: str) -> dict:
+    kwargs: dict = {"echo": settings.DEBUG}
+    if _is_sqlite_file(url):
+        kwargs["poolclass"] = InstrumentedQueuePool
+        kwargs["pool_timeout"] = settings.DATABASE_POOL_TIMEOUT_SECONDS
+    elif not url.startswith("sqlite"):
+        kwargs["poolclass"] = InstrumentedQueuePool
+        kwargs["pool_size"] = settings.DATABASE_POOL_SIZE
+        kwargs["max_overflow"] = settings.DATABASE_MAX_OVERFLOW
+        kwargs["pool_timeout"] = settings.DATABASE_POOL_TIMEOUT_SECONDS
+        kwargs["pool_recycle"] = settings.DATABASE_POOL_RECYCLE_SECONDS
+        kwargs["pool_pre_ping"] = settings.DATABASE_POOL_PRE_PING
+    if make_url(url).get_driver_name() == "asyncpg":
+        kwargs["connect_args"] = {
+            "prepared_statement_cache_size": settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE
+        }
+    return kwargs
+
+
+pool_metrics: dict[str, PoolMetrics] = {}
+
+
+def _create_engine(url: str, name: str, **overrides) -> AsyncEngine:
+    new_engine = create_async_engine(url, **{**_engine_kwargs(url), **overrides})
+    adaptive = None
+    if settings.DATABASE_POOL_ADAPTIVE:
+        adaptive = AdaptiveOverflow(
+            floor=settings.DATABASE_MAX_OVERFLOW,
+            ceiling=settings.DATABASE_POOL_ADAPTIVE_MAX_OVERFLOW,
+            target_wait_ms=settings.DATABASE_POOL_ADAPTIVE_TARGET_WAIT_MS,
+        )
+    pool_metrics[name] = instrument(new_engine.sync_engine, name, adaptive)
+    return new_engine
+
+
+# --- SQLite profile -------------------------------------------------------
+# WAL lets readers run alongside the writer; synchronous=NORMAL only fsyncs
+# the WAL at checkpoints, so commits stop paying an fsync each. Writes are
+# serialized in-process by ``WriterGate`` instead of racing for SQLite's
+# lock, and read-only endpoints get their own pool of query_only readers.
+
+
+def _sqlite_pragmas(*, read_only: bool = False) -> list[str]:
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE_BYTES}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KIB}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def configure_sqlite(sync_engine: Engine, *, read_only: bool = False) -> None:
+    """Apply the SQLite pragmas to every new connection of ``sync_engine``."""
+    pragmas = _sqlite_pragmas(read_only=read_only)
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+class WriterGate:
+    """Lets one session at a time hold a write transaction on the SQLite file.
+
+    The gate is taken on a session's first write (flush or DML statement)
+    and released when its transaction ends. pysqlite only emits BEGIN before
+    DML, so reads before that point never hold a stale snapshot.
+
+    The gate is an ``asyncio.Lock`` and so only orders writers within one
+    process; writers in other processes still wait on SQLite's file lock
+    (``SQLITE_BUSY_TIMEOUT_MS``). ``app.server`` therefore runs a single
+    worker on SQLite.
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._locks: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+        return lock
+
+    def acquire(self, session: Session) -> None:
+        """Block (cooperatively) until ``session`` may write. Re-entrant per session."""
+        if "writer_lock" in session.info:
+            return
+        lock = self._lock()
+        try:
+            await_only(asyncio.wait_for(lock.acquire(), self.timeout))
+        except TimeoutError as exc:
+            raise TimeoutError("Timed out waiting for the SQLite writer") from exc
+        session.info["writer_lock"] = lock
+
+    def release(self, session: Session) -> None:
+        lock = session.info.pop("writer_lock", None)
+        if lock is not None:
+            lock.release()
+
+
+writer_gate = WriterGate(settings.SQLITE_BUSY_TIMEOUT_MS / 1000)
+
 
-async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+@event.listens_for(Session, "before_flush")
+def _gate_flush(session: Session, flush_context, instances) -> None:
+    if session.info.get("sqlite_writer"):
+        writer_gate.acquire(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _gate_statement(orm_execute_state: ORMExecuteState) -> None:
+    session = orm_execute_state.session
+    if session.info.get("sqlite_writer") and not orm_execute_state.is_select:
+        writer_gate.acquire(session)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _release_gate(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        writer_gate.release(session)
+
+
+def _read_only_bind(bind: AsyncEngine) -> AsyncEngine:
+    """``bind`` with transactions opened READ ONLY where the backend supports it."""
+    if bind.dialect.name == "postgresql":
+        return bind.execution_options(postgresql_readonly=True)
+    return bind
+
+
+engine = _create_engine(settings.DATABASE_URL, "primary")
+
+if _is_sqlite_file(settings.DATABASE_URL):
+    configure_sqlite(engine.sync_engine)
+    async_session_factory = async_sessionmaker(
+        engine, expire_on_commit=False, info={"sqlite_writer": True}
+    )
+    sqlite_reader_engine: AsyncEngine | None = _create_engine(
+        settings.DATABASE_URL,
+        "sqlite-reader",
+        pool_size=settings.SQLITE_READER_POOL_SIZE,
+        max_overflow=0,
+    )
+    configure_sqlite(sqlite_reader_engine.sync_engine, read_only=True)
+    read_session_factory = async_sessionmaker(sqlite_reader_engine, expire_on_commit=False)
+else:
+    async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    sqlite_reader_engine = None
+    read_session_factory = async_sessionmaker(_read_only_bind(engine), expire_on_commit=False)
+
+primary_read_session_factory = async_sessionmaker(_read_only_bind(engine), expire_on_commit=False)
 
 
 class Base(DeclarativeBase):
     pass
 
 
-async def create_tables():
-    async with engine.begin() as conn:
+async def create_tables(bind: AsyncEngine | None = None):
+    async with (bind or engine).begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def dispose_engines() -> None:
+    """Close every pooled connection (primary, SQLite reader, replicas)."""
+    if sqlite_reader_engine is not None:
+        await sqlite_reader_engine.dispose()
+        # Fold the WAL back into the database file while no reader holds it.
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("PRAGMA wal_checkpoint(PASSIVE)")
+    await engine.dispose()
+    await replica_router.dispose()
+
+
+# --- Write tracking -------------------------------------------------------
+# Sessions record whether they wrote anything so a user's reads can be pinned
+# to the primary for a short window afterwards (read-your-writes).
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_write(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_write(orm_execute_state: ORMExecuteState) -> None:
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+class ReadOnlySessionError(RuntimeError):
+    """A session handed out by ``get_read_db`` tried to write."""
+
+
+@event.listens_for(Session, "before_flush")
+def _guard_read_only_flush(session: Session, flush_context, instances) -> None:
+    if session.info.get("read_only"):
+        raise ReadOnlySessionError("Flush attempted on a read-only session")
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _guard_read_only_statement(orm_execute_state: ORMExecuteState) -> None:
+    state = orm_execute_state
+    if state.session.info.get("read_only") and (
+        state.is_insert or state.is_update or state.is_delete
+    ):
+        raise ReadOnlySessionError("Write statement executed on a read-only session")
+
+
+class RecentWrites:
+    """Users who wrote within the last ``window`` seconds.
+
+    Marks are kept in process and, with ``READ_YOUR_WRITES_BACKEND="redis"``,
+    also in Redis as keys expiring with the window, so a write handled by one
+    worker (or host) pins the user's reads to the primary on all of them.
+    Without Redis a mark only covers the worker that took the write.
+    """
+
+    KEY_PREFIX = "vaultkeeper:recent-write:"
+
+    def __init__(self, window: float, max_entries: int = 10_000, backend: str = "memory"):
+        self.window = window
+        self.max_entries = max_entries
+        self.backend = backend
+        self._marks: dict[str, float] = {}
+        self._redis = None
+
+    def _client(self):
+        if self.backend != "redis":
+            return None
+        if self._redis is None:
+            try:
+                import redis.asyncio as redis
+            except ImportError:
+                logger.warning(
+                    "READ_YOUR_WRITES_BACKEND=redis but redis is not installed; "
+                    "write marks stay per process"
+                )
+                self.backend = "memory"
+                return None
+            self._redis = redis.from_url(settings.REDIS_URL)
+        return self._redis
+
+    async def mark(self, key: str) -> None:
+        now = time.monotonic()
+        if len(self._marks) >= self.max_entries:
+            self._marks = {k: t for k, t in self._marks.items() if now - t < self.window}
+        self._marks[key] = now
+        client = self._client()
+        if client is not None:
+            try:
+                await client.set(self.KEY_PREFIX + key, 1, px=int(self.window * 1000))
+            except Exception as exc:
+                logger.warning("Could not share the write mark for %s: %s", key, exc)
+
+    async def is_recent(self, key: str) -> bool:
+        marked = self._marks.get(key)
+        if marked is not None and time.monotonic() - marked < self.window:
+            return True
+        client = self._client()
+        if client is None:
+            return False
+        try:
+            return bool(await client.exists(self.KEY_PREFIX + key))
+        except Exception as exc:
+            # Unknown: the primary is always consistent.
+            logger.warning("Could not read the write mark for %s: %s", key, exc)
+            return True
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+recent_writes = RecentWrites(
+    settings.READ_YOUR_WRITES_WINDOW_SECONDS, backend=settings.READ_YOUR_WRITES_BACKEND
+)
+
+
+# --- Read replicas --------------------------------------------------------
+
+# On a streaming standby: zero when all received WAL is replayed (an idle
+# primary would otherwise look like growing lag), else time since last replay.
+_PG_REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class Replica:
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.engine = _create_engine(url, name)
+        self.session_factory = async_sessionmaker(
+            _read_only_bind(self.engine), expire_on_commit=False
+        )
+        self.lag_seconds: float | None = None
+        self.healthy = True
+        self.checked_at = float("-inf")
+        self._probe_lock = asyncio.Lock()
+
+    async def probe(self, timeout: float) -> None:
+        if self._probe_lock.locked():
+            return  # another request is already probing; use the current state
+        async with self._probe_lock:
+            try:
+                lag = await asyncio.wait_for(self._measure_lag(), timeout)
+            except Exception as exc:
+                if self.healthy:
+                    logger.warning("Replica %s failed health probe: %s", self.name, exc)
+                self.healthy = False
+                self.lag_seconds = None
+            else:
+                self.healthy = True
+                self.lag_seconds = float(lag)
+            self.checked_at = time.monotonic()
+
+    async def _measure_lag(self) -> float:
+        async with self.engine.connect() as conn:
+            if self.engine.dialect.name == "postgresql":
+                return (await conn.execute(_PG_REPLICA_LAG_SQL)).scalar() or 0.0
+            await conn.execute(text("SELECT 1"))
+            return 0.0
+
+    def in_rotation(self, max_lag: float) -> bool:
+        return self.healthy and self.lag_seconds is not None and self.lag_seconds <= max_lag
+
+    def status(self) -> dict:
+        return {"name": self.name, "healthy": self.healthy, "lag_seconds": self.lag_seconds}
+
+
+class ReplicaRouter:
+    """Round-robin over replicas, skipping any that are down or lagging."""
+
+    def __init__(
+        self,
+        replicas: list[Replica],
+        *,
+        max_lag: float,
+        check_interval: float,
+        probe_timeout: float,
+    ):
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.probe_timeout = probe_timeout
+        self._cycle = itertools.cycle(replicas) if replicas else None
+
+    async def pick(self) -> Replica | None:
+        if self._cycle is None:
+            return None
+        now = time.monotonic()
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if now - replica.checked_at >= self.check_interval:
+                await replica.probe(self.probe_timeout)
+            if replica.in_rotation(self.max_lag):
+                return replica
+        return None
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def status(self) -> list[dict]:
+        return [replica.status() for replica in self.replicas]
+
+
+replica_router = ReplicaRouter(
+    [Replica(f"replica-{i}", url) for i, url in enumerate(settings.database_replica_urls_list)],
+    max_lag=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.DATABASE_REPLICA_CHECK_INTERVAL_SECONDS,
+    probe_timeout=settings.DATABASE_REPLICA_PROBE_TIMEOUT_SECONDS,
+)
+
+
+def _routing_key(request: Request) -> str | None:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    return get_unverified_subject(token)
+
+
+async def _read_session_factory(user_key: str | None) -> async_sessionmaker[AsyncSession]:
+    if user_key and await recent_writes.is_recent(user_key):
+        return primary_read_session_factory
+    replica = await replica_router.pick()
+    return replica.session_factory if replica else read_session_factory
+
+
+# --- Health ---------------------------------------------------------------
+
+
+class DatabaseProbe:
+    """``SELECT 1`` against the primary, cached so health checks stay cheap."""
+
+    def __init__(self, ttl: float, timeout: float):
+        self.ttl = ttl
+        self.timeout = timeout
+        self._result: dict | None = None
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def check(self) -> dict:
+        if self._result is not None and time.monotonic() - self._checked_at < self.ttl:
+            return self._result
+        async with self._lock:
+            if self._result is None or time.monotonic() - self._checked_at >= self.ttl:
+                self._result = await self._probe()
+                self._checked_at = time.monotonic()
+        return self._result
+
+    async def _probe(self) -> dict:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._select_one(), self.timeout)
+        except Exception as exc:
+            return {"reachable": False, "latency_ms": None, "error": type(exc).__name__}
+        latency_ms = round((time.perf_counter() - start) * 1000, 3)
+        return {"reachable": True, "latency_ms": latency_ms, "error": None}
+
+    async def _select_one(self) -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+
+database_probe = DatabaseProbe(
+    ttl=settings.HEALTH_PROBE_CACHE_SECONDS, timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS
+)
+
+
+# --- Request sessions -----------------------------------------------------
+
+
+def _has_writes(session: AsyncSession) -> bool:
+    return bool(session.info.get("wrote") or session.new or session.dirty or session.deleted)
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_factory() as session:
         try:
             yield session
-            await session.commit()
+            # Requests that only read skip the COMMIT; closing the session
+            # rolls back whatever read transaction is open.
+            if _has_writes(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
+        user_key = session.info.get("user_id")
+        if user_key and session.info.get("wrote"):
+            await recent_writes.mark(user_key)
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints, served by a replica when one is usable.
+
+    Falls back to the primary (or, on SQLite, its reader pool) when no replica
+    is configured or in rotation, and to the primary for users who wrote
+    recently so they always see their own changes.
+
+    Transactions are opened READ ONLY on PostgreSQL (and the SQLite readers are
+    ``query_only``). They are never committed, only released, and any
+    flush or DML on the session raises ``ReadOnlySessionError``.
+    """
+    factory = await _read_session_factory(_routing_key(request))
+    async with factory(info={"read_only": True}) as session:
+        yield session
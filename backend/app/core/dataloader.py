@@ -0,0 +1,92 @@
+"""Request-scoped batching loader (DataLoader pattern).
+
+``load(key)`` calls issued in the same event-loop tick are collected and
+resolved with one batch query; results are memoized on the loader, so
+repeated lookups of the same key later in the request cost nothing.
+
+Loaders are bound to the request session through ``session_loader`` and
+live in ``session.info``, so they are discarded with the session. All loaders
+of one session share a lock: an ``AsyncSession`` must not run two queries
+at once, and loaders dispatch from their own tasks.
+"""
+
+import asyncio
+import functools
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Mapping
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+BatchLoad = Callable[[list[Any]], Awaitable[Mapping[Any, Any]]]
+
+
+class DataLoader:
+    def __init__(self, batch_load: BatchLoad, *, lock: asyncio.Lock | None = None):
+        self._batch_load = batch_load
+        self._lock = lock or asyncio.Lock()
+        self._cache: dict[Hashable, asyncio.Future] = {}
+        self._pending: list[Hashable] = []
+        self._tasks: set[asyncio.Task] = set()
+
+    def load(self, key: Hashable) -> asyncio.Future:
+        """Future for ``key``'s value (``None`` when the batch had no row for it)."""
+        future = self._cache.get(key)
+        if future is not None:
+            return future
+        loop = asyncio.get_running_loop()
+        future = self._cache[key] = loop.create_future()
+        self._pending.append(key)
+        if len(self._pending) == 1:
+            loop.call_soon(self._dispatch)
+        return future
+
+    async def load_many(self, keys: Iterable[Hashable]) -> list[Any]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: Hashable, value: Any) -> None:
+        if key not in self._cache:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._cache[key] = future
+
+    def clear(self, key: Hashable | None = None) -> None:
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._resolve(keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, keys: list[Hashable]) -> None:
+        try:
+            async with self._lock:
+                results = await self._batch_load(keys)
+        except Exception as exc:
+            for key in keys:
+                # Failures are not memoized; a later load retries.
+                future = self._cache.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(exc)
+            return
+        for key in keys:
+            future = self._cache.get(key)
+            if future is not None and not future.done():
+                future.set_result(results.get(key))
+
+
+def session_loader(
+    db: AsyncSession,
+    name: str,
+    batch_load: Callable[[AsyncSession, list[Any]], Awaitable[Mapping[Any, Any]]],
+) -> DataLoader:
+    """The ``name`` loader bound to ``db``, created on first use."""
+    loaders: dict[str, DataLoader] = db.info.setdefault("loaders", {})
+    loader = loaders.get(name)
+    if loader is None:
+        lock = db.info.setdefault("loader_lock", asyncio.Lock())
+        loader = loaders[name] = DataLoader(functools.partial(batch_load, db), lock=lock)
+    return loader
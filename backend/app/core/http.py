@@ -0,0 +1,158 @@
+"""Shared outbound HTTP client and the pieces for calling flaky upstreams.
+
+``http_client()`` returns one ``httpx.AsyncClient`` per event loop, so
+calls reuse keep-alive connections (and HTTP/2 when ``h2`` is installed)
+instead of paying a TCP/TLS handshake per request; it is closed at
+shutdown. ``httpx`` is only imported on first use, keeping it off the app's
+import path. For upstreams worth protecting:
+
+* ``TTLCache``: bounded LRU whose entries also expire;
+* ``SingleFlight``: concurrent calls for one key share a single run;
+* ``CircuitBreaker``: after repeated failures, calls fail fast for a while
+  and then one trial call decides whether to close it again.
+"""
+
+import asyncio
+import importlib.util
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TYPE_CHECKING, Any
+
+from app.core.config import settings
+from app.core.lifecycle import on_shutdown
+
+if TYPE_CHECKING:
+    import httpx
+
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, "httpx.AsyncClient"] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def http_client() -> "httpx.AsyncClient":
+    """The running event loop's client (its connection pool is bound to a loop)."""
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_SECONDS,
+            ),
+            headers={"User-Agent": settings.APP_NAME},
+        )
+    return client
+
+
+@on_shutdown
+async def close_http_client() -> None:
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires, value = entry
+        if expires <= self.clock():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (self.clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class SingleFlight:
+    def __init__(self):
+        self._running: dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``fn()``, or the run already in progress for ``key``.
+
+        The shared run is shielded: a caller giving up (e.g. on its own
+        timeout) does not cancel it for the others.
+        """
+        future = self._running.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._running[key] = future
+            future.add_done_callback(lambda _: self._running.pop(key, None))
+        return await asyncio.shield(future)
+
+
+class UpstreamError(Exception):
+    """An upstream call failed, timed out or was refused by its breaker."""
+
+
+class CircuitOpenError(UpstreamError):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self.clock() - self._opened_at < self.reset_seconds:
+            return "open"
+        return "half_open"
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial):
+            raise CircuitOpenError
+        self._trial = state == "half_open"
+        try:
+            result = await fn()
+        except Exception:
+            self._record_failure()
+            raise
+        finally:
+            self._trial = False
+        self.failures = 0
+        self._opened_at = None
+        return result
+
+    def _record_failure(self) -> None:
+        self.failures += 1
+        if self._opened_at is not None or self.failures >= self.failure_threshold:
+            self._opened_at = self.clock()
@@ -0,0 +1,261 @@
+"""Application startup: schema check, background warm-up and timings.
+
+``startup()`` runs from the FastAPI lifespan. Outside SQLite dev mode it
+only compares the database's Alembic revision with the migrations head
+instead of running ``create_all``; then it runs the hooks registered with
+``on_startup`` (checks that must fail the deploy rather than requests).
+Engines and compiled statement caches are warmed in a background task so
+the worker starts accepting requests immediately. Phase timings are kept
+in ``startup_report`` (shown by ``/api/health/details``).
+
+``shutdown()`` runs after the server has drained in-flight requests: it
+cancels an unfinished warm-up, runs the hooks registered with
+``on_shutdown`` (modules holding connections or clients close them there) and
+disposes every engine.
+
+Import cost is tracked separately, in a fresh interpreter:
+
+    python -m app.core.lifecycle [--top 15] [--budget-ms 1500] [--startup]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import subprocess
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import contextmanager
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.database import (
+    create_tables,
+    database_probe,
+    dispose_engines,
+    engine,
+    primary_read_session_factory,
+    read_session_factory,
+    recent_writes,
+    replica_router,
+    sqlite_reader_engine,
+)
+from app.core.pubsub import hub
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+SCHEMA_CHECK_MODES = ("auto", "create", "require", "warn", "off")
+
+
+class SchemaRevisionError(RuntimeError):
+    pass
+
+
+class StartupReport:
+    def __init__(self):
+        self.phases_ms: dict[str, float] = {}
+        self.schema: dict | None = None
+        self.warmup = "not_started"
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases_ms[name] = round((time.perf_counter() - start) * 1000, 3)
+
+    def snapshot(self) -> dict:
+        return {"phases_ms": dict(self.phases_ms), "schema": self.schema, "warmup": self.warmup}
+
+
+startup_report = StartupReport()
+_background_tasks: set[asyncio.Task] = set()
+_startup_hooks: list[Callable[[], Awaitable[None]]] = []
+_shutdown_hooks: list[Callable[[], Awaitable[None]]] = []
+
+
+# --- Schema ---------------------------------------------------------------
+
+
+def migration_heads() -> set[str]:
+    # Alembic is only needed on this path, so it is not imported with the app.
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+async def database_revisions(bind: AsyncEngine) -> set[str]:
+    from alembic.runtime.migration import MigrationContext
+
+    async with bind.connect() as conn:
+        return set(
+            await conn.run_sync(
+                lambda sync_conn: MigrationContext.configure(sync_conn).get_current_heads()
+            )
+        )
+
+
+async def prepare_schema(bind: AsyncEngine = engine, mode: str | None = None) -> dict:
+    """Create tables (SQLite dev) or verify the Alembic revision, per ``mode``.
+
+    ``auto`` creates tables on SQLite and requires an up-to-date revision
+    everywhere else; ``require`` refuses to start on a mismatch, ``warn``
+    only logs it.
+    """
+    mode = mode or settings.DATABASE_SCHEMA_CHECK
+    if mode not in SCHEMA_CHECK_MODES:
+        raise ValueError(f"DATABASE_SCHEMA_CHECK must be one of {', '.join(SCHEMA_CHECK_MODES)}")
+    if mode == "auto":
+        mode = "create" if bind.dialect.name == "sqlite" else "require"
+    if mode == "off":
+        return {"mode": mode}
+    if mode == "create":
+        await create_tables(bind)
+        return {"mode": mode}
+
+    current, heads = await database_revisions(bind), migration_heads()
+    status = {"mode": mode, "revision": sorted(current), "head": sorted(heads)}
+    if current != heads:
+        message = (
+            f"Database schema is at revision {', '.join(sorted(current)) or 'none'} but the "
+            f"migrations head is {', '.join(sorted(heads))}; run `alembic upgrade head`"
+        )
+        if mode == "require":
+            raise SchemaRevisionError(message)
+        logger.warning(message)
+    return status
+
+
+# --- Warm-up --------------------------------------------------------------
+
+
+async def warm_up() -> None:
+    """Open a pooled connection on every engine and compile the hot queries."""
+    from app.services import hot_queries
+
+    factories = [("primary", primary_read_session_factory)]
+    if sqlite_reader_engine is not None:
+        factories.append(("sqlite-reader", read_session_factory))
+    factories += [(replica.name, replica.session_factory) for replica in replica_router.replicas]
+
+    startup_report.warmup = "running"
+    failed = False
+    for name, factory in factories:
+        with startup_report.phase(f"warmup.{name}"):
+            try:
+                async with factory(info={"read_only": True}) as session:
+                    await hot_queries.warm(session)
+            except Exception as exc:
+                failed = True
+                logger.warning("Warm-up of %s failed: %s", name, exc)
+    with startup_report.phase("warmup.probes"):
+        await database_probe.check()
+        for replica in replica_router.replicas:
+            await replica.probe(replica_router.probe_timeout)
+    startup_report.warmup = "failed" if failed else "done"
+
+
+async def startup() -> None:
+    with startup_report.phase("schema"):
+        startup_report.schema = await prepare_schema()
+    with startup_report.phase("pubsub"):
+        await hub.start()
+    for hook in _startup_hooks:
+        with startup_report.phase(hook.__qualname__):
+            await hook()
+    task = asyncio.create_task(warm_up())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+def on_startup(hook: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    """Run ``hook`` at startup, before requests are served; if it raises, the
+    worker does not start."""
+    _startup_hooks.append(hook)
+    return hook
+
+
+def on_shutdown(hook: Callable[[], Awaitable[None]]) -> Callable[[], Awaitable[None]]:
+    """Run ``hook`` at shutdown, before the engines are disposed."""
+    _shutdown_hooks.append(hook)
+    return hook
+
+
+on_shutdown(hub.stop)
+on_shutdown(recent_writes.close)
+
+
+async def shutdown() -> None:
+    for task in list(_background_tasks):
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    for hook in _shutdown_hooks:
+        try:
+            await hook()
+        except Exception:
+            logger.exception("Shutdown hook %s failed", getattr(hook, "__qualname__", hook))
+    await dispose_engines()
+
+
+# --- Import-time report ---------------------------------------------------
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|\s+(\S+)")
+
+
+def import_report(module: str = "app.main") -> list[tuple[str, int, int]]:
+    """``(module, self_us, cumulative_us)`` for every import made by ``module``."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            rows.append((match.group(3), int(match.group(1)), int(match.group(2))))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report app import and startup time.")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, help="exit 1 if the import takes longer")
+    parser.add_argument("--startup", action="store_true", help="also run the startup phases")
+    args = parser.parse_args()
+
+    rows = import_report(args.module)
+    total_ms = next(cum for name, _, cum in rows if name == args.module) / 1000
+    print(f"import {args.module}: {total_ms:.1f} ms ({len(rows)} modules)")
+    print(f"{'self ms':>9} {'cumulative ms':>14}  module")
+    for name, self_us, cum_us in sorted(rows, key=lambda row: row[1], reverse=True)[: args.top]:
+        print(f"{self_us / 1000:>9.1f} {cum_us / 1000:>14.1f}  {name}")
+
+    if args.startup:
+
+        async def run_startup() -> None:
+            await startup()
+            await asyncio.gather(*_background_tasks)
+            await shutdown()
+
+        asyncio.run(run_startup())
+        print(json.dumps(startup_report.snapshot(), indent=2))
+
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        sys.exit(f"import {args.module} took {total_ms:.1f} ms, budget {args.budget_ms} ms")
+
+
+if __name__ == "__main__":
+    main()
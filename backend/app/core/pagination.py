@@ -0,0 +1,88 @@
+"""Keyset (cursor) pagination.
+
+A cursor is the sort key of the last row of a page, opaque to clients
+(URL-safe base64 JSON). The next page is everything strictly after it in
+sort order, so paging costs one index range scan however deep the client
+goes and rows inserted meanwhile do not shift pages the way OFFSET does.
+
+    stmt = stmt.where(after(cursor, Share.created_at, Share.id)).order_by(
+        Share.created_at.desc(), Share.id.desc()
+    )
+    rows = (await db.execute(stmt.limit(limit + 1))).all()
+    page, next_cursor = split_page(rows, limit, lambda r: (r.created_at, r.id))
+
+Responses carry the next cursor in the ``X-Next-Cursor`` header (absent on
+the last page).
+"""
+
+import base64
+import json
+import uuid
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import Any
+
+from fastapi import Response
+from sqlalchemy import true, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.exceptions import ValidationError
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"uuid": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "uuid" in value:
+            return uuid.UUID(value["uuid"])
+    return value
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    payload = json.dumps([_encode_value(value) for value in key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[Any]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return [_decode_value(value) for value in json.loads(payload)]
+    except (ValueError, TypeError, KeyError) as exc:
+        raise ValidationError("Invalid cursor") from exc
+
+
+def after(cursor: str | None, *columns, descending: bool = True) -> ColumnElement[bool]:
+    """Rows strictly after ``cursor`` when ordered by ``columns``."""
+    if cursor is None:
+        return true()
+    key = decode_cursor(cursor)
+    if len(key) != len(columns):
+        raise ValidationError("Invalid cursor")
+    if descending:
+        return tuple_(*columns) < tuple_(*key)
+    return tuple_(*columns) > tuple_(*key)
+
+
+def split_page(
+    rows: Sequence[Any], limit: int, key: Callable[[Any], Sequence[Any]]
+) -> tuple[list[Any], str | None]:
+    """The first ``limit`` of ``limit + 1`` fetched rows, and the cursor after them."""
+    page = list(rows[:limit])
+    if len(rows) <= limit:
+        return page, None
+    return page, encode_cursor(key(page[-1]))
+
+
+def set_next_cursor(response: Response, next_cursor: str | None) -> None:
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
@@ -0,0 +1,184 @@
+"""Connection pool instrumentation and adaptive overflow sizing.
+
+``InstrumentedQueuePool`` times every checkout (including the time spent
+queued behind other requests) and counts checkout timeouts. ``instrument``
+hooks SQLAlchemy pool events on an engine to track connections in use,
+connection age and invalidations. Everything lands in a ``PoolMetrics``
+object whose ``snapshot()`` is served by the readiness endpoint.
+"""
+
+import bisect
+import time
+from collections import deque
+
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+AGE_BUCKETS_S = (1, 10, 60, 300, 900, 1800, 3600, 7200, 21600, 86400)
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative ``le`` buckets, Prometheus style)."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        cumulative, running = {}, 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts, strict=True):
+            running += count
+            cumulative[str(bound)] = running
+        return {"buckets": cumulative, "sum": round(self.total, 3), "count": self.count}
+
+
+class PoolMetrics:
+    def __init__(self, name: str, window: int = 200):
+        self.name = name
+        self.checkout_wait_ms = Histogram(WAIT_BUCKETS_MS)
+        self.connection_age_s = Histogram(AGE_BUCKETS_S)
+        self.recent_waits_ms: deque[float] = deque(maxlen=window)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.in_use = 0
+        self.pool: Pool | None = None
+
+    def observe_wait(self, wait_ms: float) -> None:
+        self.checkout_wait_ms.observe(wait_ms)
+        self.recent_waits_ms.append(wait_ms)
+
+    def recent_wait_quantile(self, q: float) -> float:
+        if not self.recent_waits_ms:
+            return 0.0
+        ordered = sorted(self.recent_waits_ms)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        snapshot = {
+            "name": self.name,
+            "in_use": self.in_use,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "checkout_wait_p95_ms": round(self.recent_wait_quantile(0.95), 3),
+            "checkout_wait_ms": self.checkout_wait_ms.snapshot(),
+            "connection_age_s": self.connection_age_s.snapshot(),
+        }
+        if isinstance(pool, QueuePool):
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            snapshot.update(
+                idle=pool.checkedin(),
+                size=pool.size(),
+                max_overflow=pool._max_overflow,
+                saturation=round(self.in_use / capacity, 3) if capacity else 1.0,
+            )
+        return snapshot
+
+
+class AdaptiveOverflow:
+    """Raise ``max_overflow`` while checkouts queue, lower it once they stop.
+
+    Evaluated every ``interval`` checkouts from the recent p95 wait. Overflow
+    connections beyond the new limit are closed as they are checked back in.
+    """
+
+    def __init__(
+        self,
+        *,
+        floor: int,
+        ceiling: int,
+        target_wait_ms: float,
+        step: int = 2,
+        interval: int = 50,
+    ):
+        self.floor = floor
+        self.ceiling = max(ceiling, floor)
+        self.target_wait_ms = target_wait_ms
+        self.step = step
+        self.interval = interval
+
+    def tune(self, pool: QueuePool, metrics: PoolMetrics) -> None:
+        if metrics.checkouts % self.interval:
+            return
+        p95 = metrics.recent_wait_quantile(0.95)
+        current = pool._max_overflow
+        if p95 > self.target_wait_ms and current < self.ceiling:
+            pool._max_overflow = min(self.ceiling, current + self.step)
+        elif p95 < self.target_wait_ms / 4 and current > self.floor:
+            pool._max_overflow = max(self.floor, current - 1)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout wait time and timeouts."""
+
+    metrics: PoolMetrics | None = None
+    adaptive: AdaptiveOverflow | None = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except sa_exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.timeouts += 1
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.checkouts += 1
+                self.metrics.observe_wait((time.perf_counter() - start) * 1000)
+                if self.adaptive is not None:
+                    self.adaptive.tune(self, self.metrics)
+
+    def recreate(self) -> QueuePool:
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        pool.adaptive = self.adaptive
+        if self.metrics is not None:
+            self.metrics.pool = pool
+            self.metrics.in_use = 0
+        return pool
+
+
+def instrument(engine: Engine, name: str, adaptive: AdaptiveOverflow | None = None) -> PoolMetrics:
+    """Attach pool event listeners (and ``InstrumentedQueuePool`` state) to ``engine``."""
+    metrics = PoolMetrics(name)
+    metrics.pool = engine.pool
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.metrics = metrics
+        engine.pool.adaptive = adaptive
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        connection_record.info["created_at"] = time.monotonic()
+        metrics.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        metrics.in_use += 1
+        created_at = connection_record.info.get("created_at")
+        if created_at is not None:
+            metrics.connection_age_s.observe(time.monotonic() - created_at)
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record) -> None:
+        metrics.in_use = max(0, metrics.in_use - 1)
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception) -> None:
+        metrics.invalidations += 1
+
+    return metrics
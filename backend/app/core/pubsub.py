@@ -0,0 +1,163 @@
+"""In-process pub/sub for per-user push events, with optional Redis fan-out.
+
+Each open stream (SSE or WebSocket) subscribes a bounded queue under its
+user id; ``hub.publish`` puts an event on every queue of that user. With
+``PUBSUB_BACKEND="redis"`` events are also published on one Redis channel
+and every worker delivers the ones it receives from the others, so a
+user connected to worker A sees events raised on worker B. The Redis
+subscription is re-established with backoff when the connection drops.
+
+Services do not publish directly but through ``publish_after_commit``:
+the event is held on the session and sent once the transaction commits
+(and dropped on rollback), so clients never hear about rows they then
+cannot read.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import uuid
+from collections.abc import AsyncIterator, Iterable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "vaultkeeper:events"
+RECONNECT_DELAY_SECONDS = 0.5
+RECONNECT_MAX_DELAY_SECONDS = 30.0
+
+
+class Hub:
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._origin = uuid.uuid4().hex
+        self._redis = None
+        self._listener: asyncio.Task | None = None
+        self._pending: set[asyncio.Task] = set()
+        self._retry_delay = RECONNECT_DELAY_SECONDS
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, user_id: uuid.UUID | str) -> AsyncIterator[asyncio.Queue]:
+        key = str(user_id)
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._subscribers.setdefault(key, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            queues = self._subscribers.get(key)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[key]
+
+    def publish(self, user_id: uuid.UUID | str, payload: dict) -> None:
+        """Deliver ``payload`` to the user's streams here and, with Redis, on other workers."""
+        self.publish_many([user_id], payload)
+
+    def publish_many(self, user_ids: Iterable[uuid.UUID | str], payload: dict) -> None:
+        """``publish`` to many users at once, as a single Redis message."""
+        keys = [str(user_id) for user_id in user_ids]
+        for key in keys:
+            self._deliver(key, payload)
+        if self._redis is not None and keys:
+            message = json.dumps({"origin": self._origin, "user_ids": keys, "payload": payload})
+            task = asyncio.get_running_loop().create_task(self._redis.publish(CHANNEL, message))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    def _deliver(self, key: str, payload: dict) -> None:
+        for queue in self._subscribers.get(key, ()):
+            if queue.full():
+                # A stalled client loses its oldest events, not the newest.
+                queue.get_nowait()
+            queue.put_nowait(payload)
+
+    async def start(self) -> None:
+        if settings.PUBSUB_BACKEND != "redis" or self._redis is not None:
+            return
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            logger.warning("PUBSUB_BACKEND=redis but redis is not installed; events stay local")
+            return
+        self._redis = redis.from_url(settings.REDIS_URL)
+        self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        """Deliver other workers' events until stopped, resubscribing with backoff."""
+        while True:
+            try:
+                await self._receive()
+            except Exception:
+                logger.exception(
+                    "Redis pub/sub subscription failed; retrying in %.1fs", self._retry_delay
+                )
+            else:
+                logger.warning(
+                    "Redis pub/sub subscription closed; retrying in %.1fs", self._retry_delay
+                )
+            await asyncio.sleep(self._retry_delay)
+            self._retry_delay = min(self._retry_delay * 2, RECONNECT_MAX_DELAY_SECONDS)
+
+    async def _receive(self) -> None:
+        pubsub = self._redis.pubsub()
+        try:
+            await pubsub.subscribe(CHANNEL)
+            self._retry_delay = RECONNECT_DELAY_SECONDS
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                data = json.loads(message["data"])
+                if data["origin"] != self._origin:
+                    for key in data["user_ids"]:
+                        self._deliver(key, data["payload"])
+        finally:
+            with contextlib.suppress(Exception):
+                await pubsub.aclose()
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        await asyncio.gather(*self._pending, return_exceptions=True)
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+hub = Hub(settings.PUBSUB_QUEUE_SIZE)
+
+
+def publish_after_commit(db: AsyncSession, user_id: uuid.UUID, payload: dict) -> None:
+    """Publish ``payload`` to ``user_id`` once ``db``'s transaction commits."""
+    publish_many_after_commit(db, [user_id], payload)
+
+
+def publish_many_after_commit(
+    db: AsyncSession, user_ids: Iterable[uuid.UUID], payload: dict
+) -> None:
+    db.info.setdefault("pubsub_events", []).append((list(user_ids), payload))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    for user_ids, payload in session.info.pop("pubsub_events", ()):
+        hub.publish_many(user_ids, payload)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_rolled_back(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop("pubsub_events", None)
@@ -0,0 +1,76 @@
+"""Per-route rate limits, as FastAPI dependencies.
+
+``RateLimitMiddleware`` applies one global budget per client; routes that
+need their own (public, unauthenticated endpoints) add a dependency:
+
+    @router.get("/share-links/{token}", dependencies=[Depends(share_link_limit)])
+
+Clients are keyed on ``request.client``: behind nginx, uvicorn resolves it
+from ``X-Forwarded-For`` when the connection comes from one of
+``SERVER_FORWARDED_ALLOW_IPS``, so viewers do not share the proxy's budget.
+The header is ignored from any other peer. Counters are per process, like
+the middleware's.
+"""
+
+import time
+from collections import deque
+
+from fastapi import Request
+
+from app.core.exceptions import RateLimitError
+
+
+class SlidingWindow:
+    """At most ``limit`` hits per key in any ``window_seconds`` interval."""
+
+    def __init__(self, limit: int, window_seconds: float = 60.0):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._hits: dict[str, deque[float]] = {}
+        self._last_sweep = time.monotonic()
+
+    def hit(self, key: str) -> bool:
+        """Record a hit for ``key``; ``False`` if it is over the limit."""
+        now = time.monotonic()
+        if now - self._last_sweep >= self.window_seconds:
+            self._sweep(now)
+        hits = self._hits.setdefault(key, deque())
+        while hits and now - hits[0] >= self.window_seconds:
+            hits.popleft()
+        if len(hits) >= self.limit:
+            return False
+        hits.append(now)
+        return True
+
+    def _sweep(self, now: float) -> None:
+        # Drop keys idle for a whole window so one-off clients do not pile up.
+        self._hits = {
+            key: hits
+            for key, hits in self._hits.items()
+            if hits and now - hits[-1] < self.window_seconds
+        }
+        self._last_sweep = now
+
+
+class RateLimit:
+    """Dependency limiting a route per client IP and, optionally, per path parameter."""
+
+    def __init__(
+        self,
+        per_minute: int,
+        *,
+        per_param: str | None = None,
+        param_per_minute: int | None = None,
+    ):
+        self.clients = SlidingWindow(per_minute)
+        self.per_param = per_param
+        self.params = SlidingWindow(param_per_minute or per_minute) if per_param else None
+
+    async def __call__(self, request: Request) -> None:
+        client = request.client.host if request.client else "unknown"
+        if not self.clients.hit(client):
+            raise RateLimitError()
+        if self.params is not None:
+            value = request.path_params.get(self.per_param)
+            if value is not None and not self.params.hit(value):
+                raise RateLimitError()
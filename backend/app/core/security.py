@@ -42,5 +42,16 @@ def decode_token(token: str) -> dict | None:
         return None
 
 
+def get_unverified_subject(token: str) -> str | None:
+    """Read ``sub`` without verifying the signature.
+
+    Only for routing decisions (e.g. picking a read replica); never for auth.
+    """
+    try:
+        return jwt.get_unverified_claims(token).get("sub")
+    except JWTError:
+        return None
+
+
 def generate_secure_token(length: int = 32) -> str:
     return secrets.token_urlsafe(length)
@@ -0,0 +1,126 @@
+"""Pool of persistent SMTP connections.
+
+Connections are opened on demand up to ``size``, kept open between sends
+and re-checked with ``NOOP`` once idle for a while. ``send_batch`` sends
+many messages over one connection checkout, so a burst of mail costs one
+TCP/TLS handshake and login per connection instead of per message, and at
+most ``size`` sends run at once. The blocking ``smtplib`` calls run in
+worker threads so the event loop is never held up.
+"""
+
+import asyncio
+import logging
+import smtplib
+import time
+from email.message import EmailMessage
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPPool:
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        size: int = 4,
+        username: str = "",
+        password: str = "",
+        starttls: bool = True,
+        timeout: float = 10.0,
+        max_idle_seconds: float = 30.0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.max_idle_seconds = max_idle_seconds
+        self._slots = asyncio.Semaphore(size)
+        self._idle: list[tuple[smtplib.SMTP, float]] = []
+
+    async def send_batch(self, messages: list[EmailMessage]) -> list[Exception | None]:
+        """Send ``messages`` over one connection; per message, the error or ``None``.
+
+        Raises if no connection can be opened at all.
+        """
+        async with self._slots:
+            conn = await self._checkout()
+            results, healthy = await asyncio.to_thread(self._send_all, conn, messages)
+            if healthy:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                await asyncio.to_thread(self._close, conn)
+            return results
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            await asyncio.to_thread(self._close, conn)
+
+    async def _checkout(self) -> smtplib.SMTP:
+        while self._idle:
+            conn, since = self._idle.pop()
+            if time.monotonic() - since < self.max_idle_seconds:
+                return conn
+            if await asyncio.to_thread(self._alive, conn):
+                return conn
+            await asyncio.to_thread(self._close, conn)
+        return await asyncio.to_thread(self._connect)
+
+    def _connect(self) -> smtplib.SMTP:
+        conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            conn.ehlo()
+            if self.starttls:
+                conn.starttls()
+                conn.ehlo()
+            if self.username:
+                conn.login(self.username, self.password)
+        except Exception:
+            self._close(conn)
+            raise
+        return conn
+
+    @staticmethod
+    def _send_all(
+        conn: smtplib.SMTP, messages: list[EmailMessage]
+    ) -> tuple[list[Exception | None], bool]:
+        results: list[Exception | None] = []
+        for index, message in enumerate(messages):
+            try:
+                conn.send_message(message)
+            except (smtplib.SMTPServerDisconnected, OSError) as exc:
+                # The connection is gone: this and the remaining messages
+                # were not sent.
+                results.extend([exc] * (len(messages) - index))
+                return results, False
+            except smtplib.SMTPException as exc:
+                results.append(exc)
+            else:
+                results.append(None)
+        return results, True
+
+    @staticmethod
+    def _alive(conn: smtplib.SMTP) -> bool:
+        try:
+            return conn.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    @staticmethod
+    def _close(conn: smtplib.SMTP) -> None:
+        try:
+            conn.quit()
+        except (smtplib.SMTPException, OSError):
+            conn.close()
+
+
+def is_permanent(error: Exception) -> bool:
+    """5xx replies (unknown mailbox, rejected content) will not succeed on retry."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    return False
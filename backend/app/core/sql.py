@@ -0,0 +1,27 @@
+"""Dialect-specific statement helpers shared by the services."""
+
+from sqlalchemy import JSON, func, literal
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def dialect_insert(db: AsyncSession, table):
+    """``INSERT`` construct with ``on_conflict_do_*`` for the session's backend."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+def random_uuid(db: AsyncSession):
+    """SQL expression generating a fresh ``Uuid`` value, for ``INSERT ... SELECT``."""
+    if db.get_bind().dialect.name == "postgresql":
+        return func.gen_random_uuid()
+    # Uuid columns are stored as 32 hex characters on SQLite.
+    return func.lower(func.hex(func.randomblob(16)))
+
+
+def json_object(db: AsyncSession, **values):
+    """SQL expression building a JSON object from column expressions."""
+    name = "json_build_object" if db.get_bind().dialect.name == "postgresql" else "json_object"
+    args = [arg for key, value in values.items() for arg in (literal(key), value)]
+    return getattr(func, name)(*args, type_=JSON)
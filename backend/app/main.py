@@ -1,10 +1,11 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 # Import all models so Base.metadata knows about them
 import app.models  # noqa: F401
+from app.api.deps import require_user_role
 from app.api.v1 import (
     admin,
     audit,
@@ -21,17 +22,23 @@ from app.api.v1 import (
     travel,
     vaults,
 )
+from app.core import lifecycle
 from app.core.config import settings
-from app.core.database import create_tables
+from app.core.database import database_probe, pool_metrics, replica_router
 from app.core.middleware import RateLimitMiddleware, SecurityHeadersMiddleware
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.models.user import UserRole
+from app.services.hot_queries import hot_query_stats
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup - create tables if using SQLite (dev mode)
-    await create_tables()
+    # Startup - create tables on SQLite (dev mode), otherwise check the Alembic
+    # revision; engines are warmed in the background
+    await lifecycle.startup()
     yield
     # Shutdown
+    await lifecycle.shutdown()
 
 
 app = FastAPI(
@@ -52,6 +59,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # API v1 routes
@@ -74,3 +82,32 @@ app.include_router(profile.router, prefix="/api/v1")
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy", "service": settings.APP_NAME}
+
+
+@app.get("/api/health/ready")
+async def readiness_check(response: Response):
+    # Public (load balancers, orchestrators): status only, no internals.
+    database = await database_probe.check()
+    if not database["reachable"]:
+        response.status_code = 503
+        return {"status": "not_ready"}
+    return {"status": "ready"}
+
+
+@app.get(
+    "/api/health/details",
+    dependencies=[Depends(require_user_role(UserRole.OWNER, UserRole.ADMIN))],
+)
+async def readiness_details(response: Response):
+    database = await database_probe.check()
+    ready = database["reachable"]
+    if not ready:
+        response.status_code = 503
+    return {
+        "status": "ready" if ready else "not_ready",
+        "database": database,
+        "pools": [metrics.snapshot() for metrics in pool_metrics.values()],
+        "replicas": replica_router.status(),
+        "hot_queries": hot_query_stats.snapshot(),
+        "startup": lifecycle.startup_report.snapshot(),
+    }
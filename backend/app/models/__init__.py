@@ -1,11 +1,17 @@
 from app.models.audit import AccessPolicy, AuditLog, PasswordPolicy
-from app.models.notification import Notification
+from app.models.email import EmailOutbox
+from app.models.notification import (
+    Notification,
+    NotificationCounter,
+    NotificationDedupeKey,
+    NotificationDigestEvent,
+)
 from app.models.organization import Organization, OrgMembership, Team, TeamMembership
 from app.models.secret import Folder, Secret, SecretVersion
 from app.models.sharing import SecretShare
 from app.models.tag import SecretTag, Tag
 from app.models.user import MFAMethod, Session, User
-from app.models.vault import Vault
+from app.models.vault import Vault, VaultStats, VaultTypeStats
 
 __all__ = [
     "User",
@@ -16,6 +22,8 @@ __all__ = [
     "Team",
     "TeamMembership",
     "Vault",
+    "VaultStats",
+    "VaultTypeStats",
     "Secret",
     "Folder",
     "SecretVersion",
@@ -26,4 +34,8 @@ __all__ = [
     "Tag",
     "SecretTag",
     "Notification",
+    "NotificationCounter",
+    "NotificationDedupeKey",
+    "NotificationDigestEvent",
+    "EmailOutbox",
 ]
@@ -1,7 +1,7 @@
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, String, Text, Uuid
+from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Index, Integer, String, Text, Uuid, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -9,6 +9,18 @@ from app.core.database import Base
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Inbox: newest-first keyset per user, and the unread-only view.
+        Index("ix_notifications_user_created", "user_id", "created_at", "id"),
+        Index(
+            "ix_notifications_user_unread_created",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_where=text("read = false"),
+            sqlite_where=text("read = false"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(
@@ -22,5 +34,66 @@ class Notification(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(UTC), index=True
     )
+    # Optional unique key for generated notifications. Jobs that must not
+    # repeat a notification after it is swept (rotation reminders) record
+    # their keys in ``notification_dedupe_keys`` instead.
+    dedupe_key: Mapped[str | None] = mapped_column(String(255), unique=True, nullable=True)
 
     user: Mapped["User"] = relationship(back_populates="notifications")  # noqa: F821
+
+
+class NotificationCounter(Base):
+    """Per-user unread count maintained by ``notification_service`` alongside
+    each notification write, so the unread badge is a primary-key read.
+    """
+
+    __tablename__ = "notification_counters"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    unread_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+
+class NotificationDedupeKey(Base):
+    """Dedupe keys of generated notifications, kept apart from the rows so
+    that a notification removed by the retention sweep is not generated
+    again by the next run.
+    """
+
+    __tablename__ = "notification_dedupe_keys"
+
+    dedupe_key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC), index=True
+    )
+
+
+class NotificationDigestEvent(Base):
+    """An event waiting in the digest (``digest_service``).
+
+    Written in the transaction that raised it; once the oldest pending event
+    of its (user, type) is due, all of them become one notification.
+    """
+
+    __tablename__ = "notification_digest_events"
+    __table_args__ = (
+        Index("ix_notification_digest_events_user_type", "user_id", "type", "due_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    type: Mapped[str] = mapped_column(String(50), nullable=False)
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    metadata_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    email: Mapped[bool] = mapped_column(Boolean, default=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(UTC)
+    )
+    due_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
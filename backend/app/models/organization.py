@@ -2,7 +2,7 @@ import enum
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import JSON, DateTime, Enum, ForeignKey, String, Text, Uuid
+from sqlalchemy import JSON, DateTime, Enum, ForeignKey, Index, String, Text, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -83,6 +83,8 @@ class Team(Base):
 
 class TeamMembership(Base):
     __tablename__ = "team_memberships"
+    # Expands team shares for a user (covering: the lookup needs only team_id)
+    __table_args__ = (Index("ix_team_memberships_user_team", "user_id", "team_id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(
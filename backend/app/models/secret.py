@@ -2,7 +2,7 @@ import enum
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, Text, Uuid
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, Integer, Text, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -37,6 +37,8 @@ class SecretType(str, enum.Enum):
 
 class Secret(Base):
     __tablename__ = "secrets"
+    # Rotation reminders: secrets of a vault unchanged since a cutoff
+    __table_args__ = (Index("ix_secrets_vault_updated", "vault_id", "updated_at"),)
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     vault_id: Mapped[uuid.UUID] = mapped_column(
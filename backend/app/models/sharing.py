@@ -2,7 +2,7 @@ import enum
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Integer, String, Text, Uuid
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, String, Text, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -15,6 +15,22 @@ class SharePermission(str, enum.Enum):
 
 class SecretShare(Base):
     __tablename__ = "secret_shares"
+    __table_args__ = (
+        # shared-with-me: recipient match, expiry filter, newest-first keyset
+        Index(
+            "ix_secret_shares_user_expires_created",
+            "shared_with_user_id",
+            "expires_at",
+            "created_at",
+        ),
+        Index(
+            "ix_secret_shares_team_expires_created",
+            "shared_with_team_id",
+            "expires_at",
+            "created_at",
+        ),
+        Index("ix_secret_shares_expires_at", "expires_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     secret_id: Mapped[uuid.UUID] = mapped_column(
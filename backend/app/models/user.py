@@ -2,7 +2,7 @@ import enum
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, String, Text, Uuid
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, Integer, String, Text, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -72,6 +72,11 @@ class User(Base):
 
 class Session(Base):
     __tablename__ = "sessions"
+    # Sweepers: deactivate expired active sessions, then purge by age
+    __table_args__ = (
+        Index("ix_sessions_active_expires", "is_active", "expires_at"),
+        Index("ix_sessions_expires_at", "expires_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(
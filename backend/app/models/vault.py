@@ -2,7 +2,7 @@ import enum
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, String, Text, Uuid
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, String, Text, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -45,3 +45,32 @@ class Vault(Base):
     folders: Mapped[list["Folder"]] = relationship(  # noqa: F821
         back_populates="vault", cascade="all, delete"
     )
+
+
+class VaultStats(Base):
+    """Per-vault counters maintained by ``secret_service`` alongside each write.
+
+    ``item_count`` and ``type_counts`` cover non-deleted secrets (archived
+    included), matching what the vault endpoints report.
+    """
+
+    __tablename__ = "vault_stats"
+
+    vault_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid, ForeignKey("vaults.id", ondelete="CASCADE"), primary_key=True
+    )
+    item_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    folder_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_modified_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+class VaultTypeStats(Base):
+    __tablename__ = "vault_type_stats"
+
+    vault_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid, ForeignKey("vaults.id", ondelete="CASCADE"), primary_key=True
+    )
+    secret_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    item_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -14,6 +14,23 @@ class ShareCreate(BaseModel):
     expires_at: datetime | None = None
 
 
+class BulkShareItem(ShareCreate):
+    secret_id: uuid.UUID
+
+
+class BulkShareCreate(BaseModel):
+    shares: list[BulkShareItem] = Field(min_length=1, max_length=500)
+
+
+class ShareKeysUpsert(BaseModel):
+    keys: list[BulkShareItem] = Field(min_length=1, max_length=500)
+
+
+class ShareKeysUpsertResponse(BaseModel):
+    updated: int
+    created: int
+
+
 class ShareUpdate(BaseModel):
     permission: str | None = Field(default=None, pattern="^(read|write)$")
     expires_at: datetime | None = None
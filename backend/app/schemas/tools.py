@@ -21,6 +21,7 @@ class BreachCheckRequest(BaseModel):
     password_hash_prefix: str = Field(
         min_length=5,
         max_length=5,
+        pattern="^[0-9A-Fa-f]{5}$",
         description="First 5 characters of SHA-1 hash (k-anonymity)",
     )
 
@@ -42,3 +42,4 @@ class VaultListResponse(BaseModel):
 class VaultDetailResponse(VaultResponse):
     type_breakdown: dict[str, int] = {}
     folder_count: int = 0
+    last_modified_at: datetime | None = None
@@ -0,0 +1,109 @@
+"""Production server entrypoint.
+
+    python -m app.server [--workers N] [--reload]
+
+Runs uvicorn with one worker per available CPU (the container's CPU quota
+when there is one), uvloop and httptools when they are installed, and the
+keep-alive, backlog and graceful-shutdown settings from ``SERVER_*``. On
+SIGTERM uvicorn stops accepting connections, waits up to
+``SERVER_GRACEFUL_TIMEOUT_SECONDS`` for in-flight requests, then runs the
+lifespan shutdown (``app.core.lifecycle.shutdown``), which closes shared
+clients and disposes the engines.
+
+On SQLite the server runs one worker (asking for more is an error): the
+database's ``WriterGate`` only serializes writers within a process.
+
+Every worker has its own connection pools, so the database sees up to
+``workers * (DATABASE_POOL_SIZE + max overflow)`` connections.
+"""
+
+import argparse
+import importlib.util
+import logging
+import logging.config
+import math
+import os
+from pathlib import Path
+
+import uvicorn
+import uvicorn.config
+
+from app.core.config import settings
+
+# Uvicorn's logger and config, so messages match the server's own log format.
+logger = logging.getLogger("uvicorn.error")
+
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+
+def available_cpus(cpu_max: Path = CGROUP_CPU_MAX) -> int:
+    """CPUs this process may use: its affinity mask, capped by a cgroup v2 quota."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = cpu_max.read_text().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(cpus, 1)
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def server_options(workers: int | None = None, reload: bool = False) -> dict:
+    """uvicorn.run() options; ``ValueError`` for several workers on SQLite."""
+    workers = workers or settings.SERVER_WORKERS
+    if settings.DATABASE_URL.startswith("sqlite"):
+        if workers and workers > 1:
+            raise ValueError(
+                f"{workers} workers requested, but SQLite writes are only serialized "
+                "within one process; run a single worker or use PostgreSQL"
+            )
+        workers = 1
+    elif reload:
+        workers = 1
+    else:
+        workers = workers or available_cpus()
+    return {
+        "host": settings.SERVER_HOST,
+        "port": settings.SERVER_PORT,
+        "workers": workers,
+        "reload": reload,
+        "loop": "uvloop" if _installed("uvloop") else "asyncio",
+        "http": "httptools" if _installed("httptools") else "h11",
+        "timeout_keep_alive": settings.SERVER_KEEPALIVE_SECONDS,
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "server_header": False,
+        # request.client (rate limits, audit logs) is the real client behind nginx.
+        "proxy_headers": True,
+        "forwarded_allow_ips": settings.SERVER_FORWARDED_ALLOW_IPS,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the VaultKeeper API server.")
+    parser.add_argument("--workers", type=int, help="default: SERVER_WORKERS or one per CPU")
+    parser.add_argument("--reload", action="store_true", help="development: single worker")
+    args = parser.parse_args()
+
+    try:
+        options = server_options(args.workers, args.reload)
+    except ValueError as exc:
+        parser.error(str(exc))
+    logging.config.dictConfig(uvicorn.config.LOGGING_CONFIG)
+    logger.info(
+        "Starting %(workers)d worker(s) on %(host)s:%(port)d (loop=%(loop)s, http=%(http)s, "
+        "keep-alive=%(timeout_keep_alive)ds, backlog=%(backlog)d)",
+        options,
+    )
+    uvicorn.run("app.main:app", **options)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,8 +2,7 @@ import hashlib
 import uuid
 from datetime import UTC, datetime, timedelta
 
-import pyotp
-from sqlalchemy import select
+from sqlalchemy import case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
@@ -20,6 +19,7 @@ from app.core.security import (
 )
 from app.models.user import MFAMethod, MFAType, Session, User, UserStatus
 from app.schemas.auth import LoginResponse, RegisterRequest, RegisterResponse, UserProfile
+from app.services import email_service
 
 
 async def register_user(db: AsyncSession, data: RegisterRequest) -> RegisterResponse:
@@ -87,6 +87,7 @@ async def login_user(
     access_token = create_access_token(str(user.id))
     refresh_token = create_refresh_token(str(user.id))
 
+    await alert_if_new_device(db, user, user_agent, ip_address)
     session = Session(
         user_id=user.id,
         token_hash=hashlib.sha256(refresh_token.encode()).hexdigest(),
@@ -104,7 +105,29 @@ async def login_user(
     )
 
 
+async def alert_if_new_device(
+    db: AsyncSession, user: User, user_agent: str | None, ip_address: str | None
+) -> None:
+    """Queue a new-device email if the user has sessions, none from this device.
+
+    The email is sent after the sign-in commits, off the request path.
+    """
+    result = await db.execute(
+        select(
+            func.count(),
+            func.max(case((Session.device_info == user_agent, 1), else_=0)),
+        ).where(Session.user_id == user.id)
+    )
+    sessions, known_device = result.one()
+    if sessions and not known_device:
+        await email_service.queue_email(
+            db, *email_service.new_device_alert(user.email, user_agent or "", ip_address or "")
+        )
+
+
 async def setup_totp(db: AsyncSession, user: User) -> tuple[str, str]:
+    import pyotp
+
     secret = pyotp.random_base32()
     totp = pyotp.TOTP(secret)
     provisioning_uri = totp.provisioning_uri(name=user.email, issuer_name=settings.APP_NAME)
@@ -122,6 +145,8 @@ async def setup_totp(db: AsyncSession, user: User) -> tuple[str, str]:
 
 
 async def verify_totp(db: AsyncSession, user: User, code: str) -> bool:
+    import pyotp
+
     result = await db.execute(
         select(MFAMethod).where(
             MFAMethod.user_id == user.id,
@@ -0,0 +1,150 @@
+"""Offline breach corpus: a sorted, memory-mapped index of SHA-1 hashes.
+
+For air-gapped deployments, ``HIBP_INDEX_PATH`` points ``breach_service``
+at a local index instead of the HIBP API. The index is built once from the
+"ordered by hash" text dump (``SHA1:COUNT`` per line):
+
+    python -m app.services.breach_index build pwned-passwords-sha1.txt breach.idx
+
+Layout (little-endian):
+
+* header: ``MAGIC`` and the record count (``<Q``);
+* directory: 2**20 + 1 ``<I`` record offsets, one per 5-hex-digit prefix,
+  so a prefix's range is located with two reads;
+* records: the hash's last 18 bytes (the suffix after the prefix's 20 bits,
+  plus its upper half-byte) and its count (``<I``), sorted by hash.
+
+The file is opened read-only with ``mmap``, so every worker process shares
+the same pages through the OS page cache and only touched pages are read.
+"""
+
+import argparse
+import mmap
+import os
+import string
+import struct
+import sys
+import time
+from array import array
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+MAGIC = b"VKBREACH"
+PREFIXES = 1 << 20
+HEADER = struct.Struct("<8sQ")
+RECORD = struct.Struct("<18sI")
+DIRECTORY_OFFSET = HEADER.size
+RECORDS_OFFSET = DIRECTORY_OFFSET + (PREFIXES + 1) * 4
+
+
+class BreachIndexError(ValueError):
+    pass
+
+
+def build(lines: Iterable[str], path: str | os.PathLike) -> int:
+    """Write the index for ``SHA1:COUNT`` lines sorted by hash; returns the record count.
+
+    The file is written next to ``path`` and moved into place when complete,
+    so readers never see a partial index.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    directory = array("I", bytes(4 * (PREFIXES + 1)))
+    count = 0
+    previous = b""
+    try:
+        with open(tmp, "wb") as out:
+            out.seek(RECORDS_OFFSET)
+            for number, line in enumerate(lines, 1):
+                sha1_hex, _, hits = line.strip().partition(":")
+                if not sha1_hex:
+                    continue
+                try:
+                    digest = bytes.fromhex(sha1_hex)
+                    hits = int(hits)
+                except ValueError:
+                    raise BreachIndexError(f"line {number}: expected SHA1:COUNT") from None
+                if len(digest) != 20:
+                    raise BreachIndexError(f"line {number}: expected a 40-digit SHA-1")
+                if digest <= previous:
+                    raise BreachIndexError(f"line {number}: hashes must be sorted and unique")
+                previous = digest
+                directory[(int.from_bytes(digest[:3]) >> 4) + 1] += 1
+                out.write(RECORD.pack(digest[2:], hits))
+                count += 1
+            if count >= 1 << 32:
+                raise BreachIndexError("too many records for 32-bit offsets")
+            for prefix in range(1, PREFIXES + 1):
+                directory[prefix] += directory[prefix - 1]
+            if sys.byteorder != "little":
+                directory.byteswap()
+            out.seek(0)
+            out.write(HEADER.pack(MAGIC, count))
+            out.write(directory.tobytes())
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, path)
+    return count
+
+
+class BreachIndex:
+    def __init__(self, path: str | os.PathLike):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self._map)
+        if magic != MAGIC or len(self._map) != RECORDS_OFFSET + self.count * RECORD.size:
+            self._map.close()
+            raise BreachIndexError(f"{path} is not a complete breach index")
+
+    def close(self) -> None:
+        self._map.close()
+
+    def range(self, prefix: str) -> Iterator[tuple[str, int]]:
+        """``(suffix, count)`` for every hash starting with the 5-hex-digit ``prefix``."""
+        if len(prefix) != 5 or not all(c in string.hexdigits for c in prefix):
+            raise BreachIndexError(f"invalid prefix {prefix!r}")
+        start, end = struct.unpack_from("<II", self._map, DIRECTORY_OFFSET + int(prefix, 16) * 4)
+        first, last = RECORDS_OFFSET + start * RECORD.size, RECORDS_OFFSET + end * RECORD.size
+        for tail, hits in RECORD.iter_unpack(self._map[first:last]):
+            yield tail.hex().upper()[1:], hits
+
+    def range_text(self, prefix: str) -> str:
+        """The range in the HIBP API's ``SUFFIX:COUNT`` format."""
+        return "\r\n".join(f"{suffix}:{hits}" for suffix, hits in self.range(prefix))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline breach corpus index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="build an index from a SHA1:COUNT dump")
+    build_parser.add_argument("dump", help="text dump ordered by hash ('-' for stdin)")
+    build_parser.add_argument("index", help="index file to write")
+    range_parser = commands.add_parser("range", help="print a prefix's range")
+    range_parser.add_argument("index")
+    range_parser.add_argument("prefix")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        try:
+            if args.dump == "-":
+                count = build(sys.stdin, args.index)
+            else:
+                with open(args.dump, encoding="ascii") as dump:
+                    count = build(dump, args.index)
+        except BreachIndexError as exc:
+            sys.exit(f"{args.dump}: {exc}")
+        size_mb = os.path.getsize(args.index) / 2**20
+        print(
+            f"{args.index}: {count} hashes, {size_mb:.1f} MB "
+            f"in {time.perf_counter() - start:.1f} s"
+        )
+    else:
+        index = BreachIndex(args.index)
+        print(index.range_text(args.prefix.upper()))
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
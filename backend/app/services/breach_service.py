@@ -0,0 +1,95 @@
+"""Have I Been Pwned k-anonymity range lookups.
+
+Ranges are fetched over the shared keep-alive client and kept in an
+LRU+TTL cache keyed by prefix, so popular prefixes are downloaded once per
+``HIBP_CACHE_TTL_SECONDS``. Concurrent misses for one prefix share a single
+upstream fetch, a circuit breaker stops calling an upstream that keeps
+failing, and every lookup (waiting included) is bounded by
+``HIBP_TIMEOUT_SECONDS``.
+
+With ``HIBP_INDEX_PATH`` set (air-gapped deployments) ranges come from
+the local memory-mapped index instead (see ``app.services.breach_index``)
+and the API is never called. The index is opened and validated at
+startup, so a missing or truncated file stops the worker from starting
+instead of failing every check.
+"""
+
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.http import CircuitBreaker, SingleFlight, TTLCache, UpstreamError, http_client
+from app.core.lifecycle import on_shutdown, on_startup
+from app.services.breach_index import BreachIndex
+
+logger = logging.getLogger(__name__)
+
+cache = TTLCache(settings.HIBP_CACHE_SIZE, settings.HIBP_CACHE_TTL_SECONDS)
+breaker = CircuitBreaker(settings.HIBP_BREAKER_FAILURES, settings.HIBP_BREAKER_RESET_SECONDS)
+_in_flight = SingleFlight()
+_local: BreachIndex | None = None
+
+
+def local_index() -> BreachIndex:
+    """The process's mapping of ``HIBP_INDEX_PATH``, opened at startup."""
+    global _local
+    if _local is None:
+        _local = BreachIndex(settings.HIBP_INDEX_PATH)
+    return _local
+
+
+@on_startup
+async def open_local_index() -> None:
+    if settings.HIBP_INDEX_PATH:
+        index = local_index()
+        logger.info("Breach index %s: %d hashes", settings.HIBP_INDEX_PATH, index.count)
+
+
+@on_shutdown
+async def close_local_index() -> None:
+    global _local
+    if _local is not None:
+        _local.close()
+        _local = None
+
+
+async def _fetch(prefix: str) -> str:
+    import httpx
+
+    try:
+        response = await http_client().get(
+            f"{settings.HIBP_RANGE_URL}/{prefix}", timeout=settings.HIBP_TIMEOUT_SECONDS
+        )
+        response.raise_for_status()
+    except httpx.HTTPError as exc:
+        raise UpstreamError(f"HIBP range {prefix}: {exc}") from exc
+    cache.set(prefix, response.text)
+    return response.text
+
+
+async def get_range(prefix: str) -> str:
+    """The ``SUFFIX:COUNT`` lines for a 5-character SHA-1 prefix.
+
+    Raises ``UpstreamError`` when the range cannot be had in time.
+    """
+    prefix = prefix.upper()
+    if settings.HIBP_INDEX_PATH:
+        return local_index().range_text(prefix)
+    text = cache.get(prefix)
+    if text is not None:
+        return text
+    try:
+        async with asyncio.timeout(settings.HIBP_TIMEOUT_SECONDS):
+            return await _in_flight.run(prefix, lambda: breaker.call(lambda: _fetch(prefix)))
+    except TimeoutError as exc:
+        raise UpstreamError(f"HIBP range {prefix}: timed out") from exc
+
+
+def range_counts(text: str) -> tuple[bool, int]:
+    """``(found, total)`` over the range's lines, skipping padding entries."""
+    total = 0
+    for line in text.splitlines():
+        _, _, count = line.strip().partition(":")
+        if count.isdigit():
+            total += int(count)
+    return total > 0, total
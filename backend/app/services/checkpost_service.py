@@ -11,8 +11,8 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.secret import Secret
-from app.models.user import User
 from app.models.vault import Vault
+from app.services import hot_queries
 
 
 async def get_security_summary(
@@ -21,8 +21,7 @@ async def get_security_summary(
     """Return server-side security metadata without exposing any plaintext."""
 
     # Get user info
-    user_result = await db.execute(select(User).where(User.id == user_id))
-    user = user_result.scalar_one_or_none()
+    user = await hot_queries.user_by_id(db, user_id)
 
     # Get vault IDs for this user
     vault_result = await db.execute(
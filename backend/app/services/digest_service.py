@@ -0,0 +1,253 @@
+"""Digest stage in front of notifications and their emails.
+
+``notify`` writes the event to ``notification_digest_events`` in the
+caller's transaction, due after its type's window
+(``NOTIFICATION_DIGEST_WINDOWS``, else ``NOTIFICATION_DIGEST_WINDOW_SECONDS``).
+Once the oldest pending event of a (user, type) is due, ``flush_due``
+claims all of that key's events with ``DELETE ... RETURNING`` and, in the
+same transaction, writes them as one notification, a summary if there was
+more than one event, plus at most one email, sent only to users with
+``email_notifications`` on. A burst of hundreds of shares thus costs one
+row and one message per recipient, whichever workers raised the events.
+
+Pending events are rows, so a crash or redeploy loses none of them. The
+``flush_notification_digests`` task flushes whatever is due; a process
+that wrote events also flushes when their window ends (``scheduler``),
+which only saves waiting for the task.
+
+Batch jobs that produce a burst in one run (rotation reminders) call
+``write_digest`` directly with a user's events, the run being the window.
+Not digested: broadcasts (one notification per member and event, never a
+burst per user), new-device alerts (security mail that must not wait) and
+the Celery email tasks, which only know an address, not a user.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.models.notification import NotificationDigestEvent
+from app.services import email_service, hot_queries, notification_service
+
+logger = logging.getLogger(__name__)
+
+# Summary titles for a digest of ``count`` events, by notification type.
+SUMMARY_TITLES = {
+    "share": "{count} items were shared with you",
+    "policy_change": "{count} organization policy changes",
+    "password_rotation": "{count} passwords need rotating",
+}
+
+
+def _window(type: str) -> timedelta:
+    return timedelta(
+        seconds=settings.NOTIFICATION_DIGEST_WINDOWS.get(
+            type, settings.NOTIFICATION_DIGEST_WINDOW_SECONDS
+        )
+    )
+
+
+def notify(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    type: str,
+    title: str,
+    message: str,
+    metadata_json: dict | None = None,
+    *,
+    email: bool = False,
+) -> None:
+    """Queue a notification (and, with ``email``, an email) for the digest."""
+    now = datetime.now(UTC)
+    due_at = now + _window(type)
+    db.add(
+        NotificationDigestEvent(
+            user_id=user_id,
+            type=type,
+            title=title,
+            message=message,
+            metadata_json=metadata_json,
+            email=email,
+            created_at=now,
+            due_at=due_at,
+        )
+    )
+    wake_at = db.info.get("digest_wake_at")
+    if wake_at is None or due_at < wake_at:
+        db.info["digest_wake_at"] = due_at
+
+
+async def flush_due(
+    db: AsyncSession,
+    *,
+    now: datetime | None = None,
+    limit: int = 500,
+    background_email: bool = True,
+) -> dict:
+    """Write a digest for every (user, type) whose oldest pending event is due.
+
+    Each key's events are claimed and written in one transaction, so a
+    concurrent flush finds them gone rather than sending them twice.
+    """
+    start = time.perf_counter()
+    now = now or datetime.now(UTC)
+    digests = events = 0
+    while True:
+        keys = (
+            await db.execute(
+                select(NotificationDigestEvent.user_id, NotificationDigestEvent.type)
+                .group_by(NotificationDigestEvent.user_id, NotificationDigestEvent.type)
+                .having(func.min(NotificationDigestEvent.due_at) <= now)
+                .limit(limit)
+            )
+        ).all()
+        for user_id, type in keys:
+            claimed = (
+                await db.execute(
+                    delete(NotificationDigestEvent)
+                    .where(
+                        NotificationDigestEvent.user_id == user_id,
+                        NotificationDigestEvent.type == type,
+                    )
+                    .returning(
+                        NotificationDigestEvent.title,
+                        NotificationDigestEvent.message,
+                        NotificationDigestEvent.metadata_json,
+                        NotificationDigestEvent.email,
+                        NotificationDigestEvent.created_at,
+                    ),
+                    execution_options={"synchronize_session": False},
+                )
+            ).all()
+            if claimed:
+                claimed.sort(key=lambda row: row.created_at)
+                await write_digest(
+                    db,
+                    [
+                        {
+                            "user_id": user_id,
+                            "type": type,
+                            "title": row.title,
+                            "message": row.message,
+                            "metadata_json": row.metadata_json,
+                            "email": row.email,
+                        }
+                        for row in claimed
+                    ],
+                    background_email=background_email,
+                )
+                digests += 1
+                events += len(claimed)
+            await db.commit()
+        if len(keys) < limit:
+            break
+
+    return {
+        "status": "completed",
+        "digests": digests,
+        "events": events,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+async def write_digest(
+    db: AsyncSession, events: list[dict], *, background_email: bool = True
+) -> None:
+    """One notification (and at most one email) for one user's events of one type."""
+    first, count = events[0], len(events)
+    user_id, type = first["user_id"], first["type"]
+    if count == 1:
+        title, message, metadata = first["title"], first["message"], first["metadata_json"]
+    else:
+        shown = events[: settings.NOTIFICATION_DIGEST_MAX_ITEMS]
+        title = SUMMARY_TITLES.get(type, "{count} new notifications").format(count=count)
+        titles = Counter(event["title"] for event in events)
+        lines = [line if n == 1 else f"{line} ({n})" for line, n in titles.items()]
+        message = "\n".join(lines[: settings.NOTIFICATION_DIGEST_MAX_ITEMS])
+        if len(lines) > settings.NOTIFICATION_DIGEST_MAX_ITEMS:
+            message += f"\n...and {len(lines) - settings.NOTIFICATION_DIGEST_MAX_ITEMS} more"
+        metadata = {
+            "digest": {"count": count, "items": [event["metadata_json"] for event in shown]}
+        }
+    await notification_service.create_notification(db, user_id, type, title, message, metadata)
+
+    if any(event["email"] for event in events):
+        user = await hot_queries.user_by_id(db, user_id)
+        if user is not None and user.email_notifications:
+            body = f"{message}\n\nSign in to {settings.APP_NAME} for details."
+            await email_service.queue_email(
+                db, user.email, title, body, background=background_email
+            )
+
+
+# --- In-process wake-up -------------------------------------------------
+# A process that wrote events flushes once the earliest of them is due and
+# then keeps waking for whatever is pending, instead of waiting for the
+# periodic task. Only the time to wake is held here, never events.
+
+
+class DigestScheduler:
+    def __init__(self, session_factory: Callable[[], AsyncSession] = async_session_factory):
+        self.session_factory = session_factory
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._wake_at: datetime | None = None
+        self._running: asyncio.Task | None = None
+
+    def schedule(self, wake_at: datetime) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:  # timers are bound to the loop that set them
+            self._loop, self._timer, self._wake_at, self._running = loop, None, None, None
+        if self._wake_at is not None and self._wake_at <= wake_at:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        delay = max((wake_at - datetime.now(UTC)).total_seconds(), 0.0)
+        self._wake_at = wake_at
+        self._timer = loop.call_later(delay, self._wake)
+
+    def _wake(self) -> None:
+        self._timer = self._wake_at = None
+        if self._running is None or self._running.done():
+            self._running = asyncio.get_running_loop().create_task(self.run())
+
+    async def run(self) -> None:
+        try:
+            async with self.session_factory() as db:
+                await flush_due(db)
+                next_due = await db.scalar(select(func.min(NotificationDigestEvent.due_at)))
+        except Exception:
+            logger.exception("Flushing notification digests failed")
+            return
+        if next_due is not None:
+            # SQLite hands back naive datetimes; every stored time is UTC.
+            self.schedule(next_due.replace(tzinfo=UTC))
+
+
+scheduler = DigestScheduler()
+
+
+@event.listens_for(Session, "after_commit")
+def _schedule_committed(session: Session) -> None:
+    wake_at = session.info.pop("digest_wake_at", None)
+    if wake_at is not None:
+        try:
+            scheduler.schedule(wake_at)
+        except RuntimeError:  # no running loop (sync use): the periodic task flushes
+            pass
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_rolled_back(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop("digest_wake_at", None)
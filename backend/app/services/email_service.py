@@ -0,0 +1,316 @@
+"""Email delivery through the ``email_outbox`` table.
+
+Request handlers only ``queue_email`` (one insert in their own
+transaction); once that commits, delivery starts in the background of the
+same process, and the ``deliver_email_outbox`` task picks up retries and
+anything a restart left behind. ``deliver_pending`` claims due rows,
+sends them in per-connection batches over the shared ``SMTPPool`` and
+records each outcome: sent, retried with exponential backoff, or failed
+(5xx replies and exhausted attempts).
+
+A claim takes one round of batches (``SMTP_POOL_SIZE * SMTP_BATCH_SIZE``
+rows), so every claimed batch starts sending at once, and leases them for
+``_claim_lease()``: long enough for a batch in which every message takes
+the full SMTP timeout. Each claim also writes a fresh ``claim_token``,
+and outcomes are recorded only where it still matches, so a run whose
+lease did expire cannot overwrite the row's newer claim.
+"""
+
+import asyncio
+import logging
+import smtplib
+import time
+import uuid
+import weakref
+from datetime import UTC, datetime, timedelta
+from email.message import EmailMessage
+
+from sqlalchemy import and_, event, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import async_session_factory
+from app.core.lifecycle import on_shutdown
+from app.core.smtp import SMTPPool, is_permanent
+from app.models.email import EmailOutbox, EmailStatus
+
+logger = logging.getLogger(__name__)
+
+_pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, SMTPPool] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def smtp_pool() -> SMTPPool:
+    """The running event loop's pool (asyncio primitives are bound to a loop)."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = SMTPPool(
+            settings.SMTP_HOST,
+            settings.SMTP_PORT,
+            size=settings.SMTP_POOL_SIZE,
+            username=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+            starttls=settings.SMTP_STARTTLS,
+            timeout=settings.SMTP_TIMEOUT_SECONDS,
+        )
+    return pool
+
+
+@on_shutdown
+async def close_smtp_pool() -> None:
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close()
+
+
+async def queue_email(
+    db: AsyncSession,
+    to_email: str,
+    subject: str,
+    body: str,
+    *,
+    background: bool = True,
+) -> EmailOutbox:
+    """Add an email to the outbox; with ``background``, send it once ``db`` commits."""
+    # Subjects carry user-supplied text (names); a line break would be
+    # refused as a header injection.
+    subject = " ".join(subject.split())
+    email = EmailOutbox(to_email=to_email, subject=subject, body=body)
+    db.add(email)
+    await db.flush()
+    if background:
+        db.info["email_queued"] = True
+    return email
+
+
+def share_notification(
+    recipient_email: str, sharer_name: str, secret_type: str
+) -> tuple[str, str, str]:
+    return (
+        recipient_email,
+        f"{sharer_name} shared an item with you",
+        f"{sharer_name} shared a {secret_type.replace('_', ' ')} with you on "
+        f"{settings.APP_NAME}. Sign in to view it under Shared with me.",
+    )
+
+
+def new_device_alert(user_email: str, device_info: str, ip_address: str) -> tuple[str, str, str]:
+    return (
+        user_email,
+        f"New sign-in to your {settings.APP_NAME} account",
+        f"Your account was just signed in to from a new device.\n\n"
+        f"Device: {device_info or 'unknown'}\nIP address: {ip_address}\n\n"
+        "If this was not you, change your master password and revoke the "
+        "session under Settings > Devices.",
+    )
+
+
+def _message(email: EmailOutbox) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = settings.FROM_EMAIL
+    message["To"] = email.to_email
+    message["Subject"] = email.subject
+    message.set_content(email.body)
+    return message
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=settings.EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+
+def _claim_lease() -> timedelta:
+    """How long a claimed row is left to its run before another may retry it
+    (e.g. after the process died mid-send): connecting plus one SMTP timeout
+    per message of a batch."""
+    return timedelta(seconds=settings.SMTP_TIMEOUT_SECONDS * (settings.SMTP_BATCH_SIZE + 1))
+
+
+async def _claim(db: AsyncSession, now: datetime, limit: int) -> tuple[str, list[EmailOutbox]]:
+    """Lease up to ``limit`` due rows to this run; ``(claim_token, rows)``.
+
+    The ``UPDATE`` re-checks that each row is still due, and only the rows
+    it returns are sent. A concurrent run that picked the same candidates
+    (``SKIP LOCKED`` is a no-op on SQLite) then claims none of them.
+    """
+    due = and_(
+        or_(
+            EmailOutbox.status == EmailStatus.PENDING,
+            EmailOutbox.status == EmailStatus.SENDING,  # lease expired
+        ),
+        EmailOutbox.next_attempt_at <= now,
+    )
+    candidates = (
+        await db.scalars(
+            select(EmailOutbox.id)
+            .where(due)
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+    ).all()
+    token = uuid.uuid4().hex
+    emails = []
+    if candidates:
+        result = await db.scalars(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(candidates), due)
+            .values(
+                status=EmailStatus.SENDING,
+                next_attempt_at=now + _claim_lease(),
+                claim_token=token,
+            )
+            .returning(EmailOutbox),
+            execution_options={"synchronize_session": False, "populate_existing": True},
+        )
+        emails = list(result)
+    await db.commit()
+    return token, emails
+
+
+async def _record(db: AsyncSession, token: str, outcomes: list[dict]) -> None:
+    """Store outcomes for rows still held under ``token``; others were re-claimed."""
+    if outcomes:
+        # ORM bulk UPDATE by primary key, one executemany.
+        await db.execute(
+            update(EmailOutbox).where(
+                EmailOutbox.claim_token == token, EmailOutbox.status == EmailStatus.SENDING
+            ),
+            outcomes,
+            # Not supported with extra WHERE criteria; callers expire the rows.
+            execution_options={"synchronize_session": None},
+        )
+    await db.commit()
+
+
+async def _send(pool: SMTPPool, messages: list[EmailMessage]) -> list[Exception | None]:
+    try:
+        return await pool.send_batch(messages)
+    except (smtplib.SMTPException, OSError) as exc:  # no connection: retry them all
+        return [exc] * len(messages)
+
+
+async def deliver_pending(
+    db: AsyncSession,
+    *,
+    pool: SMTPPool | None = None,
+    now: datetime | None = None,
+    limit: int | None = None,
+) -> dict:
+    """Send every due outbox row, ``limit`` (default: one round of batches) at a
+    time; returns the outcome counts."""
+    start = time.perf_counter()
+    counts = {"sent": 0, "retrying": 0, "failed": 0}
+    if not settings.SMTP_HOST and pool is None:
+        return {"status": "disabled", **counts, "duration_ms": 0.0}
+    pool = pool or smtp_pool()
+    limit = limit or settings.SMTP_POOL_SIZE * settings.SMTP_BATCH_SIZE
+
+    while True:
+        current = now or datetime.now(UTC)
+        token, emails = await _claim(db, current, limit)
+        if not emails:
+            break
+        outcomes, sendable, messages = [], [], []
+        for email in emails:
+            try:
+                messages.append(_message(email))
+            except ValueError as exc:  # e.g. a line break in a header: never sendable
+                outcomes.append(
+                    {
+                        "id": email.id,
+                        "attempts": email.attempts + 1,
+                        "status": EmailStatus.FAILED,
+                        "last_error": str(exc),
+                    }
+                )
+                counts["failed"] += 1
+            else:
+                sendable.append(email)
+
+        size = settings.SMTP_BATCH_SIZE
+        batches = [sendable[i : i + size] for i in range(0, len(sendable), size)]
+        # The pool bounds how many of these run at once.
+        results = await asyncio.gather(
+            *(_send(pool, messages[i : i + size]) for i in range(0, len(sendable), size))
+        )
+
+        for batch, errors in zip(batches, results, strict=True):
+            for email, error in zip(batch, errors, strict=True):
+                attempts = email.attempts + 1
+                outcome = {"id": email.id, "attempts": attempts}
+                if error is None:
+                    outcome.update(status=EmailStatus.SENT, sent_at=current, last_error=None)
+                    counts["sent"] += 1
+                elif is_permanent(error) or attempts >= settings.EMAIL_MAX_ATTEMPTS:
+                    outcome.update(status=EmailStatus.FAILED, last_error=str(error))
+                    counts["failed"] += 1
+                else:
+                    outcome.update(
+                        status=EmailStatus.PENDING,
+                        last_error=str(error),
+                        next_attempt_at=current + _retry_delay(attempts),
+                    )
+                    counts["retrying"] += 1
+                outcomes.append(outcome)
+        await _record(db, token, outcomes)
+        for email in emails:
+            db.expire(email)
+        if len(emails) < limit:
+            break
+
+    duration_ms = round((time.perf_counter() - start) * 1000, 1)
+    if any(counts.values()):
+        logger.info(
+            "Email delivery: %(sent)d sent, %(retrying)d retrying, %(failed)d failed",
+            counts,
+        )
+    return {"status": "completed", **counts, "duration_ms": duration_ms}
+
+
+# --- Background delivery -------------------------------------------------
+# Started after a commit that queued mail; at most one run per process at a
+# time, re-run once if more mail was queued while it was sending.
+
+_delivery: asyncio.Task | None = None
+_rerun = False
+
+
+async def _deliver_in_background() -> None:
+    global _rerun
+    while True:
+        _rerun = False
+        try:
+            async with async_session_factory() as session:
+                await deliver_pending(session)
+        except Exception:
+            logger.exception("Background email delivery failed")
+        if not _rerun:
+            return
+
+
+def schedule_delivery() -> None:
+    global _delivery, _rerun
+    if not settings.SMTP_HOST:
+        return
+    if _delivery is not None and not _delivery.done():
+        _rerun = True
+        return
+    _delivery = asyncio.get_running_loop().create_task(_deliver_in_background())
+
+
+@event.listens_for(Session, "after_commit")
+def _deliver_committed(session: Session) -> None:
+    if session.info.pop("email_queued", False):
+        try:
+            schedule_delivery()
+        except RuntimeError:  # no running loop (sync use): the periodic task sends it
+            pass
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_rolled_back(session: Session, previous_transaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop("email_queued", None)
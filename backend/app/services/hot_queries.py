@@ -0,0 +1,126 @@
+"""Lookups that run on nearly every request, as prebuilt statements.
+
+Each statement is constructed once at import with named bind parameters.
+Its cache key is memoized on the statement, so executions skip building
+the ``select()`` and generating the key and go straight to the compiled
+cache; only the parameter values change. On asyncpg the compiled SQL also
+maps to a single prepared statement per connection (see
+``DATABASE_PREPARED_STATEMENT_CACHE_SIZE``).
+
+``lambda_stmt`` looks like the natural fit but is slower for ORM entity
+selects: the ORM re-clones the lambda's statement on every execution to
+substitute the tracked closure values.
+
+Every statement here is tagged with a ``hot_query`` execution option so
+``hot_query_stats`` can count executions and compiled-cache hits.
+"""
+
+import uuid
+
+from sqlalchemy import bindparam, event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.organization import OrgMembership
+from app.models.secret import Secret
+from app.models.user import Session, User
+from app.models.vault import Vault
+
+
+class HotQueryStats:
+    def __init__(self):
+        self.executions: dict[str, int] = {}
+        self.cache_hits: dict[str, int] = {}
+
+    def record(self, name: str, cache_hit: bool) -> None:
+        self.executions[name] = self.executions.get(name, 0) + 1
+        if cache_hit:
+            self.cache_hits[name] = self.cache_hits.get(name, 0) + 1
+
+    def snapshot(self) -> dict:
+        return {
+            name: {
+                "executions": count,
+                "cache_hits": self.cache_hits.get(name, 0),
+                "hit_ratio": round(self.cache_hits.get(name, 0) / count, 3),
+            }
+            for name, count in sorted(self.executions.items())
+        }
+
+
+hot_query_stats = HotQueryStats()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_hot_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    name = context.execution_options.get("hot_query") if context is not None else None
+    if name is not None:
+        hot_query_stats.record(name, context.cache_hit is CACHE_HIT)
+
+
+USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+VAULT_BY_ID = select(Vault).where(Vault.id == bindparam("vault_id"))
+SECRET_BY_ID = select(Secret).where(Secret.id == bindparam("secret_id"))
+ORG_MEMBERSHIP = select(OrgMembership).where(
+    OrgMembership.user_id == bindparam("user_id"),
+    OrgMembership.org_id == bindparam("org_id"),
+)
+ACTIVE_SESSION_BY_TOKEN_HASH = select(Session).where(
+    Session.token_hash == bindparam("token_hash"),
+    Session.is_active == True,  # noqa: E712
+)
+
+
+_NIL = uuid.UUID(int=0)
+_WARMUP_PARAMS = (
+    (USER_BY_ID, {"user_id": _NIL}),
+    (VAULT_BY_ID, {"vault_id": _NIL}),
+    (SECRET_BY_ID, {"secret_id": _NIL}),
+    (ORG_MEMBERSHIP, {"user_id": _NIL, "org_id": _NIL}),
+    (ACTIVE_SESSION_BY_TOKEN_HASH, {"token_hash": ""}),
+)
+
+
+async def warm(db: AsyncSession) -> None:
+    """Compile every statement into the compiled cache of ``db``'s engine.
+
+    Executed without the ``hot_query`` tag so warm-up does not count in
+    ``hot_query_stats``.
+    """
+    for stmt, params in _WARMUP_PARAMS:
+        await db.execute(stmt, params)
+
+
+async def _one(db: AsyncSession, name: str, stmt, params: dict):
+    result = await db.execute(stmt, params, execution_options={"hot_query": name})
+    return result.scalar_one_or_none()
+
+
+async def user_by_id(db: AsyncSession, user_id: uuid.UUID) -> User | None:
+    return await _one(db, "user_by_id", USER_BY_ID, {"user_id": user_id})
+
+
+async def vault_by_id(db: AsyncSession, vault_id: uuid.UUID) -> Vault | None:
+    return await _one(db, "vault_by_id", VAULT_BY_ID, {"vault_id": vault_id})
+
+
+async def secret_by_id(db: AsyncSession, secret_id: uuid.UUID) -> Secret | None:
+    return await _one(db, "secret_by_id", SECRET_BY_ID, {"secret_id": secret_id})
+
+
+async def org_membership(
+    db: AsyncSession, user_id: uuid.UUID, org_id: uuid.UUID
+) -> OrgMembership | None:
+    return await _one(
+        db, "org_membership", ORG_MEMBERSHIP, {"user_id": user_id, "org_id": org_id}
+    )
+
+
+async def active_session_by_token_hash(db: AsyncSession, token_hash: str) -> Session | None:
+    return await _one(
+        db,
+        "active_session_by_token_hash",
+        ACTIVE_SESSION_BY_TOKEN_HASH,
+        {"token_hash": token_hash},
+    )
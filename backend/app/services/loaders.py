@@ -0,0 +1,56 @@
+"""Request-scoped loaders for rows that handlers look up repeatedly.
+
+    vault = await loaders.vaults(db).load(vault_id)
+    tags = await loaders.tags(db).load_many(tag_ids)
+    membership = await loaders.org_memberships(db).load((user_id, org_id))
+
+Single-key batches go through the prebuilt ``hot_queries`` statements.
+"""
+
+import uuid
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dataloader import DataLoader, session_loader
+from app.models.organization import OrgMembership
+from app.models.tag import Tag
+from app.models.vault import Vault
+from app.services import hot_queries
+
+
+async def _load_vaults(db: AsyncSession, ids: list[uuid.UUID]) -> dict[uuid.UUID, Vault]:
+    if len(ids) == 1:
+        return {ids[0]: await hot_queries.vault_by_id(db, ids[0])}
+    result = await db.execute(select(Vault).where(Vault.id.in_(ids)))
+    return {vault.id: vault for vault in result.scalars()}
+
+
+async def _load_tags(db: AsyncSession, ids: list[uuid.UUID]) -> dict[uuid.UUID, Tag]:
+    result = await db.execute(select(Tag).where(Tag.id.in_(ids)))
+    return {tag.id: tag for tag in result.scalars()}
+
+
+async def _load_org_memberships(
+    db: AsyncSession, keys: list[tuple[uuid.UUID, uuid.UUID]]
+) -> dict[tuple[uuid.UUID, uuid.UUID], OrgMembership]:
+    if len(keys) == 1:
+        user_id, org_id = keys[0]
+        return {keys[0]: await hot_queries.org_membership(db, user_id, org_id)}
+    result = await db.execute(
+        select(OrgMembership).where(tuple_(OrgMembership.user_id, OrgMembership.org_id).in_(keys))
+    )
+    return {(m.user_id, m.org_id): m for m in result.scalars()}
+
+
+def vaults(db: AsyncSession) -> DataLoader:
+    return session_loader(db, "vaults", _load_vaults)
+
+
+def tags(db: AsyncSession) -> DataLoader:
+    return session_loader(db, "tags", _load_tags)
+
+
+def org_memberships(db: AsyncSession) -> DataLoader:
+    """Keyed by ``(user_id, org_id)``."""
+    return session_loader(db, "org_memberships", _load_org_memberships)
@@ -1,9 +1,42 @@
 import uuid
+from collections.abc import Iterable
+from datetime import UTC, datetime
 
-from sqlalchemy import func, select, update
+from sqlalchemy import (
+    JSON,
+    DateTime,
+    bindparam,
+    case,
+    func,
+    insert,
+    literal,
+    null,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.notification import Notification
+from app.core.pagination import after, split_page
+from app.core.pubsub import publish_after_commit, publish_many_after_commit
+from app.core.sql import dialect_insert, random_uuid
+from app.models.notification import Notification, NotificationCounter
+from app.models.organization import OrgMembership, TeamMembership
+
+
+def _event(notification: Notification) -> dict:
+    return {
+        "type": "notification",
+        "notification": {
+            "id": str(notification.id),
+            "user_id": str(notification.user_id),
+            "type": notification.type,
+            "title": notification.title,
+            "message": notification.message,
+            "read": notification.read,
+            "metadata_json": notification.metadata_json,
+            "created_at": notification.created_at.isoformat(),
+        },
+    }
 
 
 async def create_notification(
@@ -23,23 +56,146 @@ async def create_notification(
     )
     db.add(notification)
     await db.flush()
+    await add_unread(db, {user_id: 1})
+    publish_after_commit(db, user_id, _event(notification))
     return notification
 
 
+# --- Broadcasts ------------------------------------------------------------
+# One notification per member of an org or team, written with a single
+# INSERT ... SELECT from the membership table and a matching set-based
+# counter upsert, so the cost does not grow with a flush per recipient.
+
+
+async def broadcast_to_org(
+    db: AsyncSession,
+    org_id: uuid.UUID,
+    type: str,
+    title: str,
+    message: str,
+    metadata_json: dict | None = None,
+    *,
+    exclude_user_id: uuid.UUID | None = None,
+) -> int:
+    """Notify every member of ``org_id``; returns the number of recipients."""
+    conditions = [OrgMembership.org_id == org_id]
+    if exclude_user_id is not None:
+        conditions.append(OrgMembership.user_id != exclude_user_id)
+    return await _broadcast(
+        db, OrgMembership.user_id, conditions, type, title, message, metadata_json
+    )
+
+
+async def broadcast_to_team(
+    db: AsyncSession,
+    team_id: uuid.UUID,
+    type: str,
+    title: str,
+    message: str,
+    metadata_json: dict | None = None,
+    *,
+    exclude_user_id: uuid.UUID | None = None,
+) -> int:
+    """Notify every member of ``team_id``; returns the number of recipients."""
+    conditions = [TeamMembership.team_id == team_id]
+    if exclude_user_id is not None:
+        conditions.append(TeamMembership.user_id != exclude_user_id)
+    return await _broadcast(
+        db, TeamMembership.user_id, conditions, type, title, message, metadata_json
+    )
+
+
+async def _broadcast(
+    db: AsyncSession,
+    member_id,
+    conditions: list,
+    type: str,
+    title: str,
+    message: str,
+    metadata_json: dict | None,
+) -> int:
+    now = datetime.now(UTC)
+    rows = select(
+        random_uuid(db),
+        member_id,
+        literal(type),
+        literal(title),
+        literal(message),
+        literal(False),
+        literal(metadata_json, JSON) if metadata_json is not None else null(),
+        literal(now, DateTime(timezone=True)),
+    ).where(*conditions)
+    result = await db.scalars(
+        insert(Notification)
+        .from_select(
+            ["id", "user_id", "type", "title", "message", "read", "metadata_json", "created_at"],
+            rows,
+        )
+        .returning(Notification.user_id)
+    )
+    recipients = result.all()
+    if not recipients:
+        return 0
+
+    table = NotificationCounter.__table__
+    counters = dialect_insert(db, table).from_select(
+        ["user_id", "unread_count"], select(member_id, literal(1)).where(*conditions)
+    )
+    await db.execute(
+        counters.on_conflict_do_update(
+            index_elements=[table.c.user_id],
+            set_={"unread_count": table.c.unread_count + counters.excluded.unread_count},
+        )
+    )
+    publish_many_after_commit(
+        db,
+        recipients,
+        {
+            "type": "broadcast",
+            "notification": {
+                "type": type,
+                "title": title,
+                "message": message,
+                "metadata_json": metadata_json,
+                "created_at": now.isoformat(),
+            },
+        },
+    )
+    return len(recipients)
+
+
 async def get_user_notifications(
     db: AsyncSession,
     user_id: uuid.UUID,
+    *,
     limit: int = 50,
-    offset: int = 0,
-) -> list[Notification]:
+    cursor: str | None = None,
+    unread_only: bool = False,
+    since: datetime | None = None,
+) -> tuple[list[Notification], str | None]:
+    """The user's notifications, newest first, one keyset page at a time.
+
+    ``since`` keeps only notifications created after it, for clients that
+    already hold the rest. Returns the page and the next cursor (``None``
+    on the last page).
+    """
+    conditions = [
+        Notification.user_id == user_id,
+        after(cursor, Notification.created_at, Notification.id),
+    ]
+    if unread_only:
+        # Matches the partial ix_notifications_user_unread_created index.
+        conditions.append(Notification.read == False)  # noqa: E712
+    if since is not None:
+        conditions.append(Notification.created_at > since)
+
     result = await db.execute(
         select(Notification)
-        .where(Notification.user_id == user_id)
-        .order_by(Notification.created_at.desc())
-        .limit(limit)
-        .offset(offset)
+        .where(*conditions)
+        .order_by(Notification.created_at.desc(), Notification.id.desc())
+        .limit(limit + 1)
     )
-    return list(result.scalars().all())
+    return split_page(result.scalars().all(), limit, lambda n: (n.created_at, n.id))
 
 
 async def mark_as_read(
@@ -47,15 +203,20 @@ async def mark_as_read(
     user_id: uuid.UUID,
     notification_ids: list[uuid.UUID],
 ) -> None:
-    await db.execute(
+    result = await db.execute(
         update(Notification)
         .where(
             Notification.user_id == user_id,
             Notification.id.in_(notification_ids),
+            Notification.read == False,  # noqa: E712
         )
         .values(read=True)
     )
+    if result.rowcount:
+        await subtract_unread(db, {user_id: result.rowcount})
     await db.flush()
+    count = await get_unread_count(db, user_id)
+    publish_after_commit(db, user_id, {"type": "unread_count", "count": count})
 
 
 async def mark_all_as_read(
@@ -66,15 +227,111 @@ async def mark_all_as_read(
         .where(Notification.user_id == user_id, Notification.read == False)  # noqa: E712
         .values(read=True)
     )
+    await db.execute(
+        update(NotificationCounter)
+        .where(NotificationCounter.user_id == user_id)
+        .values(unread_count=0)
+    )
     await db.flush()
+    publish_after_commit(db, user_id, {"type": "unread_count", "count": 0})
+
+
+# --- Unread counters -------------------------------------------------------
+# notification_counters holds each user's unread count, adjusted in the same
+# transaction as the notification change; reconcile_unread_counts repairs
+# any drift (e.g. from rows written outside this module).
 
 
 async def get_unread_count(
     db: AsyncSession, user_id: uuid.UUID
 ) -> int:
+    # No counter row means the user has never had an unread notification.
+    result = await db.execute(
+        select(NotificationCounter.unread_count).where(NotificationCounter.user_id == user_id)
+    )
+    return result.scalar() or 0
+
+
+async def count_unread(
+    db: AsyncSession, user_id: uuid.UUID
+) -> int:
+    """Unread count straight from the notifications table."""
     result = await db.execute(
         select(func.count())
         .select_from(Notification)
         .where(Notification.user_id == user_id, Notification.read == False)  # noqa: E712
     )
     return result.scalar() or 0
+
+
+async def add_unread(db: AsyncSession, counts: dict[uuid.UUID, int]) -> None:
+    """Add new unread notifications to the users' counters, creating missing rows."""
+    if not counts:
+        return
+    table = NotificationCounter.__table__
+    upsert = dialect_insert(db, table)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={"unread_count": table.c.unread_count + upsert.excluded.unread_count},
+    )
+    await db.execute(
+        upsert,
+        [{"user_id": user_id, "unread_count": count} for user_id, count in counts.items()],
+    )
+
+
+async def subtract_unread(db: AsyncSession, counts: dict[uuid.UUID, int]) -> None:
+    """Take read or deleted notifications off the users' counters, never below zero."""
+    if not counts:
+        return
+    table = NotificationCounter.__table__
+    counter, count = table.c.unread_count, bindparam("count")
+    await db.execute(
+        update(table)
+        .where(table.c.user_id == bindparam("counter_user_id"))
+        .values(unread_count=case((counter > count, counter - count), else_=0)),
+        [{"counter_user_id": user_id, "count": n} for user_id, n in counts.items()],
+    )
+
+
+async def publish_unread_counts(db: AsyncSession, user_ids: Iterable[uuid.UUID]) -> None:
+    """Push each user's current counter to their streams once ``db`` commits."""
+    result = await db.execute(
+        select(NotificationCounter.user_id, NotificationCounter.unread_count).where(
+            NotificationCounter.user_id.in_(set(user_ids))
+        )
+    )
+    for user_id, count in result:
+        publish_after_commit(db, user_id, {"type": "unread_count", "count": count})
+
+
+async def reconcile_unread_counts(db: AsyncSession) -> dict:
+    """Recompute every counter from the notifications table, set-based.
+
+    An increment committed while this runs can be overwritten; the next
+    run corrects it.
+    """
+    table = NotificationCounter.__table__
+    unread = (
+        select(Notification.user_id, func.count())
+        .where(Notification.read == False)  # noqa: E712
+        .group_by(Notification.user_id)
+    )
+    upsert = dialect_insert(db, table).from_select(["user_id", "unread_count"], unread)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={"unread_count": upsert.excluded.unread_count},
+    )
+    counted = await db.execute(upsert)
+    users_with_unread = select(Notification.user_id).where(Notification.read == False)  # noqa: E712
+    cleared = await db.execute(
+        update(NotificationCounter)
+        .where(
+            NotificationCounter.unread_count != 0,
+            NotificationCounter.user_id.not_in(users_with_unread),
+        )
+        .values(unread_count=0),
+        execution_options={"synchronize_session": False},
+    )
+    await db.commit()
+    return {"status": "completed", "counted": counted.rowcount, "cleared": cleared.rowcount}
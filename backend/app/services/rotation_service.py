@@ -0,0 +1,226 @@
+"""Password-rotation reminders driven by each organization's ``PasswordPolicy``.
+
+For every org with a policy, the vaults owned by its members (the org's
+vaults and the members' personal ones) are walked in keyset chunks. For
+each chunk two ``INSERT ... SELECT`` statements claim the reminders in the
+database, one per stage:
+
+* ``due``: unchanged for ``rotation_reminder_days``;
+* ``overdue``: unchanged for ``max_age_days``.
+
+Secrets are matched and claimed in SQL on ``(vault_id, updated_at)`` (see
+``ix_secrets_vault_updated``); unclaimed ones are never loaded. Each reminder
+is a ``dedupe_key`` of secret, stage and the day the secret last changed,
+inserted into ``notification_dedupe_keys`` (which outlives the
+notifications) with conflicts skipped. Re-runs, overlapping orgs, retries
+and retention sweeps therefore never repeat a reminder, and rotating the
+secret starts a new period.
+
+Only the newly claimed keys come back to Python (``RETURNING``), where
+they are parsed into events and go through ``digest_service.write_digest``
+per owner: one notification per user and chunk, a summary when there are
+several, in the same transaction.
+
+A run works through orgs in id order and their vaults in id order, and
+checks its time budget after every chunk. When the budget is spent it
+stops and returns an ``(org_id, vault_id)`` cursor to resume from, so a
+single large org cannot run unbounded.
+"""
+
+import time
+import uuid
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import DateTime, String, cast, func, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.sql import dialect_insert
+from app.models.audit import PasswordPolicy
+from app.models.notification import NotificationDedupeKey
+from app.models.organization import OrgMembership
+from app.models.secret import Secret, SecretType
+from app.models.vault import Vault
+from app.services import digest_service
+
+NOTIFICATION_TYPE = "password_rotation"
+ROTATED_TYPES = (SecretType.PASSWORD, SecretType.LOGIN)
+
+_MESSAGES = {
+    "due": ("Password rotation due", "A password in one of your vaults is due for rotation."),
+    "overdue": (
+        "Password rotation overdue",
+        "A password in one of your vaults is older than your organization allows.",
+    ),
+}
+
+
+def _claim_reminders(
+    db: AsyncSession,
+    vault_ids: list[uuid.UUID],
+    stage: str,
+    changed_before: datetime,
+    changed_since: datetime | None,
+    now: datetime,
+):
+    conditions = [
+        Secret.vault_id.in_(vault_ids),
+        Secret.updated_at < changed_before,
+        Secret.type.in_(ROTATED_TYPES),
+        Secret.is_deleted == False,  # noqa: E712
+        Secret.is_archived == False,  # noqa: E712
+    ]
+    if changed_since is not None:
+        conditions.append(Secret.updated_at >= changed_since)
+
+    rows = (
+        select(
+            literal(f"{NOTIFICATION_TYPE}:{stage}:")
+            + cast(Secret.id, String)
+            + literal(":")
+            + cast(func.date(Secret.updated_at), String),
+            Vault.owner_id,
+            literal(now, DateTime(timezone=True)),
+        )
+        .join(Vault, Vault.id == Secret.vault_id)
+        .where(*conditions)
+    )
+    return (
+        dialect_insert(db, NotificationDedupeKey)
+        .from_select(["dedupe_key", "user_id", "created_at"], rows)
+        .on_conflict_do_nothing(index_elements=["dedupe_key"])
+        .returning(NotificationDedupeKey.user_id, NotificationDedupeKey.dedupe_key)
+    )
+
+
+def _event(user_id: uuid.UUID, dedupe_key: str) -> dict:
+    _, stage, secret_id, _ = dedupe_key.split(":")
+    title, message = _MESSAGES[stage]
+    return {
+        "user_id": user_id,
+        "type": NOTIFICATION_TYPE,
+        "title": title,
+        "message": message,
+        "metadata_json": {"secret_id": str(uuid.UUID(secret_id)), "stage": stage},
+        "email": False,
+    }
+
+
+async def _remind_org(
+    db: AsyncSession,
+    policy: PasswordPolicy,
+    now: datetime,
+    vault_batch_size: int,
+    after_vault_id: uuid.UUID | None,
+    deadline: float,
+) -> tuple[int, int, uuid.UUID | None]:
+    """Reminders for one org, committed per vault chunk.
+
+    Returns ``(vaults, reminders, last_vault_id)``; ``last_vault_id`` is set
+    when ``deadline`` passed before the org's vaults were all processed.
+    """
+    org_id = policy.org_id
+    members = select(OrgMembership.user_id).where(OrgMembership.org_id == org_id)
+    max_age_cutoff = now - timedelta(days=policy.max_age_days)
+    reminder_cutoff = now - timedelta(days=policy.rotation_reminder_days)
+
+    vaults = reminders = 0
+    last_id = after_vault_id
+    while True:
+        query = (
+            select(Vault.id)
+            .where(
+                Vault.owner_id.in_(members),
+                or_(Vault.org_id == org_id, Vault.org_id.is_(None)),
+            )
+            .order_by(Vault.id)
+            .limit(vault_batch_size)
+        )
+        if last_id is not None:
+            query = query.where(Vault.id > last_id)
+        vault_ids = list((await db.execute(query)).scalars())
+        if not vault_ids:
+            return vaults, reminders, None
+        last_id = vault_ids[-1]
+
+        claimed = (
+            await db.execute(
+                _claim_reminders(db, vault_ids, "overdue", max_age_cutoff, None, now)
+            )
+        ).all()
+        claimed += (
+            await db.execute(
+                _claim_reminders(db, vault_ids, "due", reminder_cutoff, max_age_cutoff, now)
+            )
+        ).all()
+        by_user = defaultdict(list)
+        for user_id, dedupe_key in claimed:
+            by_user[user_id].append(_event(user_id, dedupe_key))
+        for events in by_user.values():
+            await digest_service.write_digest(db, events)
+        await db.commit()
+        vaults += len(vault_ids)
+        reminders += len(claimed)
+        if time.perf_counter() >= deadline:
+            return vaults, reminders, last_id
+
+
+async def send_rotation_reminders(
+    db: AsyncSession,
+    *,
+    now: datetime | None = None,
+    resume_from: tuple[uuid.UUID, uuid.UUID | None] | None = None,
+    vault_batch_size: int | None = None,
+    time_budget_seconds: float | None = None,
+) -> dict:
+    """Create due/overdue reminders for every org with a password policy.
+
+    ``resume_from`` in the result is ``None`` once every org is done, else
+    the ``(org_id, vault_id)`` cursor to pass back as ``resume_from``:
+    continue that org after the vault, or after the org when ``vault_id``
+    is ``None``.
+    """
+    start = time.perf_counter()
+    now = now or datetime.now(UTC)
+    vault_batch_size = vault_batch_size or settings.ROTATION_VAULT_BATCH_SIZE
+    if time_budget_seconds is None:
+        time_budget_seconds = settings.ROTATION_TIME_BUDGET_SECONDS
+    deadline = start + time_budget_seconds
+
+    org_id, vault_id = resume_from or (None, None)
+    orgs = vaults = reminders = 0
+    cursor = None
+    while True:
+        query = select(PasswordPolicy).order_by(PasswordPolicy.org_id).limit(1)
+        if org_id is not None:
+            query = query.where(
+                PasswordPolicy.org_id >= org_id if vault_id else PasswordPolicy.org_id > org_id
+            )
+        policy = (await db.execute(query)).scalar_one_or_none()
+        if policy is None:
+            break
+        if policy.org_id != org_id:
+            vault_id = None
+        org_id = policy.org_id
+
+        org_vaults, org_reminders, vault_id = await _remind_org(
+            db, policy, now, vault_batch_size, vault_id, deadline
+        )
+        orgs += 1
+        vaults += org_vaults
+        reminders += org_reminders
+        if vault_id is not None or time.perf_counter() >= deadline:
+            cursor = (org_id, vault_id)
+            break
+
+    return {
+        "status": "completed",
+        "checked": orgs,
+        "vaults": vaults,
+        "reminders_sent": reminders,
+        "resume_from": (
+            [str(cursor[0]), str(cursor[1]) if cursor[1] else None] if cursor else None
+        ),
+        "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.exceptions import AuthorizationError, NotFoundError
 from app.models.secret import Folder, Secret, SecretType, SecretVersion
 from app.models.vault import Vault
+from app.services import hot_queries, loaders, vault_service
 
 
 async def create_secret(
@@ -46,6 +47,7 @@ async def create_secret(
     )
     db.add(version)
     await db.flush()
+    await vault_service.record_secret_change(db, vault.id, secret.type, +1)
 
     return secret
 
@@ -96,8 +98,7 @@ async def get_vault_secrets(
 async def get_secret(
     db: AsyncSession, secret_id: uuid.UUID, user_id: uuid.UUID
 ) -> Secret:
-    result = await db.execute(select(Secret).where(Secret.id == secret_id))
-    secret = result.scalar_one_or_none()
+    secret = await hot_queries.secret_by_id(db, secret_id)
 
     if not secret or secret.is_deleted:
         raise NotFoundError("Secret")
@@ -145,6 +146,7 @@ async def update_secret(
         db.add(version)
 
     await db.flush()
+    await vault_service.record_secret_change(db, secret.vault_id)
     return secret
 
 
@@ -155,6 +157,7 @@ async def delete_secret(
     secret.is_deleted = True
     secret.deleted_at = datetime.now(UTC)
     await db.flush()
+    await vault_service.record_secret_change(db, secret.vault_id, secret.type, -1)
 
 
 async def archive_secret(
@@ -163,19 +166,20 @@ async def archive_secret(
     secret = await get_secret(db, secret_id, user_id)
     secret.is_archived = True
     await db.flush()
+    await vault_service.record_secret_change(db, secret.vault_id)
     return secret
 
 
 async def unarchive_secret(
     db: AsyncSession, secret_id: uuid.UUID, user_id: uuid.UUID
 ) -> Secret:
-    result = await db.execute(select(Secret).where(Secret.id == secret_id))
-    secret = result.scalar_one_or_none()
+    secret = await hot_queries.secret_by_id(db, secret_id)
     if not secret:
         raise NotFoundError("Secret")
     await _verify_vault_access(db, secret.vault_id, user_id)
     secret.is_archived = False
     await db.flush()
+    await vault_service.record_secret_change(db, secret.vault_id)
     return secret
 
 
@@ -218,27 +222,31 @@ async def get_deleted_secrets(
 async def restore_secret(
     db: AsyncSession, secret_id: uuid.UUID, user_id: uuid.UUID
 ) -> Secret:
-    result = await db.execute(select(Secret).where(Secret.id == secret_id))
-    secret = result.scalar_one_or_none()
+    secret = await hot_queries.secret_by_id(db, secret_id)
     if not secret:
         raise NotFoundError("Secret")
     await _verify_vault_access(db, secret.vault_id, user_id)
+    delta = 1 if secret.is_deleted else 0
     secret.is_deleted = False
     secret.deleted_at = None
     await db.flush()
+    await vault_service.record_secret_change(db, secret.vault_id, secret.type, delta)
     return secret
 
 
 async def permanent_delete_secret(
     db: AsyncSession, secret_id: uuid.UUID, user_id: uuid.UUID
 ) -> None:
-    result = await db.execute(select(Secret).where(Secret.id == secret_id))
-    secret = result.scalar_one_or_none()
+    secret = await hot_queries.secret_by_id(db, secret_id)
     if not secret:
         raise NotFoundError("Secret")
     await _verify_vault_access(db, secret.vault_id, user_id)
+    # Soft-deleted secrets were already taken out of the counts.
+    delta = 0 if secret.is_deleted else -1
+    vault_id, secret_type = secret.vault_id, secret.type
     await db.delete(secret)
     await db.flush()
+    await vault_service.record_secret_change(db, vault_id, secret_type, delta)
 
 
 async def get_secret_versions(
@@ -270,6 +278,7 @@ async def create_folder(
     )
     db.add(folder)
     await db.flush()
+    await vault_service.record_folder_change(db, vault_id, +1)
     return folder
 
 
@@ -295,9 +304,13 @@ async def move_secret(
     secret = await get_secret(db, secret_id, user_id)
     await _verify_vault_access(db, target_vault_id, user_id)
 
+    source_vault_id = secret.vault_id
     secret.vault_id = target_vault_id
     secret.encrypted_item_key = encrypted_item_key
     await db.flush()
+    if source_vault_id != target_vault_id:
+        await vault_service.record_secret_change(db, source_vault_id, secret.type, -1)
+        await vault_service.record_secret_change(db, target_vault_id, secret.type, +1)
     return secret
 
 
@@ -338,6 +351,7 @@ async def duplicate_secret(
     )
     db.add(version)
     await db.flush()
+    await vault_service.record_secret_change(db, vault_id, duplicate.type, +1)
 
     return duplicate
 
@@ -345,8 +359,7 @@ async def duplicate_secret(
 async def _verify_vault_access(
     db: AsyncSession, vault_id: uuid.UUID, user_id: uuid.UUID
 ) -> Vault:
-    result = await db.execute(select(Vault).where(Vault.id == vault_id))
-    vault = result.scalar_one_or_none()
+    vault = await loaders.vaults(db).load(vault_id)
 
     if not vault:
         raise NotFoundError("Vault")
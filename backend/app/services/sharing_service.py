@@ -1,14 +1,21 @@
 import secrets
+import time
 import uuid
+from collections import OrderedDict
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import Row, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.exceptions import AuthorizationError, NotFoundError, ValidationError
+from app.core.pagination import after, split_page
+from app.models.organization import Team, TeamMembership
 from app.models.secret import Secret
 from app.models.sharing import SecretShare, SharePermission
+from app.models.user import User
 from app.models.vault import Vault
+from app.services import hot_queries
 
 
 async def share_secret(
@@ -25,13 +32,11 @@ async def share_secret(
     if not shared_with_user_id and not shared_with_team_id:
         raise ValidationError("Must specify either a user or team to share with")
 
-    result = await db.execute(select(Secret).where(Secret.id == secret_id))
-    secret = result.scalar_one_or_none()
+    secret = await hot_queries.secret_by_id(db, secret_id)
     if not secret or secret.is_deleted:
         raise NotFoundError("Secret")
 
-    vault_result = await db.execute(select(Vault).where(Vault.id == secret.vault_id))
-    vault = vault_result.scalar_one_or_none()
+    vault = await hot_queries.vault_by_id(db, secret.vault_id)
     if not vault or vault.owner_id != shared_by:
         raise AuthorizationError("Only the vault owner can share secrets")
 
@@ -49,24 +54,162 @@ async def share_secret(
     return share
 
 
+async def _check_shareable(
+    db: AsyncSession, secret_ids: set[uuid.UUID], shared_by: uuid.UUID
+) -> None:
+    """One query for the whole batch: every secret must exist and be ``shared_by``'s."""
+    result = await db.execute(
+        select(Secret.id, Vault.owner_id)
+        .join(Vault, Vault.id == Secret.vault_id)
+        .where(Secret.id.in_(secret_ids), Secret.is_deleted == False)  # noqa: E712
+    )
+    owners = dict(result.all())
+    if owners.keys() != secret_ids:
+        raise NotFoundError("Secret")
+    if any(owner_id != shared_by for owner_id in owners.values()):
+        raise AuthorizationError("Only the vault owner can share secrets")
+
+
+async def _check_recipients(db: AsyncSession, rows: list[dict]) -> None:
+    """Unknown users or teams are a 404 here rather than a foreign-key error on insert."""
+    user_ids = {row["shared_with_user_id"] for row in rows} - {None}
+    team_ids = {row["shared_with_team_id"] for row in rows} - {None}
+    if user_ids:
+        found = await db.scalars(select(User.id).where(User.id.in_(user_ids)))
+        if set(found) != user_ids:
+            raise NotFoundError("User")
+    if team_ids:
+        found = await db.scalars(select(Team.id).where(Team.id.in_(team_ids)))
+        if set(found) != team_ids:
+            raise NotFoundError("Team")
+
+
+def _share_row(shared_by: uuid.UUID, item: dict) -> dict:
+    if not item.get("shared_with_user_id") and not item.get("shared_with_team_id"):
+        raise ValidationError("Must specify either a user or team to share with")
+    return {
+        "secret_id": item["secret_id"],
+        "shared_by": shared_by,
+        "shared_with_user_id": item.get("shared_with_user_id"),
+        "shared_with_team_id": item.get("shared_with_team_id"),
+        "encrypted_item_key_for_recipient": item["encrypted_item_key_for_recipient"],
+        "permission": SharePermission(item.get("permission") or "read"),
+        "expires_at": item.get("expires_at"),
+    }
+
+
+async def _insert_shares(db: AsyncSession, rows: list[dict]) -> list[SecretShare]:
+    if not rows:
+        return []
+    # ORM bulk INSERT: one multi-row statement (batched by the driver's
+    # insertmanyvalues), with the new rows returned as entities.
+    return list(await db.scalars(insert(SecretShare).returning(SecretShare), rows))
+
+
+async def bulk_share_secrets(
+    db: AsyncSession, shared_by: uuid.UUID, items: list[dict]
+) -> list[SecretShare]:
+    """Create many shares at once; all-or-nothing.
+
+    ``items`` take the keyword arguments of ``share_secret`` plus
+    ``secret_id``.
+    """
+    rows = [_share_row(shared_by, item) for item in items]
+    await _check_shareable(db, {row["secret_id"] for row in rows}, shared_by)
+    await _check_recipients(db, rows)
+    return await _insert_shares(db, rows)
+
+
+async def upsert_share_keys(
+    db: AsyncSession, shared_by: uuid.UUID, items: list[dict]
+) -> tuple[int, list[SecretShare]]:
+    """Store re-wrapped item keys, e.g. after a recipient's key pair changed.
+
+    Items are matched to ``shared_by``'s existing shares on (secret,
+    recipient), share links excluded; matches get the new key, the rest
+    become new shares (one per (secret, recipient), the last item winning).
+    Returns the number of updated shares and the created ones.
+    """
+    rows = [_share_row(shared_by, item) for item in items]
+    secret_ids = {row["secret_id"] for row in rows}
+    await _check_shareable(db, secret_ids, shared_by)
+    await _check_recipients(db, rows)
+
+    existing = await db.execute(
+        select(
+            SecretShare.id,
+            SecretShare.secret_id,
+            SecretShare.shared_with_user_id,
+            SecretShare.shared_with_team_id,
+        ).where(
+            SecretShare.secret_id.in_(secret_ids),
+            SecretShare.shared_by == shared_by,
+            SecretShare.share_link_token.is_(None),
+        )
+    )
+    share_ids: dict[tuple, list[uuid.UUID]] = {}
+    for share_id, *key in existing.all():
+        share_ids.setdefault(tuple(key), []).append(share_id)
+
+    updates: dict[uuid.UUID, str] = {}
+    inserts: dict[tuple, dict] = {}
+    for row in rows:
+        key = (row["secret_id"], row["shared_with_user_id"], row["shared_with_team_id"])
+        if key in share_ids:
+            for share_id in share_ids[key]:
+                updates[share_id] = row["encrypted_item_key_for_recipient"]
+        else:
+            inserts[key] = row
+
+    if updates:
+        # ORM bulk UPDATE by primary key: one executemany statement.
+        await db.execute(
+            update(SecretShare),
+            [
+                {"id": share_id, "encrypted_item_key_for_recipient": new_key}
+                for share_id, new_key in updates.items()
+            ],
+        )
+    return len(updates), await _insert_shares(db, list(inserts.values()))
+
+
 async def get_shared_with_me(
-    db: AsyncSession, user_id: uuid.UUID
-) -> list[tuple[SecretShare, Secret]]:
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    *,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> tuple[list[tuple[SecretShare, Secret]], str | None]:
+    """Shares addressed to the user directly or to any team they belong to.
+
+    Newest first, ``limit`` per page; returns the page and the cursor of
+    the next one (``None`` on the last page).
+    """
     now = datetime.now(UTC)
+    user_teams = select(TeamMembership.team_id).where(TeamMembership.user_id == user_id)
 
     result = await db.execute(
         select(SecretShare, Secret)
         .join(Secret, SecretShare.secret_id == Secret.id)
         .where(
-            SecretShare.shared_with_user_id == user_id,
+            or_(
+                SecretShare.shared_with_user_id == user_id,
+                SecretShare.shared_with_team_id.in_(user_teams),
+            ),
+            # Both arms are index conditions on the (recipient, expires_at,
+            # created_at) indexes.
+            or_(SecretShare.expires_at.is_(None), SecretShare.expires_at > now),
             Secret.is_deleted == False,  # noqa: E712
+            after(cursor, SecretShare.created_at, SecretShare.id),
         )
-        .where(
-            (SecretShare.expires_at == None) | (SecretShare.expires_at > now)  # noqa: E711
-        )
-        .order_by(SecretShare.created_at.desc())
+        .order_by(SecretShare.created_at.desc(), SecretShare.id.desc())
+        .limit(limit + 1)
+    )
+    return split_page(
+        [tuple(row) for row in result.all()],
+        limit,
+        lambda row: (row[0].created_at, row[0].id),
     )
-    return list(result.all())
 
 
 async def revoke_share(
@@ -98,6 +241,8 @@ async def update_share(
         raise NotFoundError("Share")
     if share.shared_by != user_id:
         raise AuthorizationError("Only the sharer can update")
+    if share.share_link_token:
+        share_link_cache.discard(share.share_link_token)
 
     if permission:
         share.permission = SharePermission(permission)
@@ -117,13 +262,11 @@ async def create_share_link(
     expires_in_hours: int = 24,
     max_views: int | None = None,
 ) -> SecretShare:
-    result = await db.execute(select(Secret).where(Secret.id == secret_id))
-    secret = result.scalar_one_or_none()
+    secret = await hot_queries.secret_by_id(db, secret_id)
     if not secret or secret.is_deleted:
         raise NotFoundError("Secret")
 
-    vault_result = await db.execute(select(Vault).where(Vault.id == secret.vault_id))
-    vault = vault_result.scalar_one_or_none()
+    vault = await hot_queries.vault_by_id(db, secret.vault_id)
     if not vault or vault.owner_id != user_id:
         raise AuthorizationError("Only the vault owner can create share links")
 
@@ -146,31 +289,123 @@ async def create_share_link(
     return share
 
 
-async def access_share_link(
-    db: AsyncSession,
-    token: str,
-) -> tuple[SecretShare, Secret]:
+class ShareLinkCache:
+    """Recently accessed link tokens, so dead links fail without a query.
+
+    An entry holds why a link is dead (``not_found``, ``expired``,
+    ``exhausted``) or, for a live link, its expiry, which turns it dead
+    once passed. View limits and expiry only ever run out, so a dead entry
+    stays correct; ``update_share`` can extend a link, and entries expire
+    after ``ttl`` seconds so that change reaches every worker.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, str | None, datetime | None]] = OrderedDict()
+
+    def dead_reason(self, token: str) -> str | None:
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        cached_at, reason, expires_at = entry
+        if time.monotonic() - cached_at >= self.ttl:
+            del self._entries[token]
+            return None
+        if reason is None and expires_at is not None and expires_at <= datetime.now(UTC):
+            return "expired"
+        return reason
+
+    def mark_dead(self, token: str, reason: str) -> None:
+        self._put(token, reason, None)
+
+    def mark_live(self, token: str, expires_at: datetime | None) -> None:
+        if expires_at is not None and expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=UTC)  # SQLite drops the offset
+        self._put(token, None, expires_at)
+
+    def discard(self, token: str) -> None:
+        self._entries.pop(token, None)
+
+    def _put(self, token: str, reason: str | None, expires_at: datetime | None) -> None:
+        self._entries[token] = (time.monotonic(), reason, expires_at)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+share_link_cache = ShareLinkCache(
+    maxsize=settings.SHARE_LINK_CACHE_SIZE, ttl=settings.SHARE_LINK_CACHE_TTL_SECONDS
+)
+
+_DEAD_LINK_ERRORS = {
+    "not_found": lambda: NotFoundError("Share link"),
+    "expired": lambda: ValidationError("Share link has expired"),
+    "exhausted": lambda: ValidationError("Share link view limit reached"),
+}
+
+
+async def _dead_link_reason(db: AsyncSession, token: str, now: datetime) -> str:
     result = await db.execute(
-        select(SecretShare, Secret)
-        .join(Secret, SecretShare.secret_id == Secret.id)
-        .where(SecretShare.share_link_token == token)
+        select(SecretShare.expires_at).where(SecretShare.share_link_token == token)
     )
     row = result.first()
-    if not row:
-        raise NotFoundError("Share link")
-
-    share, secret = row[0], row[1]
+    if row is None:
+        return "not_found"
+    expires_at = row.expires_at
+    if expires_at is not None and expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=UTC)
+    if expires_at is not None and expires_at <= now:
+        return "expired"
+    return "exhausted"
+
+
+async def access_share_link(db: AsyncSession, token: str) -> tuple[Row, Secret]:
+    """Count a view of a public link and return the share and its secret.
+
+    The limits are checked and ``view_count`` incremented by a single
+    conditional ``UPDATE ... RETURNING``, so concurrent viewers cannot
+    exceed ``max_views`` (0 or ``None`` means unlimited).
+    """
+    reason = share_link_cache.dead_reason(token)
+    if reason is not None:
+        raise _DEAD_LINK_ERRORS[reason]()
 
     now = datetime.now(UTC)
-    if share.expires_at and share.expires_at < now:
-        raise ValidationError("Share link has expired")
+    result = await db.execute(
+        update(SecretShare)
+        .where(
+            SecretShare.share_link_token == token,
+            or_(SecretShare.expires_at.is_(None), SecretShare.expires_at > now),
+            or_(
+                SecretShare.max_views.is_(None),
+                SecretShare.max_views == 0,
+                SecretShare.view_count < SecretShare.max_views,
+            ),
+        )
+        .values(view_count=SecretShare.view_count + 1)
+        .returning(
+            SecretShare.secret_id,
+            SecretShare.encrypted_item_key_for_recipient,
+            SecretShare.view_count,
+            SecretShare.max_views,
+            SecretShare.expires_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    share = result.one_or_none()
+    if share is None:
+        reason = await _dead_link_reason(db, token, now)
+        share_link_cache.mark_dead(token, reason)
+        raise _DEAD_LINK_ERRORS[reason]()
 
     if share.max_views and share.view_count >= share.max_views:
-        raise ValidationError("Share link view limit reached")
-
-    share.view_count += 1
-    await db.flush()
-
+        share_link_cache.mark_dead(token, "exhausted")
+    else:
+        share_link_cache.mark_live(token, share.expires_at)
+    # SQLite's RETURNING cannot include UPDATE ... FROM tables, so the
+    # secret is a separate primary-key lookup.
+    secret = await hot_queries.secret_by_id(db, share.secret_id)
     return share, secret
 
 
@@ -179,13 +414,11 @@ async def get_sharing_history(
     secret_id: uuid.UUID,
     user_id: uuid.UUID,
 ) -> list[SecretShare]:
-    result = await db.execute(select(Secret).where(Secret.id == secret_id))
-    secret = result.scalar_one_or_none()
+    secret = await hot_queries.secret_by_id(db, secret_id)
     if not secret:
         raise NotFoundError("Secret")
 
-    vault_result = await db.execute(select(Vault).where(Vault.id == secret.vault_id))
-    vault = vault_result.scalar_one_or_none()
+    vault = await hot_queries.vault_by_id(db, secret.vault_id)
     if not vault or vault.owner_id != user_id:
         raise AuthorizationError("Not authorized")
 
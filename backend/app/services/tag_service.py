@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import NotFoundError
 from app.models.tag import SecretTag, Tag
+from app.services import loaders
 
 
 async def create_tag(
@@ -70,13 +71,16 @@ async def assign_tags_to_secret(
     tag_ids: list[uuid.UUID],
     user_id: uuid.UUID,
 ) -> None:
+    tags = await loaders.tags(db).load_many(tag_ids)
+    if any(tag is None or tag.user_id != user_id for tag in tags):
+        raise NotFoundError("Tag")
+
     # Remove existing tags for this secret
     await db.execute(
         delete(SecretTag).where(SecretTag.secret_id == secret_id)
     )
     # Add new tag assignments
     for tag_id in tag_ids:
-        await get_tag(db, tag_id, user_id)
         db.add(SecretTag(secret_id=secret_id, tag_id=tag_id))
     await db.flush()
 
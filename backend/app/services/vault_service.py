@@ -1,11 +1,14 @@
 import uuid
+from datetime import UTC, datetime
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import AuthorizationError, NotFoundError
-from app.models.secret import Folder, Secret
-from app.models.vault import Vault, VaultType
+from app.core.sql import dialect_insert
+from app.models.secret import Folder, Secret, SecretType
+from app.models.vault import Vault, VaultStats, VaultType, VaultTypeStats
+from app.services import loaders
 
 
 async def create_vault(
@@ -27,6 +30,8 @@ async def create_vault(
     )
     db.add(vault)
     await db.flush()
+    db.add(VaultStats(vault_id=vault.id, last_modified_at=vault.created_at))
+    await db.flush()
     return vault
 
 
@@ -49,8 +54,7 @@ async def get_user_vaults(
 async def get_vault(
     db: AsyncSession, vault_id: uuid.UUID, user_id: uuid.UUID
 ) -> Vault:
-    result = await db.execute(select(Vault).where(Vault.id == vault_id))
-    vault = result.scalar_one_or_none()
+    vault = await loaders.vaults(db).load(vault_id)
 
     if not vault:
         raise NotFoundError("Vault")
@@ -86,44 +90,197 @@ async def delete_vault(
     db: AsyncSession, vault_id: uuid.UUID, user_id: uuid.UUID
 ) -> None:
     vault = await get_vault(db, vault_id, user_id)
+    await db.execute(delete(VaultTypeStats).where(VaultTypeStats.vault_id == vault_id))
+    await db.execute(delete(VaultStats).where(VaultStats.vault_id == vault_id))
     await db.delete(vault)
     await db.flush()
 
 
-async def get_vault_item_count(
-    db: AsyncSession, vault_id: uuid.UUID
-) -> int:
-    result = await db.execute(
-        select(func.count())
-        .select_from(Secret)
+# --- Vault stats -----------------------------------------------------------
+# item/folder/type counts live in vault_stats and vault_type_stats and are
+# adjusted in the same transaction as the secret or folder change, so the
+# vault endpoints read them instead of counting rows per vault.
+
+
+def _empty_stats() -> dict:
+    return {"item_count": 0, "folder_count": 0, "type_breakdown": {}, "last_modified_at": None}
+
+
+async def compute_vault_stats(
+    db: AsyncSession, vault_ids: list[uuid.UUID]
+) -> dict[uuid.UUID, dict]:
+    """Aggregate stats for ``vault_ids`` straight from secrets and folders."""
+    stats = {vault_id: _empty_stats() for vault_id in vault_ids}
+    if not vault_ids:
+        return stats
+
+    type_rows = await db.execute(
+        select(Secret.vault_id, Secret.type, func.count())
         .where(
-            Secret.vault_id == vault_id,
+            Secret.vault_id.in_(vault_ids),
             Secret.is_deleted == False,  # noqa: E712
         )
+        .group_by(Secret.vault_id, Secret.type)
     )
-    return result.scalar() or 0
+    for vault_id, secret_type, count in type_rows:
+        stats[vault_id]["type_breakdown"][secret_type.value] = count
+        stats[vault_id]["item_count"] += count
 
+    folder_rows = await db.execute(
+        select(Folder.vault_id, func.count())
+        .where(Folder.vault_id.in_(vault_ids))
+        .group_by(Folder.vault_id)
+    )
+    for vault_id, count in folder_rows:
+        stats[vault_id]["folder_count"] = count
 
-async def get_vault_type_breakdown(
-    db: AsyncSession, vault_id: uuid.UUID
-) -> dict[str, int]:
-    result = await db.execute(
-        select(Secret.type, func.count())
-        .where(
-            Secret.vault_id == vault_id,
-            Secret.is_deleted == False,  # noqa: E712
-        )
-        .group_by(Secret.type)
+    modified_rows = await db.execute(
+        select(Secret.vault_id, func.max(Secret.updated_at))
+        .where(Secret.vault_id.in_(vault_ids))
+        .group_by(Secret.vault_id)
     )
-    return {row[0].value: row[1] for row in result.all()}
+    for vault_id, last_modified_at in modified_rows:
+        stats[vault_id]["last_modified_at"] = last_modified_at
+
+    return stats
+
+
+async def get_vault_stats(
+    db: AsyncSession,
+    vault_ids: list[uuid.UUID],
+    *,
+    include_types: bool = False,
+    compute_missing: bool = True,
+) -> dict[uuid.UUID, dict]:
+    """Stored stats for ``vault_ids`` in one query.
+
+    Vaults without a stats row (not yet repaired) are computed on the fly
+    unless ``compute_missing`` is false.
+    """
+    if not vault_ids:
+        return {}
+
+    query = select(
+        VaultStats.vault_id,
+        VaultStats.item_count,
+        VaultStats.folder_count,
+        VaultStats.last_modified_at,
+    ).where(VaultStats.vault_id.in_(vault_ids))
+    if include_types:
+        query = query.add_columns(
+            VaultTypeStats.secret_type, VaultTypeStats.item_count.label("type_count")
+        ).outerjoin(VaultTypeStats, VaultTypeStats.vault_id == VaultStats.vault_id)
+
+    stats: dict[uuid.UUID, dict] = {}
+    for row in await db.execute(query):
+        entry = stats.get(row.vault_id)
+        if entry is None:
+            entry = stats[row.vault_id] = {
+                "item_count": row.item_count,
+                "folder_count": row.folder_count,
+                "type_breakdown": {},
+                "last_modified_at": row.last_modified_at,
+            }
+        if include_types and row.secret_type is not None and row.type_count:
+            entry["type_breakdown"][row.secret_type] = row.type_count
+
+    missing = [vault_id for vault_id in vault_ids if vault_id not in stats]
+    if missing and compute_missing:
+        stats.update(await compute_vault_stats(db, missing))
+    return stats
+
 
+async def store_vault_stats(db: AsyncSession, stats: dict[uuid.UUID, dict]) -> None:
+    """Overwrite the stored stats rows for the vaults in ``stats``."""
+    if not stats:
+        return
+    vault_ids = list(stats)
+    await db.execute(delete(VaultTypeStats).where(VaultTypeStats.vault_id.in_(vault_ids)))
 
-async def get_vault_folder_count(
-    db: AsyncSession, vault_id: uuid.UUID
-) -> int:
+    table = VaultStats.__table__
+    upsert = dialect_insert(db, table)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[table.c.vault_id],
+        set_={
+            "item_count": upsert.excluded.item_count,
+            "folder_count": upsert.excluded.folder_count,
+            "last_modified_at": func.coalesce(
+                table.c.last_modified_at, upsert.excluded.last_modified_at
+            ),
+        },
+    )
+    await db.execute(
+        upsert,
+        [
+            {
+                "vault_id": vault_id,
+                "item_count": entry["item_count"],
+                "folder_count": entry["folder_count"],
+                "last_modified_at": entry["last_modified_at"],
+            }
+            for vault_id, entry in stats.items()
+        ],
+    )
+
+    type_rows = [
+        {"vault_id": vault_id, "secret_type": secret_type, "item_count": count}
+        for vault_id, entry in stats.items()
+        for secret_type, count in entry["type_breakdown"].items()
+    ]
+    if type_rows:
+        await db.execute(VaultTypeStats.__table__.insert(), type_rows)
+
+
+async def refresh_vault_stats(db: AsyncSession, vault_ids: list[uuid.UUID]) -> None:
+    await store_vault_stats(db, await compute_vault_stats(db, vault_ids))
+
+
+async def record_secret_change(
+    db: AsyncSession,
+    vault_id: uuid.UUID,
+    secret_type: SecretType | None = None,
+    delta: int = 0,
+) -> None:
+    """Adjust ``vault_id``'s stats after a secret write (``delta`` 0 just touches it)."""
+    await _apply_stats_delta(db, vault_id, items=delta, secret_type=secret_type)
+
+
+async def record_folder_change(db: AsyncSession, vault_id: uuid.UUID, delta: int) -> None:
+    await _apply_stats_delta(db, vault_id, folders=delta)
+
+
+async def _apply_stats_delta(
+    db: AsyncSession,
+    vault_id: uuid.UUID,
+    *,
+    items: int = 0,
+    folders: int = 0,
+    secret_type: SecretType | None = None,
+) -> None:
     result = await db.execute(
-        select(func.count())
-        .select_from(Folder)
-        .where(Folder.vault_id == vault_id)
+        update(VaultStats)
+        .where(VaultStats.vault_id == vault_id)
+        .values(
+            item_count=VaultStats.item_count + items,
+            folder_count=VaultStats.folder_count + folders,
+            last_modified_at=datetime.now(UTC),
+        ),
+        execution_options={"synchronize_session": False},
     )
-    return result.scalar() or 0
+    if result.rowcount == 0:
+        # No stats row yet: rebuild it from the rows already flushed, which
+        # include this change.
+        await refresh_vault_stats(db, [vault_id])
+        return
+
+    if items and secret_type is not None:
+        table = VaultTypeStats.__table__
+        upsert = dialect_insert(db, table).values(
+            vault_id=vault_id, secret_type=secret_type.value, item_count=items
+        )
+        await db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[table.c.vault_id, table.c.secret_type],
+                set_={"item_count": table.c.item_count + upsert.excluded.item_count},
+            )
+        )
@@ -1,40 +1,117 @@
 """Cleanup tasks for purging soft-deleted secrets after retention period."""
 
+import asyncio
+import logging
+import time
+from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import async_session_factory
-from app.models.secret import Secret
+from app.models.secret import Secret, SecretVersion
+from app.models.sharing import SecretShare
+from app.models.tag import SecretTag
+
+logger = logging.getLogger(__name__)
 
 RETENTION_DAYS = 30
 
+# Child tables deleted explicitly, set-based, before their secrets: SQLite
+# does not enforce ON DELETE CASCADE unless foreign_keys is on, and on
+# PostgreSQL one DELETE per table beats a cascade trigger per secret.
+_DEPENDENTS = (SecretVersion, SecretShare, SecretTag)
 
-async def purge_deleted_secrets() -> int:
-    """Hard-delete secrets where deleted_at > 30 days ago.
 
-    Returns the number of secrets permanently removed.
+def _log_progress(progress: dict) -> None:
+    logger.info(
+        "Purged %(secrets)d secrets in %(chunks)d chunks (%(versions)d versions, "
+        "%(shares)d shares, %(tags)d tag links; %(rate_per_second).0f secrets/s)",
+        progress,
+    )
+
+
+async def purge_secrets(
+    db: AsyncSession,
+    *,
+    now: datetime | None = None,
+    batch_size: int | None = None,
+    pause_seconds: float | None = None,
+    on_progress: Callable[[dict], None] = _log_progress,
+) -> dict:
+    """Hard-delete secrets soft-deleted more than ``RETENTION_DAYS`` ago, in chunks.
+
+    Chunks are taken in ``(deleted_at, id)`` keyset order (the
+    ``deleted_at`` index) and each commits on its own, followed by a short
+    pause. Every delete re-checks that the secret is still in the trash,
+    so one restored mid-purge is left alone with its versions, shares and
+    tags. ``on_progress`` receives the running totals after each chunk.
     """
-    cutoff = datetime.now(UTC) - timedelta(days=RETENTION_DAYS)
+    cutoff = (now or datetime.now(UTC)) - timedelta(days=RETENTION_DAYS)
+    batch_size = batch_size or settings.SWEEP_BATCH_SIZE
+    if pause_seconds is None:
+        pause_seconds = settings.SWEEP_BATCH_PAUSE_SECONDS
 
-    async with async_session_factory() as session:
-        result = await session.execute(
-            select(Secret).where(
-                Secret.is_deleted == True,  # noqa: E712
-                Secret.deleted_at is not None,
-                Secret.deleted_at < cutoff,
-            )
+    purgeable = (
+        Secret.is_deleted == True,  # noqa: E712
+        Secret.deleted_at.is_not(None),
+        Secret.deleted_at < cutoff,
+    )
+    progress = {"chunks": 0, "secrets": 0, "versions": 0, "shares": 0, "tags": 0}
+    counters = dict(zip(_DEPENDENTS, ("versions", "shares", "tags"), strict=True))
+    start = time.perf_counter()
+    last_key = None
+
+    while True:
+        query = (
+            select(Secret.id, Secret.deleted_at)
+            .where(*purgeable)
+            .order_by(Secret.deleted_at, Secret.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
         )
-        expired = result.scalars().all()
-        count = len(expired)
-
-        if count > 0:
-            await session.execute(
-                delete(Secret).where(
-                    Secret.is_deleted == True,  # noqa: E712
-                    Secret.deleted_at < cutoff,
-                )
+        if last_key is not None:
+            query = query.where(tuple_(Secret.deleted_at, Secret.id) > last_key)
+        rows = (await db.execute(query)).all()
+        if not rows:
+            break
+        last_key = (rows[-1].deleted_at, rows[-1].id)
+        ids = [row.id for row in rows]
+
+        still_purgeable = select(Secret.id).where(Secret.id.in_(ids), *purgeable)
+        for model, counter in counters.items():
+            result = await db.execute(
+                delete(model).where(model.secret_id.in_(still_purgeable)),
+                execution_options={"synchronize_session": False},
             )
-            await session.commit()
+            progress[counter] += result.rowcount
+        result = await db.execute(
+            delete(Secret).where(Secret.id.in_(ids), *purgeable),
+            execution_options={"synchronize_session": False},
+        )
+        await db.commit()
+
+        progress["chunks"] += 1
+        progress["secrets"] += result.rowcount
+        elapsed = time.perf_counter() - start
+        progress["duration_ms"] = round(elapsed * 1000, 1)
+        progress["rate_per_second"] = progress["secrets"] / elapsed if elapsed else 0.0
+        on_progress(dict(progress))
+
+        if len(rows) < batch_size:
+            break
+        await asyncio.sleep(pause_seconds)
 
-        return count
+    progress["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return progress
+
+
+async def purge_deleted_secrets() -> int:
+    """Hard-delete secrets where deleted_at > 30 days ago.
+
+    Returns the number of secrets permanently removed.
+    """
+    async with async_session_factory() as session:
+        return (await purge_secrets(session))["secrets"]
@@ -1,5 +1,8 @@
+import asyncio
 import logging
 
+from app.core.database import async_session_factory, engine
+from app.services import digest_service, email_service
 from app.tasks import celery_app
 
 logger = logging.getLogger(__name__)
@@ -16,16 +19,36 @@ def _noop_task(name):
 _task = celery_app.task if celery_app else _noop_task
 
 
+def _deliver(*emails: tuple[str, str, str]) -> dict:
+    """Queue ``(to, subject, body)`` emails in the outbox and send what is due."""
+
+    async def run() -> dict:
+        try:
+            async with async_session_factory() as session:
+                for to_email, subject, body in emails:
+                    await email_service.queue_email(
+                        session, to_email, subject, body, background=False
+                    )
+                await session.commit()
+                return await email_service.deliver_pending(session)
+        finally:
+            # Pooled SMTP and database connections are bound to this call's loop.
+            await email_service.close_smtp_pool()
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
 @_task(name="send_email_notification")
 def send_email_notification(to_email: str, subject: str, body: str) -> dict:
     logger.info("Sending email to %s: %s", to_email, subject)
-    return {"status": "sent", "to": to_email, "subject": subject}
+    return _deliver((to_email, subject, body))
 
 
 @_task(name="send_new_device_alert")
 def send_new_device_alert(user_email: str, device_info: str, ip_address: str) -> dict:
     logger.info("New device alert for %s from %s (%s)", user_email, ip_address, device_info)
-    return {"status": "sent", "to": user_email}
+    return _deliver(email_service.new_device_alert(user_email, device_info, ip_address))
 
 
 @_task(name="send_share_notification")
@@ -38,4 +61,27 @@ def send_share_notification(
         sharer_name,
         secret_type,
     )
-    return {"status": "sent", "to": recipient_email}
+    return _deliver(email_service.share_notification(recipient_email, sharer_name, secret_type))
+
+
+@_task(name="flush_notification_digests")
+def flush_notification_digests() -> dict:
+    """Periodic task writing the notification digests whose window has ended."""
+
+    async def run() -> dict:
+        try:
+            async with async_session_factory() as session:
+                result = await digest_service.flush_due(session, background_email=False)
+                result["email"] = await email_service.deliver_pending(session)
+                return result
+        finally:
+            await email_service.close_smtp_pool()
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+@_task(name="deliver_email_outbox")
+def deliver_email_outbox() -> dict:
+    """Periodic task sending retries and mail a restart left in the outbox."""
+    return _deliver()
@@ -1,6 +1,16 @@
+import asyncio
+import functools
 import logging
+import uuid
 
+from app.core.database import async_session_factory, engine
+from app.services import notification_service, rotation_service
 from app.tasks import celery_app
+from app.tasks.sweepers import (
+    sweep_expired_sessions,
+    sweep_expired_shares,
+    sweep_notifications,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,22 +26,58 @@ def _noop_task(name):
 _task = celery_app.task if celery_app else _noop_task
 
 
+def _run_with_session(sweep) -> dict:
+    async def run() -> dict:
+        try:
+            async with async_session_factory() as session:
+                return await sweep(session)
+        finally:
+            # Pooled connections are bound to this call's event loop.
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
 @_task(name="check_password_rotation")
-def check_password_rotation() -> dict:
+def check_password_rotation(resume_from: list[str | None] | None = None) -> dict:
     """Periodic task to check for passwords that need rotation."""
     logger.info("Checking for passwords due for rotation")
-    return {"status": "completed", "checked": 0, "reminders_sent": 0}
+    cursor = None
+    if resume_from:
+        org_id, vault_id = resume_from
+        cursor = (uuid.UUID(org_id), uuid.UUID(vault_id) if vault_id else None)
+    result = _run_with_session(
+        functools.partial(rotation_service.send_rotation_reminders, resume_from=cursor)
+    )
+    if result["resume_from"]:
+        # Out of time budget: continue from the cursor in a new task.
+        check_password_rotation.delay(resume_from=result["resume_from"])
+    return result
 
 
 @_task(name="cleanup_expired_shares")
 def cleanup_expired_shares() -> dict:
     """Periodic task to clean up expired share tokens."""
     logger.info("Cleaning up expired shares")
-    return {"status": "completed", "cleaned": 0}
+    return _run_with_session(sweep_expired_shares)
 
 
 @_task(name="cleanup_expired_sessions")
 def cleanup_expired_sessions() -> dict:
     """Periodic task to clean up expired sessions."""
     logger.info("Cleaning up expired sessions")
-    return {"status": "completed", "cleaned": 0}
+    return _run_with_session(sweep_expired_sessions)
+
+
+@_task(name="cleanup_notifications")
+def cleanup_notifications() -> dict:
+    """Periodic task to apply notification retention."""
+    logger.info("Cleaning up old notifications")
+    return _run_with_session(sweep_notifications)
+
+
+@_task(name="reconcile_notification_counters")
+def reconcile_notification_counters() -> dict:
+    """Periodic task to repair drift in the unread notification counters."""
+    logger.info("Reconciling unread notification counters")
+    return _run_with_session(notification_service.reconcile_unread_counts)
@@ -0,0 +1,311 @@
+"""Sweepers for expired share links/shares, login sessions and old notifications.
+
+Each sweep works through the rows in ``expires_at`` order, one bounded
+batch per transaction: a batch is ``DELETE``/``UPDATE ... WHERE id IN
+(SELECT id ... ORDER BY expires_at LIMIT n)``, served by the
+``expires_at`` indexes. It commits and pauses between batches, so locks
+(and, on SQLite, the writer gate) are held only briefly and request
+traffic keeps flowing during a large backlog.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import Executable, delete, func, select, text, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.notification import Notification, NotificationDedupeKey
+from app.models.sharing import SecretShare
+from app.models.user import Session
+from app.services import notification_service
+
+logger = logging.getLogger(__name__)
+
+
+async def _in_batches(
+    db: AsyncSession,
+    batch: Callable[[int], Executable],
+    batch_size: int | None,
+    pause_seconds: float | None,
+) -> tuple[int, int]:
+    """Run ``batch(batch_size)`` until it affects fewer rows; ``(rows, batches)``."""
+    batch_size = batch_size or settings.SWEEP_BATCH_SIZE
+    if pause_seconds is None:
+        pause_seconds = settings.SWEEP_BATCH_PAUSE_SECONDS
+    rows = batches = 0
+    while True:
+        result = await db.execute(
+            batch(batch_size), execution_options={"synchronize_session": False}
+        )
+        await db.commit()
+        rows += result.rowcount
+        batches += 1
+        if result.rowcount < batch_size:
+            return rows, batches
+        await asyncio.sleep(pause_seconds)
+
+
+async def sweep_expired_shares(
+    db: AsyncSession,
+    *,
+    now: datetime | None = None,
+    batch_size: int | None = None,
+    pause_seconds: float | None = None,
+) -> dict:
+    """Delete shares and share links that expired more than the retention window ago.
+
+    Recently expired links are kept so visitors get "expired" rather than
+    "not found".
+    """
+    start = time.perf_counter()
+    cutoff = (now or datetime.now(UTC)) - timedelta(hours=settings.EXPIRED_SHARE_RETENTION_HOURS)
+
+    def batch(limit: int) -> Executable:
+        ids = (
+            select(SecretShare.id)
+            .where(SecretShare.expires_at < cutoff)
+            .order_by(SecretShare.expires_at)
+            .limit(limit)
+        )
+        return delete(SecretShare).where(SecretShare.id.in_(ids))
+
+    deleted, batches = await _in_batches(db, batch, batch_size, pause_seconds)
+    duration_ms = round((time.perf_counter() - start) * 1000, 1)
+    logger.info("Deleted %d expired shares in %d batches (%.1f ms)", deleted, batches, duration_ms)
+    return {
+        "status": "completed",
+        "cleaned": deleted,
+        "batches": batches,
+        "duration_ms": duration_ms,
+    }
+
+
+async def sweep_expired_sessions(
+    db: AsyncSession,
+    *,
+    now: datetime | None = None,
+    batch_size: int | None = None,
+    pause_seconds: float | None = None,
+) -> dict:
+    """Deactivate expired sessions; delete them once past the retention window.
+
+    Deactivated sessions stay listed under the user's devices until they
+    are deleted.
+    """
+    start = time.perf_counter()
+    now = now or datetime.now(UTC)
+    cutoff = now - timedelta(days=settings.EXPIRED_SESSION_RETENTION_DAYS)
+
+    def deactivate(limit: int) -> Executable:
+        ids = (
+            select(Session.id)
+            .where(Session.is_active == True, Session.expires_at < now)  # noqa: E712
+            .order_by(Session.expires_at)
+            .limit(limit)
+        )
+        return update(Session).where(Session.id.in_(ids)).values(is_active=False)
+
+    def purge(limit: int) -> Executable:
+        ids = (
+            select(Session.id)
+            .where(Session.expires_at < cutoff)
+            .order_by(Session.expires_at)
+            .limit(limit)
+        )
+        return delete(Session).where(Session.id.in_(ids))
+
+    deactivated, deactivate_batches = await _in_batches(db, deactivate, batch_size, pause_seconds)
+    deleted, purge_batches = await _in_batches(db, purge, batch_size, pause_seconds)
+    duration_ms = round((time.perf_counter() - start) * 1000, 1)
+    logger.info(
+        "Deactivated %d and deleted %d expired sessions (%.1f ms)",
+        deactivated,
+        deleted,
+        duration_ms,
+    )
+    return {
+        "status": "completed",
+        "cleaned": deleted,
+        "deactivated": deactivated,
+        "batches": deactivate_batches + purge_batches,
+        "duration_ms": duration_ms,
+    }
+
+
+async def _notification_table_stats(db: AsyncSession) -> tuple[int | None, int | None]:
+    """On PostgreSQL, the planner's row estimate and on-disk bytes (table plus
+    indexes), both read from the catalog rather than by scanning the table."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None, None
+    row = (
+        await db.execute(
+            text(
+                "SELECT reltuples::bigint, pg_total_relation_size(oid) FROM pg_class "
+                "WHERE oid = 'notifications'::regclass"
+            )
+        )
+    ).one()
+    return max(row[0], 0), row[1]
+
+
+async def sweep_notifications(
+    db: AsyncSession,
+    *,
+    now: datetime | None = None,
+    batch_size: int | None = None,
+    pause_seconds: float | None = None,
+) -> dict:
+    """Apply the notification retention settings.
+
+    Read notifications expire by type (``NOTIFICATION_TYPE_RETENTION_DAYS``,
+    else ``NOTIFICATION_READ_RETENTION_DAYS``) and beyond each user's newest
+    ``NOTIFICATION_MAX_READ_PER_USER``; unread ones only after
+    ``NOTIFICATION_UNREAD_RETENTION_DAYS``, with their unread counters
+    adjusted in the same transaction. Dedupe keys, which keep deleted
+    generated notifications from coming back, go after
+    ``NOTIFICATION_DEDUPE_RETENTION_DAYS``.
+    """
+    start = time.perf_counter()
+    now = now or datetime.now(UTC)
+    batch_size = batch_size or settings.SWEEP_BATCH_SIZE
+    if pause_seconds is None:
+        pause_seconds = settings.SWEEP_BATCH_PAUSE_SECONDS
+    batches = 0
+
+    def expired(*conditions) -> Callable[[int], Executable]:
+        def batch(limit: int) -> Executable:
+            ids = (
+                select(Notification.id)
+                .where(*conditions)
+                .order_by(Notification.created_at)
+                .limit(limit)
+            )
+            return delete(Notification).where(Notification.id.in_(ids))
+
+        return batch
+
+    # --- Read, by type ---
+    is_read = Notification.read == True  # noqa: E712
+    type_days = settings.NOTIFICATION_TYPE_RETENTION_DAYS
+    retention = [(Notification.type == type_, days) for type_, days in type_days.items()]
+    retention.append(
+        (Notification.type.not_in(type_days), settings.NOTIFICATION_READ_RETENTION_DAYS)
+    )
+    read_expired = 0
+    for of_type, days in retention:
+        cutoff = now - timedelta(days=days)
+        deleted, n = await _in_batches(
+            db,
+            expired(is_read, of_type, Notification.created_at < cutoff),
+            batch_size,
+            pause_seconds,
+        )
+        read_expired += deleted
+        batches += n
+
+    # --- Read, beyond the per-user limit ---
+    over_limit = 0
+    keep = settings.NOTIFICATION_MAX_READ_PER_USER
+    heavy_users = (
+        await db.scalars(
+            select(Notification.user_id)
+            .where(is_read)
+            .group_by(Notification.user_id)
+            .having(func.count() > keep)
+        )
+    ).all()
+    for user_id in heavy_users:
+        # The oldest read notification the user keeps; everything older goes.
+        boundary = (
+            await db.execute(
+                select(Notification.created_at, Notification.id)
+                .where(Notification.user_id == user_id, is_read)
+                .order_by(Notification.created_at.desc(), Notification.id.desc())
+                .offset(keep - 1)
+                .limit(1)
+            )
+        ).one()
+        deleted, n = await _in_batches(
+            db,
+            expired(
+                Notification.user_id == user_id,
+                is_read,
+                tuple_(Notification.created_at, Notification.id) < tuple(boundary),
+            ),
+            batch_size,
+            pause_seconds,
+        )
+        over_limit += deleted
+        batches += n
+
+    # --- Unread ---
+    unread_cutoff = now - timedelta(days=settings.NOTIFICATION_UNREAD_RETENTION_DAYS)
+    unread_expired = 0
+    while True:
+        ids = (
+            select(Notification.id)
+            .where(Notification.read == False, Notification.created_at < unread_cutoff)  # noqa: E712
+            .order_by(Notification.created_at)
+            .limit(batch_size)
+        )
+        result = await db.scalars(
+            delete(Notification)
+            .where(Notification.id.in_(ids))
+            .returning(Notification.user_id),
+            execution_options={"synchronize_session": False},
+        )
+        recipients = result.all()
+        await notification_service.subtract_unread(db, Counter(recipients))
+        await notification_service.publish_unread_counts(db, recipients)
+        await db.commit()
+        unread_expired += len(recipients)
+        batches += 1
+        if len(recipients) < batch_size:
+            break
+        await asyncio.sleep(pause_seconds)
+
+    # --- Dedupe keys (see NotificationDedupeKey) ---
+    key_cutoff = now - timedelta(days=settings.NOTIFICATION_DEDUPE_RETENTION_DAYS)
+
+    def old_keys(limit: int) -> Executable:
+        keys = (
+            select(NotificationDedupeKey.dedupe_key)
+            .where(NotificationDedupeKey.created_at < key_cutoff)
+            .order_by(NotificationDedupeKey.created_at)
+            .limit(limit)
+        )
+        return delete(NotificationDedupeKey).where(NotificationDedupeKey.dedupe_key.in_(keys))
+
+    dedupe_keys_expired, n = await _in_batches(db, old_keys, batch_size, pause_seconds)
+    batches += n
+
+    rows_estimate, table_bytes = await _notification_table_stats(db)
+    duration_ms = round((time.perf_counter() - start) * 1000, 1)
+    cleaned = read_expired + over_limit + unread_expired
+    logger.info(
+        "Deleted %d notifications (%d read expired, %d over the per-user limit, "
+        "%d unread expired); ~%s rows left (%.1f ms)",
+        cleaned,
+        read_expired,
+        over_limit,
+        unread_expired,
+        rows_estimate if rows_estimate is not None else "?",
+        duration_ms,
+    )
+    return {
+        "status": "completed",
+        "cleaned": cleaned,
+        "read_expired": read_expired,
+        "over_limit": over_limit,
+        "unread_expired": unread_expired,
+        "dedupe_keys_expired": dedupe_keys_expired,
+        "batches": batches,
+        "rows_estimate": rows_estimate,
+        "table_bytes": table_bytes,
+        "duration_ms": duration_ms,
+    }
@@ -0,0 +1,57 @@
+"""Consistency repair for the maintained vault statistics."""
+
+from sqlalchemy import delete, select
+
+from app.core.database import async_session_factory
+from app.models.vault import Vault, VaultStats, VaultTypeStats
+from app.services import vault_service
+
+BATCH_SIZE = 500
+
+
+def _counts(entry: dict | None) -> tuple | None:
+    if entry is None:
+        return None
+    return entry["item_count"], entry["folder_count"], entry["type_breakdown"]
+
+
+async def repair_vault_stats(batch_size: int = BATCH_SIZE) -> int:
+    """Recompute vault stats in batches and rewrite rows that drifted or are missing.
+
+    Also drops stats rows left behind by deleted vaults. Returns the number
+    of vaults whose stats were rewritten.
+    """
+    repaired = 0
+    last_id = None
+
+    async with async_session_factory() as session:
+        while True:
+            query = select(Vault.id).order_by(Vault.id).limit(batch_size)
+            if last_id is not None:
+                query = query.where(Vault.id > last_id)
+            vault_ids = list((await session.execute(query)).scalars())
+            if not vault_ids:
+                break
+            last_id = vault_ids[-1]
+
+            actual = await vault_service.compute_vault_stats(session, vault_ids)
+            stored = await vault_service.get_vault_stats(
+                session, vault_ids, include_types=True, compute_missing=False
+            )
+            drifted = {
+                vault_id: entry
+                for vault_id, entry in actual.items()
+                if _counts(stored.get(vault_id)) != _counts(entry)
+            }
+            await vault_service.store_vault_stats(session, drifted)
+            await session.commit()
+            repaired += len(drifted)
+
+        live_vaults = select(Vault.id)
+        await session.execute(
+            delete(VaultTypeStats).where(VaultTypeStats.vault_id.not_in(live_vaults))
+        )
+        await session.execute(delete(VaultStats).where(VaultStats.vault_id.not_in(live_vaults)))
+        await session.commit()
+
+    return repaired
@@ -0,0 +1,83 @@
+"""Per-request CPU of the auth and vault-access lookups: inline select() vs hot queries.
+
+Each request runs the two statements behind ``deps.get_current_user`` and
+``secret_service._verify_vault_access`` (user by id, vault by id). Three
+variants are timed: a new ``select()`` per call (the previous code), a
+``lambda_stmt`` per call, and the prebuilt statements in
+``app.services.hot_queries``.
+
+A synchronous in-memory SQLite session is used so the numbers are the
+Python-side CPU (statement construction, cache-key generation, ORM loading)
+without the aiosqlite thread hand-off, which is noisy and identical for all
+variants.
+
+    python -m benchmarks.hot_queries [--requests 5000] [--repeat 3]
+"""
+
+import argparse
+import time
+
+from sqlalchemy import create_engine, lambda_stmt, select
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models.user import User
+from app.models.vault import Vault
+from app.services.hot_queries import USER_BY_ID, VAULT_BY_ID
+
+
+def select_per_call(db: Session, user_id, vault_id) -> None:
+    db.execute(select(User).where(User.id == user_id)).scalar_one()
+    db.execute(select(Vault).where(Vault.id == vault_id)).scalar_one()
+
+
+def lambda_per_call(db: Session, user_id, vault_id) -> None:
+    db.execute(lambda_stmt(lambda: select(User).where(User.id == user_id))).scalar_one()
+    db.execute(lambda_stmt(lambda: select(Vault).where(Vault.id == vault_id))).scalar_one()
+
+
+def prebuilt(db: Session, user_id, vault_id) -> None:
+    db.execute(USER_BY_ID, {"user_id": user_id}).scalar_one()
+    db.execute(VAULT_BY_ID, {"vault_id": vault_id}).scalar_one()
+
+
+def run(requests: int, repeat: int) -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as db:
+        user = User(
+            email="bench@example.com", name="bench", auth_key_hash="x", encrypted_vault_key="x"
+        )
+        db.add(user)
+        db.flush()
+        vault = Vault(owner_id=user.id, name_encrypted="vault")
+        db.add(vault)
+        db.commit()
+
+        variants = {"select": select_per_call, "lambda": lambda_per_call, "prebuilt": prebuilt}
+        best = dict.fromkeys(variants, float("inf"))
+        for _ in range(repeat):
+            for name, handler in variants.items():
+                for _ in range(100):  # warm-up: fill the compiled cache
+                    handler(db, user.id, vault.id)
+                start = time.process_time()
+                for _ in range(requests):
+                    handler(db, user.id, vault.id)
+                elapsed = (time.process_time() - start) / requests * 1e6
+                best[name] = min(best[name], elapsed)
+
+    print(f"{'variant':<10} {'cpu us/request':>15} {'vs select':>10}")
+    for name, cpu in best.items():
+        print(f"{name:<10} {cpu:>15.1f} {cpu / best['select'] - 1:>+10.0%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.requests, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""Listing serialization throughput: legacy route path vs precompiled serializers.
+
+Runs both paths through a real FastAPI app (in-process ASGI transport) so the
+legacy numbers include FastAPI's ``response_model`` validation and encoding.
+
+    python -m benchmarks.serialization [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import UTC, datetime
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.api.serializers import audit_log_serializer, secret_serializer, share_serializer
+from app.models.audit import AuditLog
+from app.models.secret import Secret, SecretType
+from app.models.sharing import SecretShare, SharePermission
+from app.schemas.admin import AuditLogResponse
+from app.schemas.secret import SecretListResponse, SecretResponse
+from app.schemas.sharing import ShareResponse
+
+
+def _secrets(n: int) -> list[Secret]:
+    now = datetime.now(UTC)
+    vault_id = uuid.uuid4()
+    return [
+        Secret(
+            id=uuid.uuid4(),
+            vault_id=vault_id,
+            folder_id=None,
+            type=SecretType.LOGIN,
+            name_encrypted="n" * 64,
+            data_encrypted="d" * 512,
+            encrypted_item_key="k" * 96,
+            metadata_encrypted=None,
+            favorite=False,
+            is_archived=False,
+            deleted_at=None,
+            access_count=3,
+            last_accessed_at=now,
+            created_at=now,
+            updated_at=now,
+        )
+        for _ in range(n)
+    ]
+
+
+def _shares(n: int) -> list[SecretShare]:
+    now = datetime.now(UTC)
+    return [
+        SecretShare(
+            id=uuid.uuid4(),
+            secret_id=uuid.uuid4(),
+            shared_by=uuid.uuid4(),
+            shared_with_user_id=uuid.uuid4(),
+            shared_with_team_id=None,
+            encrypted_item_key_for_recipient="k" * 96,
+            permission=SharePermission.READ,
+            expires_at=None,
+            created_at=now,
+        )
+        for _ in range(n)
+    ]
+
+
+def _audit_logs(n: int) -> list[AuditLog]:
+    now = datetime.now(UTC)
+    return [
+        AuditLog(
+            id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            action="secret.access",
+            resource_type="secret",
+            resource_id=str(uuid.uuid4()),
+            ip_address="10.0.0.1",
+            user_agent="bench",
+            metadata_json={"k": "v"},
+            created_at=now,
+        )
+        for _ in range(n)
+    ]
+
+
+def build_app(n: int) -> FastAPI:
+    secrets, shares, logs = _secrets(n), _shares(n), _audit_logs(n)
+    app = FastAPI()
+
+    @app.get("/legacy/secrets", response_model=SecretListResponse)
+    async def legacy_secrets():
+        return SecretListResponse(
+            secrets=[SecretResponse.model_validate(s) for s in secrets], total=n
+        )
+
+    @app.get("/fast/secrets", response_model=SecretListResponse)
+    async def fast_secrets():
+        return secret_serializer.envelope_response("secrets", secrets, total=n)
+
+    @app.get("/legacy/shares", response_model=list[ShareResponse])
+    async def legacy_shares():
+        return [ShareResponse.model_validate(s) for s in shares]
+
+    @app.get("/fast/shares", response_model=list[ShareResponse])
+    async def fast_shares():
+        return share_serializer.list_response(shares)
+
+    @app.get("/legacy/audit", response_model=dict)
+    async def legacy_audit():
+        return {"logs": [AuditLogResponse.model_validate(log) for log in logs], "total": n}
+
+    @app.get("/fast/audit", response_model=dict)
+    async def fast_audit():
+        return audit_log_serializer.envelope_response("logs", logs, total=n)
+
+    return app
+
+
+async def run(rows: int, repeat: int) -> None:
+    app = build_app(rows)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{'endpoint':<10} {'path':<7} {'rows/s':>12} {'ms/request':>11}")
+        for name in ("secrets", "shares", "audit"):
+            for path in ("legacy", "fast"):
+                url = f"/{path}/{name}"
+                await client.get(url)  # warm-up
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    response = await client.get(url)
+                    response.raise_for_status()
+                elapsed = (time.perf_counter() - start) / repeat
+                print(f"{name:<10} {path:<7} {rows / elapsed:>12,.0f} {elapsed * 1000:>11.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
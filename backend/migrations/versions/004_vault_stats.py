@@ -0,0 +1,59 @@
+"""Maintained per-vault statistics
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = '004'
+down_revision: str | None = '003'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'vault_stats',
+        sa.Column('vault_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('vaults.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('item_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('folder_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_modified_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_table(
+        'vault_type_stats',
+        sa.Column('vault_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('vaults.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('secret_type', sa.String(50), primary_key=True),
+        sa.Column('item_count', sa.Integer(), server_default='0', nullable=False),
+    )
+
+    # --- Backfill from existing secrets and folders ---
+    op.execute(
+        """
+        INSERT INTO vault_stats (vault_id, item_count, folder_count, last_modified_at)
+        SELECT v.id,
+               (SELECT count(*) FROM secrets s WHERE s.vault_id = v.id AND s.is_deleted = false),
+               (SELECT count(*) FROM folders f WHERE f.vault_id = v.id),
+               (SELECT max(s.updated_at) FROM secrets s WHERE s.vault_id = v.id)
+        FROM vaults v
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO vault_type_stats (vault_id, secret_type, item_count)
+        SELECT vault_id, lower(CAST(type AS VARCHAR)), count(*)
+        FROM secrets
+        WHERE is_deleted = false
+        GROUP BY vault_id, lower(CAST(type AS VARCHAR))
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('vault_type_stats')
+    op.drop_table('vault_stats')
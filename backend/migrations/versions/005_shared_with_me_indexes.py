@@ -0,0 +1,35 @@
+"""Indexes for shared-with-me (direct and team shares, keyset paging)
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = '005'
+down_revision: str | None = '004'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_secret_shares_user_expires_created',
+        'secret_shares',
+        ['shared_with_user_id', 'expires_at', 'created_at'],
+    )
+    op.create_index(
+        'ix_secret_shares_team_expires_created',
+        'secret_shares',
+        ['shared_with_team_id', 'expires_at', 'created_at'],
+    )
+    op.create_index('ix_team_memberships_user_team', 'team_memberships', ['user_id', 'team_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_team_memberships_user_team', 'team_memberships')
+    op.drop_index('ix_secret_shares_team_expires_created', 'secret_shares')
+    op.drop_index('ix_secret_shares_user_expires_created', 'secret_shares')
@@ -0,0 +1,27 @@
+"""Indexes for the expired share and session sweepers
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = '006'
+down_revision: str | None = '005'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_secret_shares_expires_at', 'secret_shares', ['expires_at'])
+    op.create_index('ix_sessions_active_expires', 'sessions', ['is_active', 'expires_at'])
+    op.create_index('ix_sessions_expires_at', 'sessions', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sessions_expires_at', 'sessions')
+    op.drop_index('ix_sessions_active_expires', 'sessions')
+    op.drop_index('ix_secret_shares_expires_at', 'secret_shares')
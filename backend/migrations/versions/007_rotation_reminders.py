@@ -0,0 +1,28 @@
+"""Rotation reminders: notification dedupe key and secret age index
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '007'
+down_revision: str | None = '006'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column('notifications', sa.Column('dedupe_key', sa.String(255), nullable=True))
+    op.create_unique_constraint('uq_notifications_dedupe_key', 'notifications', ['dedupe_key'])
+    op.create_index('ix_secrets_vault_updated', 'secrets', ['vault_id', 'updated_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_secrets_vault_updated', 'secrets')
+    op.drop_constraint('uq_notifications_dedupe_key', 'notifications', type_='unique')
+    op.drop_column('notifications', 'dedupe_key')
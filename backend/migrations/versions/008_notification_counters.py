@@ -0,0 +1,40 @@
+"""Maintained per-user unread notification counts
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = '008'
+down_revision: str | None = '007'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_counters',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False),
+    )
+
+    # --- Backfill from existing notifications ---
+    op.execute(
+        """
+        INSERT INTO notification_counters (user_id, unread_count)
+        SELECT user_id, count(*)
+        FROM notifications
+        WHERE read = false
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('notification_counters')
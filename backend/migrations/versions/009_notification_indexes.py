@@ -0,0 +1,34 @@
+"""Indexes for keyset-paginated notification listing
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '009'
+down_revision: str | None = '008'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_notifications_user_created', 'notifications', ['user_id', 'created_at', 'id']
+    )
+    op.create_index(
+        'ix_notifications_user_unread_created',
+        'notifications',
+        ['user_id', 'created_at', 'id'],
+        postgresql_where=sa.text('read = false'),
+        sqlite_where=sa.text('read = false'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notifications_user_unread_created', 'notifications')
+    op.drop_index('ix_notifications_user_created', 'notifications')
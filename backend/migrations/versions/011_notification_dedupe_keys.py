@@ -0,0 +1,42 @@
+"""Notification dedupe keys that outlive swept notifications
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = '011'
+down_revision: str | None = '010'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_dedupe_keys',
+        sa.Column('dedupe_key', sa.String(255), primary_key=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index('ix_notification_dedupe_keys_created_at', 'notification_dedupe_keys', ['created_at'])
+
+    # --- Backfill from existing notifications ---
+    op.execute(
+        """
+        INSERT INTO notification_dedupe_keys (dedupe_key, user_id, created_at)
+        SELECT dedupe_key, user_id, created_at
+        FROM notifications
+        WHERE dedupe_key IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notification_dedupe_keys_created_at', 'notification_dedupe_keys')
+    op.drop_table('notification_dedupe_keys')
@@ -0,0 +1,24 @@
+"""Email outbox claim token, so a stale sender cannot record outcomes
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = '012'
+down_revision: str | None = '011'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column('email_outbox', sa.Column('claim_token', sa.String(32), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('email_outbox', 'claim_token')
@@ -0,0 +1,40 @@
+"""Pending notification digest events, so they survive restarts
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = '013'
+down_revision: str | None = '012'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_digest_events',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('type', sa.String(50), nullable=False),
+        sa.Column('title', sa.String(255), nullable=False),
+        sa.Column('message', sa.Text(), nullable=False),
+        sa.Column('metadata_json', sa.JSON(), nullable=True),
+        sa.Column('email', sa.Boolean(), server_default=sa.false(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('due_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index('ix_notification_digest_events_user_type', 'notification_digest_events', ['user_id', 'type', 'due_at'])
+    op.create_index('ix_notification_digest_events_due_at', 'notification_digest_events', ['due_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notification_digest_events_due_at', 'notification_digest_events')
+    op.drop_index('ix_notification_digest_events_user_type', 'notification_digest_events')
+    op.drop_table('notification_digest_events')
@@ -1,8 +1,11 @@
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
+from app.core.database import Base
 from app.main import app
+from app.models.user import User
 
 
 @pytest.fixture
@@ -15,3 +18,26 @@ async def client():
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as c:
         yield c
+
+
+@pytest_asyncio.fixture
+async def db():
+    """A session on a fresh in-memory database with every table created."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def make_user():
+    """Build (but do not add) a ``User`` named ``name`` with placeholder keys."""
+
+    def make(name: str) -> User:
+        return User(
+            email=f"{name}@example.com", name=name, auth_key_hash="x", encrypted_vault_key="x"
+        )
+
+    return make
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.core.http import (
+    CircuitBreaker,
+    SingleFlight,
+    TTLCache,
+    UpstreamError,
+    close_http_client,
+)
+from app.services import breach_service
+
+RANGE = "0018A45C4D1DEF81644B54AB7F969B88D65:10\r\n00D4F6E8FA6EECAD2A3AA415EEC418D38EC:0\r\n"
+
+
+class StubRangeServer:
+    """Minimal local HIBP stand-in: HTTP/1.1 keep-alive, optional delay and status."""
+
+    def __init__(self, status: int = 200, delay: float = 0.0):
+        self.status = status
+        self.delay = delay
+        self.requests: list[str] = []
+        self.connections = 0
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._session, "127.0.0.1", 0)
+        self.url = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/range"
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _session(self, reader, writer):
+        self.connections += 1
+        while request_line := (await reader.readline()).decode().strip():
+            while (await reader.readline()).strip():  # headers
+                pass
+            self.requests.append(request_line.split(" ")[1])
+            await asyncio.sleep(self.delay)
+            body = RANGE.encode() if self.status == 200 else b"error"
+            writer.write(
+                f"HTTP/1.1 {self.status} X\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        writer.close()
+
+
+@pytest.fixture
+async def hibp(monkeypatch):
+    monkeypatch.setattr(breach_service, "cache", TTLCache(10, 60))
+    monkeypatch.setattr(breach_service, "breaker", CircuitBreaker(2, 60))
+    monkeypatch.setattr(breach_service, "_in_flight", SingleFlight())
+    monkeypatch.setattr(settings, "HIBP_TIMEOUT_SECONDS", 2.0)
+
+    servers = []
+
+    async def serve(**kwargs):
+        server = await StubRangeServer(**kwargs).__aenter__()
+        servers.append(server)
+        monkeypatch.setattr(settings, "HIBP_RANGE_URL", server.url)
+        return server
+
+    yield serve
+    await close_http_client()
+    for server in servers:
+        await server.__aexit__()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_fetch_and_are_cached(hibp):
+    server = await hibp(delay=0.1)
+    texts = await asyncio.gather(*(breach_service.get_range("0018a") for _ in range(20)))
+    assert set(texts) == {RANGE}
+    await breach_service.get_range("0018A")
+    await breach_service.get_range("FFFFF")
+    assert server.requests == ["/range/0018A", "/range/FFFFF"]
+    assert server.connections == 1  # kept alive between fetches
+    assert breach_service.range_counts(RANGE) == (True, 10)
+
+
+@pytest.mark.asyncio
+async def test_failures_open_the_breaker_and_slow_upstream_hits_the_budget(hibp, monkeypatch):
+    server = await hibp(status=503)
+    for prefix in ("AAAAA", "BBBBB", "CCCCC"):
+        with pytest.raises(UpstreamError):
+            await breach_service.get_range(prefix)
+    assert len(server.requests) == 2  # the third call failed fast
+    assert breach_service.breaker.state == "open"
+
+    await hibp(delay=1.0)
+    monkeypatch.setattr(breach_service, "breaker", CircuitBreaker(2, 60))
+    monkeypatch.setattr(settings, "HIBP_TIMEOUT_SECONDS", 0.1)
+    with pytest.raises(UpstreamError, match="timed out"):
+        await breach_service.get_range("DDDDD")
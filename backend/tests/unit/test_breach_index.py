@@ -0,0 +1,75 @@
+import hashlib
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core import lifecycle
+from app.core.config import settings
+from app.main import app
+from app.services import breach_service
+from app.services.breach_index import BreachIndex, BreachIndexError, build
+
+
+def _sha1(password: str) -> str:
+    return hashlib.sha1(password.encode()).hexdigest().upper()  # noqa: S324
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    hashes = sorted({_sha1(f"password{i}") for i in range(2000)} | {_sha1("hunter2")})
+    dump = [f"{sha1}:{i + 1}\r\n" for i, sha1 in enumerate(hashes)]
+    path = tmp_path / "breach.idx"
+    assert build(dump, path) == len(hashes)
+    return path, dict(line.strip().split(":") for line in dump)
+
+
+def test_ranges_match_the_dump(index_path):
+    path, dump = index_path
+    index = BreachIndex(path)
+    try:
+        for prefix in {sha1[:5] for sha1 in dump} | {"00000", "FFFFF"}:
+            expected = {s[5:]: int(c) for s, c in dump.items() if s.startswith(prefix)}
+            assert dict(index.range(prefix)) == expected
+        with pytest.raises(BreachIndexError):
+            list(index.range("0x123"))
+    finally:
+        index.close()
+
+
+def test_build_rejects_unsorted_dumps_and_leaves_no_file(tmp_path):
+    with pytest.raises(BreachIndexError, match="line 2"):
+        build([f"{'B' * 40}:1", f"{'A' * 40}:1"], tmp_path / "breach.idx")
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_check_breach_answers_offline(index_path, monkeypatch):
+    path, dump = index_path
+    monkeypatch.setattr(settings, "HIBP_INDEX_PATH", str(path))
+    monkeypatch.setattr(settings, "HIBP_RANGE_URL", "http://127.0.0.1:9/unreachable")
+    monkeypatch.setattr(breach_service, "_local", None)
+    prefix = _sha1("hunter2")[:5]
+    expected = sum(int(c) for s, c in dump.items() if s.startswith(prefix))
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/tools/check-breach", json={"password_hash_prefix": prefix.lower()}
+        )
+    breach_service.local_index().close()
+    assert response.json() == {"found": True, "count": expected}
+
+
+@pytest.mark.asyncio
+async def test_a_missing_or_truncated_index_fails_startup(tmp_path, monkeypatch):
+    assert breach_service.open_local_index in lifecycle._startup_hooks
+    monkeypatch.setattr(breach_service, "_local", None)
+    monkeypatch.setattr(settings, "HIBP_INDEX_PATH", str(tmp_path / "missing.idx"))
+    with pytest.raises(FileNotFoundError):
+        await breach_service.open_local_index()
+
+    truncated = tmp_path / "truncated.idx"
+    build([f"{'A' * 40}:1"], truncated)
+    truncated.write_bytes(truncated.read_bytes()[:-1])
+    monkeypatch.setattr(settings, "HIBP_INDEX_PATH", str(truncated))
+    with pytest.raises(BreachIndexError):
+        await breach_service.open_local_index()
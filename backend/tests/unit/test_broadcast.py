@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy import func, select
+
+from app.core.pubsub import hub
+from app.models.notification import Notification
+from app.models.organization import Organization, OrgMembership
+from app.services import notification_service
+
+
+@pytest.mark.asyncio
+async def test_org_broadcast_reaches_every_member_but_the_actor(db, make_user):
+    org, other_org = Organization(name="org"), Organization(name="other")
+    users = [
+        make_user(f"u{i}")
+        for i in range(4)
+    ]
+    db.add_all([org, other_org, *users])
+    await db.flush()
+    admin, *members = users
+    db.add_all([OrgMembership(user_id=u.id, org_id=org.id) for u in (admin, *members[:2])])
+    db.add(OrgMembership(user_id=members[2].id, org_id=other_org.id))
+    await notification_service.create_notification(db, members[0].id, "info", "t", "m")
+    await db.flush()
+
+    async with hub.subscribe(members[1].id) as queue:
+        sent = await notification_service.broadcast_to_org(
+            db, org.id, "policy_change", "Policy", "Changed", {"policy": "password"},
+            exclude_user_id=admin.id,
+        )
+        await db.commit()
+        event = queue.get_nowait()
+
+    assert sent == 2
+    assert event["type"] == "broadcast" and event["notification"]["title"] == "Policy"
+    recipients = await db.scalars(
+        select(Notification.user_id).where(Notification.type == "policy_change")
+    )
+    assert set(recipients) == {members[0].id, members[1].id}
+    assert await notification_service.get_unread_count(db, members[0].id) == 2
+    assert await notification_service.get_unread_count(db, members[1].id) == 1
+    assert await notification_service.get_unread_count(db, admin.id) == 0
+    stored = await db.scalar(
+        select(func.count()).select_from(Notification).where(
+            Notification.metadata_json.is_not(None), Notification.type == "policy_change"
+        )
+    )
+    assert stored == 2
@@ -0,0 +1,88 @@
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.core.exceptions import AuthorizationError, NotFoundError
+from app.models.sharing import SecretShare
+from app.services import secret_service, sharing_service, vault_service
+
+
+async def _secrets(db, owner, count):
+    vault = await vault_service.create_vault(db, owner.id, "v")
+    return [
+        await secret_service.create_secret(
+            db, vault.id, owner.id, secret_type="password",
+            name_encrypted="n", data_encrypted="d", encrypted_item_key="k",
+        )
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_share_then_rewrap(db, make_user):
+    owner, mate = make_user("owner"), make_user("mate")
+    db.add_all([owner, mate])
+    await db.flush()
+    secrets = await _secrets(db, owner, 3)
+
+    shares = await sharing_service.bulk_share_secrets(
+        db,
+        owner.id,
+        [
+            {"secret_id": s.id, "shared_with_user_id": mate.id,
+             "encrypted_item_key_for_recipient": "old"}
+            for s in secrets[:2]
+        ],
+    )
+    assert {s.secret_id for s in shares} == {secrets[0].id, secrets[1].id}
+
+    updated, created = await sharing_service.upsert_share_keys(
+        db,
+        owner.id,
+        [
+            {"secret_id": s.id, "shared_with_user_id": mate.id,
+             "encrypted_item_key_for_recipient": "new"}
+            for s in [*secrets, secrets[2]]  # a repeated new share is created once
+        ],
+    )
+    assert updated == 2
+    assert [share.secret_id for share in created] == [secrets[2].id]
+    keys = (await db.execute(select(SecretShare.encrypted_item_key_for_recipient))).scalars()
+    assert sorted(keys) == ["new", "new", "new"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_share_rejects_a_foreign_secret(db, make_user):
+    owner, other = make_user("owner"), make_user("other")
+    db.add_all([owner, other])
+    await db.flush()
+    mine, theirs = (await _secrets(db, owner, 1))[0], (await _secrets(db, other, 1))[0]
+
+    with pytest.raises(AuthorizationError):
+        await sharing_service.bulk_share_secrets(
+            db,
+            owner.id,
+            [
+                {"secret_id": s.id, "shared_with_user_id": other.id,
+                 "encrypted_item_key_for_recipient": "k"}
+                for s in (mine, theirs)
+            ],
+        )
+    assert (await db.execute(select(SecretShare))).first() is None
+
+
+@pytest.mark.asyncio
+async def test_unknown_recipient_is_not_found(db, make_user):
+    owner = make_user("owner")
+    db.add(owner)
+    await db.flush()
+    secret = (await _secrets(db, owner, 1))[0]
+
+    with pytest.raises(NotFoundError):
+        await sharing_service.upsert_share_keys(
+            db,
+            owner.id,
+            [{"secret_id": secret.id, "shared_with_user_id": uuid.uuid4(),
+              "encrypted_item_key_for_recipient": "k"}],
+        )
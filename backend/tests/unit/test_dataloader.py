@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from app.core.dataloader import DataLoader
+
+
+def _loader(calls: list, fail: bool = False) -> DataLoader:
+    async def batch_load(keys):
+        calls.append(list(keys))
+        if fail:
+            raise RuntimeError("boom")
+        return {key: key * 10 for key in keys if key != 0}
+
+    return DataLoader(batch_load)
+
+
+@pytest.mark.asyncio
+async def test_loads_in_same_tick_are_batched():
+    calls: list = []
+    loader = _loader(calls)
+    results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1), loader.load(0))
+    assert results == [10, 20, 10, None]
+    assert calls == [[1, 2, 0]]
+
+
+@pytest.mark.asyncio
+async def test_results_are_memoized():
+    calls: list = []
+    loader = _loader(calls)
+    assert await loader.load_many([1, 2]) == [10, 20]
+    assert await loader.load(2) == 20
+    assert await loader.load_many([2, 3]) == [20, 30]
+    assert calls == [[1, 2], [3]]
+
+
+@pytest.mark.asyncio
+async def test_failures_are_not_memoized():
+    calls: list = []
+    loader = _loader(calls, fail=True)
+    with pytest.raises(RuntimeError):
+        await loader.load(1)
+    with pytest.raises(RuntimeError):
+        await loader.load(1)
+    assert calls == [[1], [1]]
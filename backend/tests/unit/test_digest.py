@@ -0,0 +1,82 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.email import EmailOutbox
+from app.models.notification import Notification, NotificationDigestEvent
+from app.services import digest_service, notification_service
+
+
+@pytest.fixture(autouse=True)
+def window(monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_DIGEST_WINDOW_SECONDS", 60.0)
+    monkeypatch.setattr(settings, "NOTIFICATION_DIGEST_WINDOWS", {})
+
+
+async def _pending(db):
+    return await db.scalar(select(func.count()).select_from(NotificationDigestEvent))
+
+
+@pytest.mark.asyncio
+async def test_burst_becomes_one_notification_and_one_email(db, make_user):
+    user, quiet = make_user("u"), make_user("quiet")
+    quiet.email_notifications = False
+    db.add_all([user, quiet])
+    await db.commit()
+    for i in range(50):
+        digest_service.notify(db, user.id, "share", f"item {i}", "m", {"i": i}, email=True)
+    digest_service.notify(db, quiet.id, "share", "only one", "m", email=True)
+    await db.commit()
+    digest_service.notify(db, user.id, "share", "rolled back", "m", email=True)
+    await db.rollback()
+
+    # Pending events are rows: whichever process flushes them, none are lost.
+    assert await _pending(db) == 51
+    now = datetime.now(UTC)
+    assert (await digest_service.flush_due(db, now=now))["digests"] == 0
+    result = await digest_service.flush_due(db, now=now + timedelta(seconds=61))
+
+    assert (result["digests"], result["events"]) == (2, 51)
+    assert await _pending(db) == 0
+    notes = {n.user_id: n for n in await db.scalars(select(Notification))}
+    emails = (await db.scalars(select(EmailOutbox))).all()
+    assert notes[user.id].title == "50 items were shared with you"
+    assert notes[user.id].metadata_json["digest"]["count"] == 50
+    assert notes[user.id].metadata_json["digest"]["items"][0] == {"i": 0}
+    assert notes[quiet.id].title == "only one"
+    assert [e.to_email for e in emails] == ["u@example.com"]
+    assert await notification_service.get_unread_count(db, user.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_committing_events_schedules_a_flush(monkeypatch, make_user):
+    # One shared in-memory database for the test and the scheduler's sessions.
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(settings, "NOTIFICATION_DIGEST_WINDOWS", {"share": 0.05})
+    monkeypatch.setattr(digest_service, "scheduler", digest_service.DigestScheduler(factory))
+
+    async with factory() as db:
+        user = make_user("u")
+        db.add(user)
+        await db.commit()
+        for i in range(3):
+            digest_service.notify(db, user.id, "share", f"item {i}", "m")
+        await db.commit()
+
+        for _ in range(50):
+            await asyncio.sleep(0.02)
+            titles = (await db.scalars(select(Notification.title))).all()
+            if titles:
+                break
+        assert titles == ["3 items were shared with you"]
+        assert await _pending(db) == 0
+    await engine.dispose()
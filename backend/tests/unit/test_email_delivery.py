@@ -0,0 +1,123 @@
+import asyncio
+import socket
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.core.smtp import SMTPPool
+from app.models.email import EmailOutbox, EmailStatus
+from app.services import email_service
+
+
+class StubSMTPServer:
+    """Minimal local SMTP server: accepts everything except ``bounce@`` recipients."""
+
+    def __init__(self):
+        self.messages: list[str] = []
+        self.connections = 0
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._session, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _session(self, reader, writer):
+        self.connections += 1
+
+        def reply(line):
+            writer.write(f"{line}\r\n".encode())
+
+        reply("220 stub ready")
+        while line := (await reader.readline()).decode().strip():
+            command = line.split(" ", 1)[0].split(":", 1)[0].upper()
+            if command in ("EHLO", "HELO", "MAIL", "RSET", "NOOP"):
+                reply("250 OK")
+            elif command == "RCPT":
+                reply("550 no such user" if "bounce@" in line else "250 OK")
+            elif command == "DATA":
+                reply("354 go ahead")
+                lines = []
+                while (data := await reader.readline()) != b".\r\n":
+                    lines.append(data.decode())
+                self.messages.append("".join(lines))
+                reply("250 queued")
+            elif command == "QUIT":
+                reply("221 bye")
+                break
+            else:
+                reply("502 not implemented")
+            await writer.drain()
+        writer.close()
+
+
+def _pool(port):
+    return SMTPPool("127.0.0.1", port, size=2, starttls=False, timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_outbox_is_sent_in_batches_over_pooled_connections(db, monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.SMTP_BATCH_SIZE", 3)
+    for i in range(7):
+        await email_service.queue_email(db, f"user{i}@example.com", f"s{i}", "body")
+    await email_service.queue_email(db, "bounce@example.com", "s", "body")
+    # A header that cannot be encoded fails alone instead of blocking the outbox.
+    db.add(EmailOutbox(to_email="bad@example.com", subject="a\r\nBcc: x@example.com", body="b"))
+    await db.commit()
+
+    async with StubSMTPServer() as smtp:
+        pool = _pool(smtp.port)
+        result = await email_service.deliver_pending(db, pool=pool)
+        await pool.close()
+
+    assert (result["sent"], result["failed"], result["retrying"]) == (7, 2, 0)
+    assert len(smtp.messages) == 7
+    assert smtp.connections <= 2  # three batches, two pooled connections
+    statuses = {e.to_email: e.status for e in await db.scalars(select(EmailOutbox))}
+    assert statuses.pop("bounce@example.com") == EmailStatus.FAILED
+    assert statuses.pop("bad@example.com") == EmailStatus.FAILED
+    assert set(statuses.values()) == {EmailStatus.SENT}
+
+
+@pytest.mark.asyncio
+async def test_unreachable_relay_is_retried_with_backoff(db):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        closed_port = sock.getsockname()[1]
+    email = await email_service.queue_email(db, "user@example.com", "Eve\r\nBcc: x", "body")
+    await db.commit()
+    assert email.subject == "Eve Bcc: x"
+    now = datetime.now(UTC)
+
+    result = await email_service.deliver_pending(db, pool=_pool(closed_port), now=now)
+
+    await db.refresh(email)
+    assert result["retrying"] == 1
+    assert (email.status, email.attempts) == (EmailStatus.PENDING, 1)
+    assert email.next_attempt_at.replace(tzinfo=UTC) > now + timedelta(seconds=1)
+
+
+@pytest.mark.asyncio
+async def test_a_stale_claim_cannot_record_outcomes(db):
+    await email_service.queue_email(db, "user@example.com", "s", "b", background=False)
+    await db.commit()
+    now = datetime.now(UTC)
+
+    stale_token, stale = await email_service._claim(db, now, 10)
+    # The first sender outlived its lease; another run re-claims the row.
+    later = now + email_service._claim_lease() + timedelta(seconds=1)
+    token, claimed = await email_service._claim(db, later, 10)
+    assert [e.id for e in claimed] == [e.id for e in stale] and token != stale_token
+
+    sent = {"id": stale[0].id, "attempts": 1, "status": EmailStatus.SENT, "sent_at": later}
+    await email_service._record(db, stale_token, [sent])
+    email = await db.get(EmailOutbox, stale[0].id, populate_existing=True)
+    assert (email.status, email.claim_token) == (EmailStatus.SENDING, token)
+
+    await email_service._record(db, token, [sent])
+    email = await db.get(EmailOutbox, stale[0].id, populate_existing=True)
+    assert email.status == EmailStatus.SENT
@@ -0,0 +1,32 @@
+import uuid
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models.user import User
+from app.services import hot_queries
+from app.services.hot_queries import hot_query_stats
+
+
+@pytest.mark.asyncio
+async def test_lookup_returns_row_and_records_cache_hits():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with factory() as db:
+            user = User(
+                email="hq@example.com", name="hq", auth_key_hash="x", encrypted_vault_key="x"
+            )
+            db.add(user)
+            await db.commit()
+
+            before = hot_query_stats.snapshot().get("user_by_id", {}).get("cache_hits", 0)
+            assert await hot_queries.user_by_id(db, user.id) is user
+            assert await hot_queries.user_by_id(db, uuid.uuid4()) is None
+            stats = hot_query_stats.snapshot()["user_by_id"]
+            assert stats["cache_hits"] >= before + 1
+    finally:
+        await engine.dispose()
@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.lifecycle import SchemaRevisionError, migration_heads, prepare_schema
+
+
+@pytest.fixture
+async def bind():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    yield engine
+    await engine.dispose()
+
+
+async def _stamp(bind, revision: str) -> None:
+    async with bind.begin() as conn:
+        await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32))"))
+        await conn.execute(text("INSERT INTO alembic_version VALUES (:rev)"), {"rev": revision})
+
+
+@pytest.mark.asyncio
+async def test_schema_at_head_passes(bind):
+    (head,) = migration_heads()
+    await _stamp(bind, head)
+    status = await prepare_schema(bind, mode="require")
+    assert status["revision"] == status["head"] == [head]
+
+
+@pytest.mark.asyncio
+async def test_schema_behind_head_refuses_to_start(bind):
+    await _stamp(bind, "001")
+    with pytest.raises(SchemaRevisionError):
+        await prepare_schema(bind, mode="require")
+    assert (await prepare_schema(bind, mode="warn"))["revision"] == ["001"]
+
+
+@pytest.mark.asyncio
+async def test_auto_mode_creates_tables_on_sqlite(bind):
+    assert (await prepare_schema(bind, mode="auto"))["mode"] == "create"
+    async with bind.connect() as conn:
+        assert (await conn.execute(text("SELECT count(*) FROM users"))).scalar() == 0
@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy import update
+
+from app.models.notification import Notification, NotificationCounter
+from app.services import notification_service
+
+
+@pytest.mark.asyncio
+async def test_counter_follows_writes_and_reconciles(db, make_user):
+    user = make_user("u")
+    db.add(user)
+    await db.flush()
+    assert await notification_service.get_unread_count(db, user.id) == 0
+
+    created = [
+        await notification_service.create_notification(db, user.id, "info", "t", "m")
+        for _ in range(3)
+    ]
+    assert await notification_service.get_unread_count(db, user.id) == 3
+
+    # Marking an already-read notification again must not count twice.
+    await notification_service.mark_as_read(db, user.id, [created[0].id])
+    await notification_service.mark_as_read(db, user.id, [created[0].id, created[1].id])
+    assert await notification_service.get_unread_count(db, user.id) == 1
+
+    await notification_service.mark_all_as_read(db, user.id)
+    assert await notification_service.get_unread_count(db, user.id) == 0
+
+    # Drift from writes outside the service is repaired by reconciliation.
+    await db.execute(update(Notification).values(read=False))
+    await db.commit()
+    await notification_service.reconcile_unread_counts(db)
+    assert await notification_service.get_unread_count(db, user.id) == 3
+
+    await db.execute(update(Notification).values(read=True))
+    await db.execute(update(NotificationCounter).values(unread_count=7))
+    await db.commit()
+    await notification_service.reconcile_unread_counts(db)
+    assert await notification_service.get_unread_count(db, user.id) == 0
+    assert await notification_service.count_unread(db, user.id) == 0
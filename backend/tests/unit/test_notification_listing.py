@@ -0,0 +1,38 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.models.notification import Notification
+from app.services import notification_service
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_unread_filter_and_since(db, make_user):
+    user, other = (
+        make_user(n)
+        for n in ("u", "o")
+    )
+    db.add_all([user, other])
+    await db.flush()
+    start = datetime.now(UTC) - timedelta(hours=1)
+    notes = [
+        Notification(
+            user_id=user.id, type="info", title=str(i), message="m",
+            read=i % 2 == 0, created_at=start + timedelta(minutes=i),
+        )
+        for i in range(5)
+    ]
+    db.add_all([*notes, Notification(user_id=other.id, type="info", title="x", message="m")])
+    await db.flush()
+
+    async def titles(**kwargs):
+        page, cursor = await notification_service.get_user_notifications(db, user.id, **kwargs)
+        return [n.title for n in page], cursor
+
+    first, cursor = await titles(limit=2)
+    second, cursor = await titles(limit=2, cursor=cursor)
+    third, end = await titles(limit=2, cursor=cursor)
+    assert (first, second, third, end) == (["4", "3"], ["2", "1"], ["0"], None)
+
+    assert (await titles(unread_only=True))[0] == ["3", "1"]
+    assert (await titles(since=notes[2].created_at))[0] == ["4", "3"]
@@ -0,0 +1,105 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+from starlette.testclient import TestClient
+
+from app.api.v1 import notifications
+from app.core import pubsub
+from app.core.exceptions import AuthenticationError
+from app.core.pubsub import hub
+from app.main import app
+from app.services import notification_service
+
+
+@pytest.mark.asyncio
+async def test_events_are_pushed_on_commit_only(db, make_user):
+    user = make_user("u")
+    db.add(user)
+    await db.commit()
+    user_id = user.id  # the rollback below expires ``user``
+
+    async with hub.subscribe(user_id) as queue:
+        await notification_service.create_notification(db, user_id, "info", "dropped", "m")
+        await db.rollback()
+        created = await notification_service.create_notification(db, user_id, "info", "t", "m")
+        assert queue.empty()
+        await db.commit()
+        await notification_service.mark_as_read(db, user_id, [created.id])
+        await db.commit()
+
+        pushed = [queue.get_nowait() for _ in range(queue.qsize())]
+
+    assert [event["type"] for event in pushed] == ["notification", "unread_count"]
+    assert pushed[0]["notification"]["id"] == str(created.id)
+    assert pushed[1]["count"] == 0
+    assert hub.subscriber_count == 0
+
+
+class FlakyPubSub:
+    """Redis pub/sub stand-in: the first subscription drops, the next delivers."""
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def subscribe(self, channel):
+        self.redis.subscriptions += 1
+
+    async def listen(self):
+        if self.redis.subscriptions == 1:
+            raise ConnectionError("connection reset")
+        yield {"type": "subscribe"}
+        yield {"type": "message", "data": self.redis.message}
+        await asyncio.Event().wait()
+
+    async def aclose(self):
+        pass
+
+
+class FlakyRedis:
+    def __init__(self, message):
+        self.message = message
+        self.subscriptions = 0
+
+    def pubsub(self):
+        return FlakyPubSub(self)
+
+
+@pytest.mark.asyncio
+async def test_listener_resubscribes_after_a_connection_error(monkeypatch):
+    monkeypatch.setattr(pubsub, "RECONNECT_DELAY_SECONDS", 0.01)
+    local = pubsub.Hub()
+    user_id = str(uuid.uuid4())
+    payload = {"type": "unread_count", "count": 3}
+    message = json.dumps({"origin": "other-worker", "user_ids": [user_id], "payload": payload})
+    local._redis = FlakyRedis(message)
+
+    async with local.subscribe(user_id) as queue:
+        listener = asyncio.create_task(local._listen())
+        try:
+            assert await asyncio.wait_for(queue.get(), 1) == payload
+        finally:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+    assert local._redis.subscriptions == 2
+
+
+def test_websocket_authenticates_with_its_first_message(monkeypatch):
+    user = type("StreamUser", (), {"id": uuid.uuid4()})()
+
+    async def stream_user(token):
+        if token != "good":
+            raise AuthenticationError()
+        return user, 5
+
+    monkeypatch.setattr(notifications, "_stream_user", stream_user)
+    client = TestClient(app)
+    with client.websocket_connect("/api/v1/notifications/ws") as ws:
+        ws.send_json({"type": "auth", "token": "good"})
+        assert ws.receive_json() == {"type": "unread_count", "count": 5}
+
+    for first in ({"type": "auth", "token": "bad"}, {"token": "good"}):
+        with client.websocket_connect("/api/v1/notifications/ws?token=good") as ws:
+            ws.send_json(first)
+            assert ws.receive()["code"] == 1008
@@ -0,0 +1,83 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.pubsub import hub
+from app.models.audit import PasswordPolicy
+from app.models.notification import Notification
+from app.models.organization import Organization, OrgMembership
+from app.services import notification_service, rotation_service, secret_service, vault_service
+from app.tasks.sweepers import sweep_notifications
+
+
+@pytest.mark.asyncio
+async def test_retention_by_type_read_state_and_per_user_limit(db, make_user, monkeypatch):
+    monkeypatch.setattr(settings, "NOTIFICATION_READ_RETENTION_DAYS", 90)
+    monkeypatch.setattr(settings, "NOTIFICATION_UNREAD_RETENTION_DAYS", 365)
+    monkeypatch.setattr(settings, "NOTIFICATION_TYPE_RETENTION_DAYS", {"password_rotation": 30})
+    monkeypatch.setattr(settings, "NOTIFICATION_MAX_READ_PER_USER", 3)
+    now = datetime.now(UTC)
+    user, busy = make_user("u"), make_user("busy")
+    db.add_all([user, busy])
+    await db.flush()
+
+    def note(owner, title, *, type="info", read=True, age_days=0):
+        return Notification(
+            user_id=owner.id, type=type, title=title, message="m", read=read,
+            created_at=now - timedelta(days=age_days),
+        )
+
+    db.add_all([
+        note(user, "old rotation", type="password_rotation", age_days=40),
+        note(user, "old info", age_days=40),
+        note(user, "ancient info", age_days=100),
+        note(user, "old unread", read=False, age_days=100),
+        note(user, "ancient unread", read=False, age_days=400),
+        *(note(busy, f"busy {i}", age_days=i) for i in range(5)),
+    ])
+    await notification_service.add_unread(db, {user.id: 2})
+    await db.commit()
+
+    async with hub.subscribe(user.id) as events:
+        result = await sweep_notifications(db, now=now, batch_size=2, pause_seconds=0)
+        assert events.get_nowait() == {"type": "unread_count", "count": 1}
+
+    titles = set(await db.scalars(select(Notification.title)))
+    assert titles == {"old info", "old unread", "busy 0", "busy 1", "busy 2"}
+    assert (result["read_expired"], result["over_limit"], result["unread_expired"]) == (2, 2, 1)
+    assert result["cleaned"] == 5
+    assert (result["rows_estimate"], result["table_bytes"]) == (None, None)  # PostgreSQL only
+    assert await notification_service.get_unread_count(db, user.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_swept_reminders_are_not_sent_again(db, make_user):
+    now = datetime.now(UTC)
+    owner = make_user("o")
+    org = Organization(name="org")
+    db.add_all([owner, org])
+    await db.flush()
+    db.add_all([
+        OrgMembership(user_id=owner.id, org_id=org.id),
+        PasswordPolicy(org_id=org.id, max_age_days=90, rotation_reminder_days=80),
+    ])
+    vault = await vault_service.create_vault(db, owner.id, "v")
+    secret = await secret_service.create_secret(
+        db, vault.id, owner.id, secret_type="password",
+        name_encrypted="n", data_encrypted="d", encrypted_item_key="k",
+    )
+    secret.updated_at = now - timedelta(days=200)
+    await db.commit()
+
+    assert (await rotation_service.send_rotation_reminders(db, now=now))["reminders_sent"] == 1
+    await notification_service.mark_all_as_read(db, owner.id)
+    await db.commit()
+    later = now + timedelta(days=60)
+    swept = await sweep_notifications(db, now=later, pause_seconds=0)
+    again = await rotation_service.send_rotation_reminders(db, now=later)
+
+    assert swept["read_expired"] == 1
+    assert again["reminders_sent"] == 0
+    assert (await db.scalars(select(Notification))).all() == []
@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.pool import AdaptiveOverflow, Histogram, InstrumentedQueuePool, instrument
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram((1, 10))
+    for value in (0.5, 5, 50):
+        histogram.observe(value)
+    assert histogram.snapshot()["buckets"] == {"1": 1, "10": 2, "+Inf": 3}
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_tracks_checkouts(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+    )
+    adaptive = AdaptiveOverflow(floor=0, ceiling=4, target_wait_ms=-1, interval=1)
+    metrics = instrument(engine.sync_engine, "test", adaptive)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert metrics.in_use == 1
+        snapshot = metrics.snapshot()
+        assert snapshot["in_use"] == 0
+        assert snapshot["checkouts"] == 1
+        assert snapshot["connects"] == 1
+        assert snapshot["checkout_wait_ms"]["count"] == 1
+        # Every checkout exceeds a negative target, so overflow grows one step.
+        assert snapshot["max_overflow"] == 2
+    finally:
+        await engine.dispose()
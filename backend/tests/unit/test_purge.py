@@ -0,0 +1,61 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.secret import Secret, SecretVersion
+from app.models.sharing import SecretShare
+from app.models.tag import SecretTag, Tag
+from app.services import vault_service
+from app.tasks.cleanup import purge_secrets
+
+NOW = datetime(2026, 3, 1, tzinfo=UTC)
+
+
+async def _count(db, model):
+    return (await db.execute(select(func.count()).select_from(model))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_old_trash_and_dependents_in_chunks(db, make_user):
+    user = make_user("p")
+    db.add(user)
+    await db.flush()
+    vault = await vault_service.create_vault(db, user.id, "v")
+    tag = Tag(user_id=user.id, name="t")
+    db.add(tag)
+
+    secrets = []
+    for deleted_days_ago in (40, 35, 31, 5, None):
+        secret = Secret(
+            vault_id=vault.id, name_encrypted="n", data_encrypted="d", encrypted_item_key="k"
+        )
+        if deleted_days_ago is not None:
+            secret.is_deleted = True
+            secret.deleted_at = NOW - timedelta(days=deleted_days_ago)
+        db.add(secret)
+        await db.flush()
+        db.add_all([
+            SecretVersion(
+                secret_id=secret.id, data_encrypted="d", encrypted_item_key="k",
+                version_number=1, created_by=user.id,
+            ),
+            SecretShare(
+                secret_id=secret.id, shared_by=user.id, encrypted_item_key_for_recipient="k"
+            ),
+            SecretTag(secret_id=secret.id, tag_id=tag.id),
+        ])
+        secrets.append(secret)
+    await db.commit()
+
+    progress = []
+    report = await purge_secrets(
+        db, now=NOW, batch_size=2, pause_seconds=0, on_progress=progress.append
+    )
+
+    assert (report["secrets"], report["versions"], report["shares"], report["tags"]) == (3, 3, 3, 3)
+    assert [p["secrets"] for p in progress] == [2, 3]
+    remaining = set((await db.execute(select(Secret.id))).scalars())
+    assert remaining == {secrets[3].id, secrets[4].id}
+    for model in (SecretVersion, SecretShare, SecretTag):
+        assert await _count(db, model) == 2
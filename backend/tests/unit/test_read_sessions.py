@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import delete, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import ReadOnlySessionError, RecentWrites
+from app.models.tag import Tag
+
+
+@pytest.fixture
+async def read_only_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    yield async_sessionmaker(engine, info={"read_only": True})
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_only_session_allows_selects(read_only_factory):
+    async with read_only_factory() as session:
+        assert (await session.execute(text("SELECT 1"))).scalar() == 1
+
+
+@pytest.mark.asyncio
+async def test_read_only_session_rejects_flush(read_only_factory):
+    async with read_only_factory() as session:
+        session.add(Tag(name="x"))
+        with pytest.raises(ReadOnlySessionError):
+            await session.flush()
+
+
+@pytest.mark.asyncio
+async def test_read_only_session_rejects_dml(read_only_factory):
+    async with read_only_factory() as session:
+        with pytest.raises(ReadOnlySessionError):
+            await session.execute(delete(Tag))
+
+
+class FakeRedis:
+    def __init__(self):
+        self.keys = {}
+
+    async def set(self, key, value, px):
+        self.keys[key] = value
+
+    async def exists(self, key):
+        return int(key in self.keys)
+
+
+@pytest.mark.asyncio
+async def test_write_marks_are_shared_between_workers():
+    shared = FakeRedis()
+    worker_a, worker_b = (RecentWrites(10, backend="redis") for _ in range(2))
+    worker_a._redis = worker_b._redis = shared
+
+    await worker_a.mark("user-1")
+
+    assert await worker_b.is_recent("user-1")
+    assert not await worker_b.is_recent("user-2")
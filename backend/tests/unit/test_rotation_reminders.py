@@ -0,0 +1,98 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.models.audit import PasswordPolicy
+from app.models.notification import Notification
+from app.models.organization import Organization, OrgMembership
+from app.services import notification_service, rotation_service, secret_service, vault_service
+
+
+@pytest.mark.asyncio
+async def test_due_and_overdue_reminders_are_sent_once(db, make_user):
+    now = datetime.now(UTC)
+    owner = make_user("o")
+    org = Organization(name="org")
+    db.add_all([owner, org])
+    await db.flush()
+    db.add_all([
+        OrgMembership(user_id=owner.id, org_id=org.id),
+        PasswordPolicy(org_id=org.id, max_age_days=90, rotation_reminder_days=80),
+    ])
+    vault = await vault_service.create_vault(db, owner.id, "v")
+
+    async def secret(age_days):
+        created = await secret_service.create_secret(
+            db, vault.id, owner.id, secret_type="password",
+            name_encrypted="n", data_encrypted="d", encrypted_item_key="k",
+        )
+        created.updated_at = now - timedelta(days=age_days)
+        return created
+
+    due, overdue = await secret(85), await secret(100)
+    await secret(1)
+    await db.commit()
+
+    first = await rotation_service.send_rotation_reminders(db, now=now)
+    again = await rotation_service.send_rotation_reminders(db, now=now)
+
+    notifications = (await db.execute(select(Notification))).scalars().all()
+    assert first["reminders_sent"] == 2 and again["reminders_sent"] == 0
+    # Both reminders are digested into one notification for the owner.
+    assert len(notifications) == 1
+    summary = notifications[0]
+    assert summary.user_id == owner.id
+    assert summary.title == "2 passwords need rotating"
+    items = summary.metadata_json["digest"]["items"]
+    assert {item["secret_id"]: item["stage"] for item in items} == {
+        str(due.id): "due",
+        str(overdue.id): "overdue",
+    }
+    assert await notification_service.get_unread_count(db, owner.id) == 1
+
+
+@pytest.mark.asyncio
+async def test_budget_is_checked_per_vault_chunk_and_runs_resume(db, make_user):
+    now = datetime.now(UTC)
+    owners, secret_ids = [], set()
+    for name in ("a", "b"):
+        owner, org = make_user(name), Organization(name=name)
+        db.add_all([owner, org])
+        await db.flush()
+        db.add_all([
+            OrgMembership(user_id=owner.id, org_id=org.id),
+            PasswordPolicy(org_id=org.id, max_age_days=90, rotation_reminder_days=80),
+        ])
+        for _ in range(3):
+            vault = await vault_service.create_vault(db, owner.id, "v")
+            secret = await secret_service.create_secret(
+                db, vault.id, owner.id, secret_type="password",
+                name_encrypted="n", data_encrypted="d", encrypted_item_key="k",
+            )
+            secret.updated_at = now - timedelta(days=85)
+            secret_ids.add(str(secret.id))
+        owners.append(owner)
+    await db.commit()
+
+    runs, cursor, sent = 0, None, 0
+    while True:
+        result = await rotation_service.send_rotation_reminders(
+            db, now=now, resume_from=cursor, vault_batch_size=1, time_budget_seconds=0
+        )
+        runs += 1
+        sent += result["reminders_sent"]
+        # A spent budget stops after one chunk, even inside a single org.
+        assert result["vaults"] <= 1
+        if result["resume_from"] is None:
+            break
+        org_id, vault_id = result["resume_from"]
+        cursor = (uuid.UUID(org_id), uuid.UUID(vault_id) if vault_id else None)
+
+    assert sent == len(secret_ids) == 6
+    assert runs > 6
+    notified = {
+        n.metadata_json["secret_id"] for n in (await db.execute(select(Notification))).scalars()
+    }
+    assert notified == secret_ids
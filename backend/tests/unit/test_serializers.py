@@ -0,0 +1,84 @@
+import json
+import uuid
+from datetime import UTC, datetime
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.api.serializers import secret_serializer, vault_serializer
+from app.core.database import Base
+from app.models.secret import Secret, SecretType
+from app.models.vault import Vault, VaultType
+from app.schemas.secret import SecretResponse
+from app.schemas.vault import VaultResponse
+
+
+def _secret() -> Secret:
+    now = datetime.now(UTC)
+    return Secret(
+        id=uuid.uuid4(),
+        vault_id=uuid.uuid4(),
+        folder_id=None,
+        type=SecretType.API_TOKEN,
+        name_encrypted="name",
+        data_encrypted="data",
+        encrypted_item_key="key",
+        metadata_encrypted=None,
+        favorite=True,
+        is_archived=False,
+        deleted_at=None,
+        access_count=2,
+        last_accessed_at=now,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def test_orm_rows_match_model_validate():
+    secrets = [_secret(), _secret()]
+    expected = [SecretResponse.model_validate(s).model_dump(mode="json") for s in secrets]
+    assert json.loads(secret_serializer.dump_many(secrets)) == expected
+
+
+def test_envelope_includes_extra_fields():
+    secret = _secret()
+    body = json.loads(secret_serializer.envelope_response("secrets", [secret], total=7).body)
+    assert body["total"] == 7
+    assert body["secrets"][0]["id"] == str(secret.id)
+    assert body["secrets"][0]["type"] == "api_token"
+
+
+def test_missing_fields_fall_back_to_model_defaults():
+    now = datetime.now(UTC)
+    vault = Vault(
+        id=uuid.uuid4(),
+        owner_id=uuid.uuid4(),
+        org_id=None,
+        name_encrypted="vault",
+        icon="folder-lock",
+        safe_for_travel=False,
+        type=VaultType.PERSONAL,
+        created_at=now,
+        updated_at=now,
+    )
+    row = vault_serializer.row(vault)
+    assert row["item_count"] == 0
+    row["item_count"] = 3
+    dumped = json.loads(vault_serializer.dump_rows([row]))[0]
+    assert dumped == {
+        **VaultResponse.model_validate(vault).model_dump(mode="json"),
+        "item_count": 3,
+    }
+
+
+def test_core_rows_are_serialized():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    secret = _secret()
+    with Session(engine) as session:
+        session.add(secret)
+        session.commit()
+        expected = SecretResponse.model_validate(secret).model_dump(mode="json")
+    with engine.connect() as conn:
+        row = conn.execute(select(Secret.__table__)).one()
+    assert json.loads(secret_serializer.dump_one(row)) == expected
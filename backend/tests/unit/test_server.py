@@ -0,0 +1,27 @@
+import pytest
+
+from app.core.config import settings
+from app.server import available_cpus, server_options
+
+
+def test_cgroup_quota_caps_cpus(tmp_path):
+    cpu_max = tmp_path / "cpu.max"
+    cpu_max.write_text("150000 100000\n")
+    assert available_cpus(cpu_max) == min(2, available_cpus(tmp_path / "missing"))
+
+    cpu_max.write_text("max 100000\n")
+    assert available_cpus(cpu_max) == available_cpus(tmp_path / "missing")
+
+
+def test_reload_runs_a_single_worker(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", "postgresql+asyncpg://db/vaultkeeper")
+    assert server_options(workers=8, reload=True)["workers"] == 1
+    assert server_options(workers=3)["workers"] == 3
+
+
+def test_sqlite_runs_a_single_worker(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", "sqlite+aiosqlite:///./vaultkeeper.db")
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 0)
+    assert server_options()["workers"] == 1
+    with pytest.raises(ValueError, match="SQLite"):
+        server_options(workers=4)
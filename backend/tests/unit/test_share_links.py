@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
+
+from app.core.database import Base
+from app.core.exceptions import NotFoundError, ValidationError
+from app.core.ratelimit import RateLimit, SlidingWindow
+from app.models.user import User
+from app.server import server_options
+from app.services import secret_service, sharing_service, vault_service
+
+
+@pytest.fixture
+async def factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'links.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    sharing_service.share_link_cache._entries.clear()
+
+
+async def _link(factory, max_views):
+    async with factory() as db:
+        user = User(email="l@example.com", name="l", auth_key_hash="x", encrypted_vault_key="x")
+        db.add(user)
+        await db.flush()
+        vault = await vault_service.create_vault(db, user.id, "v")
+        secret = await secret_service.create_secret(
+            db, vault.id, user.id, secret_type="password",
+            name_encrypted="n", data_encrypted="d", encrypted_item_key="k",
+        )
+        share = await sharing_service.create_share_link(
+            db, secret.id, user.id, encrypted_item_key_for_link="lk", max_views=max_views
+        )
+        await db.commit()
+        return share.share_link_token
+
+
+async def _view(factory, token):
+    async with factory() as db:
+        try:
+            share, _ = await sharing_service.access_share_link(db, token)
+        except ValidationError:
+            return None
+        await db.commit()
+        return share.view_count
+
+
+@pytest.mark.asyncio
+async def test_concurrent_viewers_cannot_exceed_max_views(factory):
+    token = await _link(factory, max_views=3)
+    counts = await asyncio.gather(*(_view(factory, token) for _ in range(8)))
+    assert sorted(c for c in counts if c is not None) == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_dead_tokens_fail_from_the_cache(factory):
+    with pytest.raises(NotFoundError):
+        await _view(factory, "missing")
+    assert sharing_service.share_link_cache.dead_reason("missing") == "not_found"
+
+    token = await _link(factory, max_views=1)
+    assert await _view(factory, token) == 1
+    assert sharing_service.share_link_cache.dead_reason(token) == "exhausted"
+
+
+def test_sliding_window_limits_per_key():
+    window = SlidingWindow(limit=2)
+    assert [window.hit("a") for _ in range(3)] == [True, True, False]
+    assert window.hit("b")
+
+
+@pytest.mark.asyncio
+async def test_clients_behind_the_proxy_get_their_own_budget():
+    limited = FastAPI()
+
+    @limited.get("/", dependencies=[Depends(RateLimit(1))])
+    async def view():
+        return {}
+
+    # What uvicorn does with app.server's options.
+    trusted = server_options()["forwarded_allow_ips"]
+    app = ProxyHeadersMiddleware(limited, trusted_hosts=trusted)
+
+    async def get(peer, forwarded_for):
+        transport = ASGITransport(app=app, client=(peer, 4000))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/", headers={"X-Forwarded-For": forwarded_for})
+            return response.status_code
+
+    assert await get(trusted, "203.0.113.1") == 200
+    assert await get(trusted, "203.0.113.1") == 429
+    assert await get(trusted, "203.0.113.2") == 200
+    # Not from the proxy: the header is ignored and the peer is the client.
+    assert await get("198.51.100.7", "203.0.113.3") == 200
+    assert await get("198.51.100.7", "203.0.113.4") == 429
@@ -0,0 +1,41 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.models.organization import Team, TeamMembership
+from app.services import secret_service, sharing_service, vault_service
+
+
+@pytest.mark.asyncio
+async def test_direct_and_team_shares_are_paged_newest_first(db, make_user):
+    owner, member, outsider = make_user("owner"), make_user("member"), make_user("outsider")
+    team, other_team = Team(org_id=uuid.uuid4(), name="t"), Team(org_id=uuid.uuid4(), name="o")
+    db.add_all([owner, member, outsider, team, other_team])
+    await db.flush()
+    db.add(TeamMembership(user_id=member.id, team_id=team.id))
+    vault = await vault_service.create_vault(db, owner.id, "v")
+    secret = await secret_service.create_secret(
+        db, vault.id, owner.id, secret_type="password",
+        name_encrypted="n", data_encrypted="d", encrypted_item_key="k",
+    )
+
+    async def share(**recipient):
+        return await sharing_service.share_secret(
+            db, secret.id, owner.id, encrypted_item_key_for_recipient="k", **recipient
+        )
+
+    direct = await share(shared_with_user_id=member.id)
+    via_team = await share(shared_with_team_id=team.id)
+    expiring = await share(
+        shared_with_team_id=team.id, expires_at=datetime.now(UTC) + timedelta(days=1)
+    )
+    await share(shared_with_team_id=team.id, expires_at=datetime.now(UTC) - timedelta(days=1))
+    await share(shared_with_team_id=other_team.id)
+    await share(shared_with_user_id=outsider.id)
+
+    first, cursor = await sharing_service.get_shared_with_me(db, member.id, limit=2)
+    second, end = await sharing_service.get_shared_with_me(db, member.id, limit=2, cursor=cursor)
+
+    assert [s.id for s, _ in first + second] == [expiring.id, via_team.id, direct.id]
+    assert end is None
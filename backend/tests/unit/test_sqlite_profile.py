@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import configure_sqlite, writer_gate
+
+
+@pytest.fixture
+async def engines(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}"
+    writer = create_async_engine(url)
+    reader = create_async_engine(url)
+    configure_sqlite(writer.sync_engine)
+    configure_sqlite(reader.sync_engine, read_only=True)
+    async with writer.begin() as conn:
+        await conn.execute(text("CREATE TABLE items (n INTEGER)"))
+    yield writer, reader
+    await writer.dispose()
+    await reader.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pragmas_applied(engines):
+    writer, reader = engines
+    async with writer.connect() as conn:
+        assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+        assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+        assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() > 0
+    async with reader.connect() as conn:
+        with pytest.raises(OperationalError):
+            await conn.execute(text("INSERT INTO items VALUES (1)"))
+
+
+@pytest.mark.asyncio
+async def test_writer_gate_serializes_write_transactions(engines):
+    writer, _ = engines
+    factory = async_sessionmaker(writer, info={"sqlite_writer": True})
+    active, overlap = 0, False
+
+    async def write(n: int) -> None:
+        nonlocal active, overlap
+        async with factory() as session:
+            await session.execute(text("INSERT INTO items VALUES (:n)"), {"n": n})
+            assert "writer_lock" in session.info
+            active += 1
+            overlap |= active > 1
+            await asyncio.sleep(0.01)
+            active -= 1
+            await session.commit()
+            assert "writer_lock" not in session.info
+
+    await asyncio.gather(*(write(n) for n in range(5)))
+    assert not overlap
+    assert not writer_gate._lock().locked()
+    async with writer.connect() as conn:
+        assert (await conn.execute(text("SELECT count(*) FROM items"))).scalar() == 5
@@ -0,0 +1,53 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.models.sharing import SecretShare
+from app.models.user import Session
+from app.tasks.sweepers import sweep_expired_sessions, sweep_expired_shares
+
+NOW = datetime(2026, 1, 31, tzinfo=UTC)
+
+
+def _share(expires_at):
+    return SecretShare(
+        secret_id=uuid.uuid4(),
+        shared_by=uuid.uuid4(),
+        encrypted_item_key_for_recipient="k",
+        expires_at=expires_at,
+    )
+
+
+def _session(expires_at):
+    return Session(user_id=uuid.uuid4(), token_hash=uuid.uuid4().hex, expires_at=expires_at)
+
+
+@pytest.mark.asyncio
+async def test_shares_are_deleted_in_batches_past_retention(db):
+    db.add_all([_share(NOW - timedelta(days=3)) for _ in range(5)])
+    keep = [_share(NOW - timedelta(hours=1)), _share(NOW + timedelta(days=1)), _share(None)]
+    db.add_all(keep)
+    await db.commit()
+
+    report = await sweep_expired_shares(db, now=NOW, batch_size=2, pause_seconds=0)
+
+    assert (report["cleaned"], report["batches"]) == (5, 3)
+    remaining = set((await db.execute(select(SecretShare.id))).scalars())
+    assert remaining == {share.id for share in keep}
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_deactivated_then_purged(db):
+    old = _session(NOW - timedelta(days=60))
+    expired = _session(NOW - timedelta(days=1))
+    current = _session(NOW + timedelta(days=1))
+    db.add_all([old, expired, current])
+    await db.commit()
+
+    report = await sweep_expired_sessions(db, now=NOW, batch_size=10, pause_seconds=0)
+
+    assert (report["deactivated"], report["cleaned"]) == (2, 1)
+    rows = dict((await db.execute(select(Session.id, Session.is_active))).all())
+    assert rows == {expired.id: False, current.id: True}
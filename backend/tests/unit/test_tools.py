@@ -1,7 +1,9 @@
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from app.api.deps import get_current_active_user
 from app.main import app
+from app.models.user import User, UserRole, UserStatus
 
 
 @pytest.fixture
@@ -49,3 +51,27 @@ async def test_health_check(client):
     response = await client.get("/api/health")
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
+
+
+@pytest.mark.asyncio
+async def test_readiness_check(client):
+    response = await client.get("/api/health/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready"}
+
+
+@pytest.mark.asyncio
+async def test_readiness_details_require_an_admin(client):
+    assert (await client.get("/api/health/details")).status_code in (401, 403)
+
+    for role, status in ((UserRole.MEMBER, 403), (UserRole.ADMIN, 200)):
+        user = User(role=role, status=UserStatus.ACTIVE)
+        app.dependency_overrides[get_current_active_user] = lambda user=user: user
+        try:
+            response = await client.get("/api/health/details")
+        finally:
+            app.dependency_overrides.clear()
+        assert response.status_code == status
+    data = response.json()
+    assert data["database"]["reachable"] is True
+    assert data["pools"][0]["name"] == "primary"
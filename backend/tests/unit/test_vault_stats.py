@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import delete
+
+from app.models.vault import VaultStats
+from app.services import secret_service, vault_service
+
+
+async def _secret(db, vault_id, user_id, secret_type="password"):
+    return await secret_service.create_secret(
+        db,
+        vault_id,
+        user_id,
+        secret_type=secret_type,
+        name_encrypted="n",
+        data_encrypted="d",
+        encrypted_item_key="k",
+    )
+
+
+def _counts(entry):
+    return entry["item_count"], entry["folder_count"], entry["type_breakdown"]
+
+
+@pytest.mark.asyncio
+async def test_stats_follow_secret_lifecycle(db, make_user):
+    user = make_user("s")
+    db.add(user)
+    await db.flush()
+    source = await vault_service.create_vault(db, user.id, "source")
+    target = await vault_service.create_vault(db, user.id, "target")
+
+    login = await _secret(db, source.id, user.id, "login")
+    password = await _secret(db, source.id, user.id)
+    trashed = await _secret(db, source.id, user.id)
+    await secret_service.create_folder(db, source.id, user.id, "folder")
+    await secret_service.delete_secret(db, trashed.id, user.id)
+    await secret_service.archive_secret(db, password.id, user.id)
+    await secret_service.move_secret(db, login.id, user.id, target.id, "k2")
+    await secret_service.restore_secret(db, trashed.id, user.id)
+    await secret_service.delete_secret(db, trashed.id, user.id)
+    await secret_service.permanent_delete_secret(db, trashed.id, user.id)
+    await secret_service.permanent_delete_secret(db, password.id, user.id)
+    await secret_service.duplicate_secret(db, login.id, user.id, "copy", "k3")
+
+    ids = [source.id, target.id]
+    stored = await vault_service.get_vault_stats(db, ids, include_types=True)
+    actual = await vault_service.compute_vault_stats(db, ids)
+    for vault_id in ids:
+        assert _counts(stored[vault_id]) == _counts(actual[vault_id])
+    assert _counts(stored[source.id]) == (0, 1, {})
+    assert _counts(stored[target.id]) == (2, 0, {"login": 2})
+
+
+@pytest.mark.asyncio
+async def test_missing_stats_row_is_rebuilt_on_next_write(db, make_user):
+    user = make_user("m")
+    db.add(user)
+    await db.flush()
+    vault = await vault_service.create_vault(db, user.id, "vault")
+    await _secret(db, vault.id, user.id)
+    await db.execute(delete(VaultStats))
+
+    fallback = await vault_service.get_vault_stats(db, [vault.id])
+    assert fallback[vault.id]["item_count"] == 1
+    assert await vault_service.get_vault_stats(db, [vault.id], compute_missing=False) == {}
+
+    await _secret(db, vault.id, user.id, "ssh_key")
+    stored = await vault_service.get_vault_stats(
+        db, [vault.id], include_types=True, compute_missing=False
+    )
+    assert _counts(stored[vault.id]) == (2, 0, {"password": 1, "ssh_key": 1})
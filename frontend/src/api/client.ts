@@ -164,12 +164,35 @@ export const tagsAPI = {
 
 // Notifications API
 export const notificationsAPI = {
-  list: (params?: { limit?: number; offset?: number }) =>
+  list: (params?: { limit?: number; cursor?: string; unread_only?: boolean; since?: string }) =>
     api.get('/notifications', { params }),
   unreadCount: () => api.get('/notifications/unread-count'),
   markRead: (notificationIds: string[]) =>
     api.post('/notifications/mark-read', { notification_ids: notificationIds }),
   markAllRead: () => api.post('/notifications/mark-all-read'),
+  // Server-sent events over fetch (EventSource cannot send the bearer token).
+  // Resolves when the stream ends; rejects if it cannot be opened.
+  stream: async (onEvent: (event: { type: string; [key: string]: unknown }) => void,
+    signal: AbortSignal) => {
+    const response = await fetch(`${API_BASE_URL}/api/v1/notifications/stream`, {
+      headers: { Authorization: `Bearer ${localStorage.getItem('access_token') ?? ''}` },
+      signal,
+    });
+    if (!response.ok || !response.body) throw new Error(`Stream failed: ${response.status}`);
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) return;
+      buffer += value;
+      const messages = buffer.split('\n\n');
+      buffer = messages.pop() ?? '';
+      for (const message of messages) {
+        const data = message.split('\n').find((line) => line.startsWith('data: '));
+        if (data) onEvent(JSON.parse(data.slice(6)));
+      }
+    }
+  },
 };
 
 // Sharing API
@@ -181,7 +204,7 @@ export const sharingAPI = {
     permission: string;
     expires_at?: string;
   }) => api.post(`/secrets/${secretId}/share`, data),
-  sharedWithMe: () => api.get('/shared-with-me'),
+  sharedWithMe: (cursor?: string) => api.get('/shared-with-me', { params: { cursor } }),
   revoke: (shareId: string) => api.delete(`/shares/${shareId}`),
   update: (shareId: string, data: { permission?: string; expires_at?: string }) =>
     api.put(`/shares/${shareId}`, data),
@@ -9,7 +9,7 @@ export function NotificationBell() {
     notifications,
     unreadCount,
     fetchNotifications,
-    fetchUnreadCount,
+    subscribe,
     markAsRead,
     markAllAsRead,
   } = useNotificationStore();
@@ -17,11 +17,7 @@ export function NotificationBell() {
   const [open, setOpen] = useState(false);
   const ref = useRef<HTMLDivElement>(null);
 
-  useEffect(() => {
-    fetchUnreadCount();
-    const interval = setInterval(fetchUnreadCount, 60000);
-    return () => clearInterval(interval);
-  }, [fetchUnreadCount]);
+  useEffect(() => subscribe(), [subscribe]);
 
   useEffect(() => {
     if (open) {
@@ -1,13 +1,16 @@
 import { useEffect, useState } from 'react';
 import { sharingAPI } from '@/api/client';
 import type { SharedSecret } from '@/types';
+import { Button } from '@/components/ui/button';
 import { Card, CardContent } from '@/components/ui/card';
 import { Share2, Key, Loader2 } from 'lucide-react';
 import { formatTimeAgo } from '@/utils/passwordStrength';
 
 export function SharedWithMe() {
   const [shares, setShares] = useState<SharedSecret[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
 
   useEffect(() => {
     loadShares();
@@ -17,6 +20,7 @@ export function SharedWithMe() {
     try {
       const response = await sharingAPI.sharedWithMe();
       setShares(response.data);
+      setNextCursor(response.headers['x-next-cursor'] ?? null);
     } catch {
       console.error('Failed to load shared secrets');
     } finally {
@@ -24,6 +28,20 @@ export function SharedWithMe() {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setIsLoadingMore(true);
+    try {
+      const response = await sharingAPI.sharedWithMe(nextCursor);
+      setShares((current) => [...current, ...response.data]);
+      setNextCursor(response.headers['x-next-cursor'] ?? null);
+    } catch {
+      console.error('Failed to load shared secrets');
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   if (isLoading) {
     return (
       <div className="flex items-center justify-center py-20">
@@ -66,6 +84,14 @@ export function SharedWithMe() {
               </CardContent>
             </Card>
           ))}
+          {nextCursor && (
+            <div className="flex justify-center pt-2">
+              <Button variant="outline" onClick={loadMore} disabled={isLoadingMore}>
+                {isLoadingMore && <Loader2 className="h-4 w-4 animate-spin mr-2" />}
+                Load more
+              </Button>
+            </div>
+          )}
         </div>
       )}
     </div>
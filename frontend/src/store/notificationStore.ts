@@ -11,9 +11,10 @@ interface NotificationState {
   fetchUnreadCount: () => Promise<void>;
   markAsRead: (ids: string[]) => Promise<void>;
   markAllAsRead: () => Promise<void>;
+  subscribe: () => () => void;
 }
 
-export const useNotificationStore = create<NotificationState>((set) => ({
+export const useNotificationStore = create<NotificationState>((set, get) => ({
   notifications: [],
   unreadCount: 0,
   isLoading: false,
@@ -64,4 +65,47 @@ export const useNotificationStore = create<NotificationState>((set) => ({
       console.error('Failed to mark all as read:', err);
     }
   },
+
+  // Live updates from the push stream; falls back to polling the unread
+  // count while the stream is down. Returns the unsubscribe function.
+  subscribe: () => {
+    const controller = new AbortController();
+    let poll: ReturnType<typeof setInterval> | undefined;
+
+    const connect = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          await notificationsAPI.stream((event) => {
+            clearInterval(poll);
+            poll = undefined;
+            if (event.type === 'unread_count') {
+              set({ unreadCount: event.count as number });
+            } else if (event.type === 'notification') {
+              set((state) => ({
+                notifications: [event.notification as Notification, ...state.notifications],
+                unreadCount: state.unreadCount + 1,
+              }));
+            } else if (event.type === 'broadcast') {
+              // Org/team broadcasts carry no per-recipient id; reload the list.
+              set((state) => ({ unreadCount: state.unreadCount + 1 }));
+              if (get().notifications.length) get().fetchNotifications();
+            }
+          }, controller.signal);
+        } catch {
+          if (controller.signal.aborted) return;
+        }
+        if (!poll) {
+          get().fetchUnreadCount();
+          poll = setInterval(get().fetchUnreadCount, 60000);
+        }
+        await new Promise((resolve) => setTimeout(resolve, 5000));
+      }
+    };
+    connect();
+
+    return () => {
+      controller.abort();
+      clearInterval(poll);
+    };
+  },
 }));